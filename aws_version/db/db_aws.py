@@ -2,6 +2,7 @@ import os
 import pymysql
 import logging
 from contextlib import contextmanager
+from db.db_pool import ConnectionPool
 
 logger = logging.getLogger(__name__)
 
@@ -28,21 +29,33 @@ class Database:
     @staticmethod
     @contextmanager
     def get_cursor():
-        """커서와 연결 객체를 context manager로 반환"""
+        """커서와 연결 객체를 context manager로 반환 (연결은 풀에서 빌려 반납)"""
         connection = None
         cursor = None
         try:
-            connection = Database.get_connection()
+            connection = _pool.acquire()
             cursor = connection.cursor()
             yield cursor, connection
         except Exception as e:
-            if connection:
-                connection.rollback()
             logger.error(f"DB 작업 중 오류: {e}")
             raise
         finally:
             if cursor:
                 cursor.close()
             if connection:
-                connection.close()
-            logger.debug("DB 연결 종료")
+                # 반납 시 rollback으로 커밋하지 않은 작업 정리
+                _pool.release(connection)
+            logger.debug("DB 연결 반납")
+
+    @staticmethod
+    def close_pool():
+        """풀의 유휴 연결 종료"""
+        _pool.close()
+
+
+# 모듈 스코프 연결 풀 (Lambda warm 호출 간 재사용)
+_pool = ConnectionPool(
+    Database.get_connection,
+    max_size=int(os.getenv("DB_POOL_SIZE") or 5),
+    timeout=float(os.getenv("DB_POOL_TIMEOUT") or 10),
+)
@@ -2,15 +2,207 @@ import json
 import os
 import logging
 from datetime import datetime
-from services.email_sender import send_personalized_email
-from services.job_matcher import get_personalized_jobs
+from services.email_sender import (
+    close_email_sessions,
+    get_default_email_service,
+    personalized_email_request,
+)
+from services.job_matcher import (
+    MatchResultCache,
+    get_personalized_jobs,
+    iter_subscriber_preferences,
+    load_recommendations,
+    load_subscriber_preferences,
+    materialize_recommendations,
+    refresh_recommendations,
+)
+from services.job_catalog import JobCatalog
+from services.parallel_matcher import match_parallel
+from services.log_writer import BufferedLogWriter
+from services.pipeline import Pipeline, Stage
+from services.send_progress import SendProgress, invoke_lambda, resolve_run_id
+from services.subscribers import count_active_subscribers, iter_active_subscribers
 from db.db_aws import Database
+from db.migrations import run_migrations
 from db.db_query import EmailQueries
 
 # Lambda용 로거 설정 (CloudWatch Logs 사용)
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# 추천 방식
+# - inline: 사용자마다 발송 직전에 매칭 (기본값)
+# - materialized: 전체 매칭 결과를 user_recommendations에 저장한 뒤 발송
+# - incremental: 저장된 추천 결과를 바뀐 부분만 갱신한 뒤 발송
+# - precomputed: 매칭 없이 저장된 추천 결과로만 발송 (발송 재시도용)
+# - pushdown: 공고 스냅샷 없이 사용자마다 DB에서 필터/정렬한 상위 공고만 조회
+#   (구독자가 적고 공고가 많을 때, idx_job_postings_match 인덱스 사용)
+RECOMMENDATION_MODE = os.getenv("RECOMMENDATION_MODE") or "inline"
+
+# 핸들러 시작 시 스키마(테이블/인덱스) 확인 여부
+# 기본은 끄고 배포 단계에서 한 번 적용 (python -m db.migrations 또는
+# {"action": "migrate"} 이벤트로 호출)
+RUN_MIGRATIONS = os.getenv("RUN_MIGRATIONS") == "true"
+
+# 매칭 워커 프로세스 수 (1이면 핸들러 프로세스에서 직접 매칭)
+MATCH_WORKERS = int(os.getenv("MATCH_WORKERS") or 1)
+
+# 파이프라인 단계별 워커 스레드 수와 단계 사이 큐 크기
+PIPELINE_RENDER_WORKERS = int(os.getenv("PIPELINE_RENDER_WORKERS") or 1)
+PIPELINE_SEND_WORKERS = int(
+    os.getenv("PIPELINE_SEND_WORKERS") or os.getenv("SMTP_MAX_SESSIONS") or 5
+)
+PIPELINE_LOG_WORKERS = int(os.getenv("PIPELINE_LOG_WORKERS") or 1)
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE") or 50)
+
+# 구독자 스트리밍 페이지 크기
+SUBSCRIBER_PAGE_SIZE = int(os.getenv("SUBSCRIBER_PAGE_SIZE") or 1000)
+
+# 발송 로그 일괄 기록 (버퍼 크기, 주기 초)
+LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE") or 200)
+LOG_FLUSH_INTERVAL = float(os.getenv("LOG_FLUSH_INTERVAL") or 5)
+
+# 체크포인트와 이어서 발송
+# - 남은 실행 시간이 REMAINING_TIME_THRESHOLD_MS보다 적으면 새 사용자를 넣지 않고
+#   진행 중인 발송만 마친 뒤 멈춤 (큐에 남은 사용자를 마칠 시간을 남겨 둠)
+#   이미 넣은 사용자는 모두 보내므로, 단계 큐에 쌓일 수 있는
+#   4 × PIPELINE_QUEUE_SIZE명을 발송 속도로 보내는 시간보다 크게 설정
+# - CHECKPOINT_EVERY명을 마칠 때마다 체크포인트 저장
+# - CONTINUATION_INVOKER=lambda면 같은 함수를 재호출, 비워 두면 응답으로만 반환
+REMAINING_TIME_THRESHOLD_MS = int(os.getenv("REMAINING_TIME_THRESHOLD_MS") or 60000)
+CHECKPOINT_EVERY = int(os.getenv("CHECKPOINT_EVERY") or 100)
+CONTINUATION_INVOKER = os.getenv("CONTINUATION_INVOKER") or ""
+
+# 남은 사용자를 이어서 발송하는 함수 invoker(payload, context)
+_continuation_invoker = invoke_lambda if CONTINUATION_INVOKER == "lambda" else None
+
+
+def set_continuation_invoker(invoker):
+    """이어서 발송할 때 호출할 함수 지정 (Step Functions, SQS 등, None이면 사용 안 함)"""
+    global _continuation_invoker
+    _continuation_invoker = invoker
+
+
+def _out_of_time(context):
+    """남은 실행 시간이 기준보다 적은지 확인 (로컬 실행은 제한 없음)"""
+    if context is None:
+        return False
+    return context.get_remaining_time_in_millis() < REMAINING_TIME_THRESHOLD_MS
+
+
+def _subscriber_tasks(users, total_users, progress, context):
+    """구독자 스트림을 파이프라인 작업으로 변환 (실행 시간이 부족하면 중단)
+
+    남은 시간은 여기서만 확인한다. 파이프라인에 넣은 사용자는 모두 발송하고
+    기록하므로, 멈춘 뒤의 체크포인트는 빈틈 없이 이어진 user_id 구간이 된다.
+    """
+    for idx, user in enumerate(users):
+        if _out_of_time(context):
+            logger.warning(
+                f"남은 실행 시간 부족: {idx}명을 넣은 뒤 중단, 남은 사용자는 이어서 발송"
+            )
+            progress.interrupted = True
+            return
+
+        progress.issue(user[0])
+        task = {
+            "user_id": user[0],
+            "email": user[1],
+            "name": user[2],
+            "position": f"{idx + 1}/{total_users}",
+        }
+        if len(user) > 3:
+            # iter_subscriber_preferences()는 희망조건을 함께 조회
+            task["profile"] = user[3]
+        yield task
+
+
+def _match_user(task, mode, catalog, match_cache):
+    """매칭 단계: 사용자의 추천 공고 조회"""
+    user_id, email = task["user_id"], task["email"]
+    logger.info(f"사용자 처리 중 ({task['position']}): {task['name']}({email})")
+
+    if mode in ("inline", "pushdown"):
+        task["jobs"] = get_personalized_jobs(
+            email,
+            top_n=10,
+            catalog=catalog,
+            profile=task.get("profile"),
+            match_cache=match_cache,
+            pushdown=mode == "pushdown",
+        )
+    else:
+        task["jobs"] = load_recommendations(user_id)
+    return task
+
+
+def _render_email(task, email_service):
+    """렌더링 단계: 개인화된 이메일 메시지 생성 (추천 공고가 없으면 건너뜀)"""
+    email, jobs = task["email"], task["jobs"]
+    if not jobs:
+        logger.warning(f"추천할 공고가 없습니다: {email}")
+        return task
+
+    logger.info(f"추천 공고 {len(jobs)}개 발견 - {email}")
+    task["message"] = email_service.create_message(
+        **personalized_email_request(email, task["name"], jobs)
+    )
+    return task
+
+
+def _send_email(task, email_service):
+    """발송 단계: 만들어 둔 메시지를 SMTP 세션 풀로 발송"""
+    if "message" in task:
+        result = email_service.deliver(task["email"], task.pop("message"))
+        task["status"] = "SUCCESS" if result["status"] == "SUCCESS" else "FAILED"
+        task["error"] = result.get("error") if task["status"] == "FAILED" else None
+    return task
+
+
+def _pipeline_error(task, stage_name, error):
+    """앞 단계에서 실패한 사용자는 오류 내용을 로그 단계로 넘김"""
+    logger.error(f"사용자 {task['email']} 처리 중 오류: {error}")
+    task["failure"] = str(error)
+    return task
+
+
+def _log_result(task, log_writer):
+    """로그 단계: 발송 결과를 로그 버퍼에 넣음
+
+    사용자는 이 행이 실제로 기록(commit)된 뒤 _complete_logged()에서 완료 처리하고
+    발송 성공 수에 반영한다 (사용자별 결과를 따로 모아 두지 않음).
+    """
+    email, jobs = task["email"], task.get("jobs")
+    if "failure" in task:
+        # 에러 로그 기록
+        row = ("처리 오류", "FAILED", task["failure"], 0)
+    elif not jobs:
+        # 추천 공고 없는 경우도 로그 기록
+        row = ("추천 공고 없음", "FAILED", "추천할 공고가 없습니다", 0)
+    else:
+        row = (
+            f"{task['name']}님을 위한 맞춤 채용공고",
+            task["status"],
+            task["error"],
+            len(jobs),
+        )
+
+    subject, status, error_msg, job_count = row
+    log_writer.write(
+        (task["user_id"], email, subject, "PERSONALIZED", status, error_msg, job_count)
+    )
+
+    if status == "SUCCESS":
+        logger.info(f"✅ 이메일 발송 성공: {email}")
+    elif jobs and "failure" not in task:
+        logger.error(f"❌ 이메일 발송 실패: {email} - {error_msg}")
+
+
+def _complete_logged(rows, progress):
+    """기록을 마친 발송 로그 행의 사용자를 완료로 처리 (BufferedLogWriter on_flush)"""
+    for row in rows:
+        progress.complete(row[0], succeeded=row[4] == "SUCCESS")
+
 
 def lambda_handler(event, context):
     """AWS Lambda 핸들러 함수 - 매주 목요일 오전 11시 실행"""
@@ -20,6 +212,9 @@ def lambda_handler(event, context):
     success_count = 0
     fail_count = 0
     total_users = 0
+    log_writer = None
+    progress = None
+    email_service = None
 
     try:
         # Lambda 실행 정보 로깅
@@ -29,114 +224,209 @@ def lambda_handler(event, context):
         logger.info(f"요청 ID: {context.aws_request_id if context else 'local_test'}")
         logger.info(f"실행 시작 시간: {start_time}")
 
-        # DB에서 구독자 조회
-        with Database.get_cursor() as (cursor, connection):
-            cursor.execute(EmailQueries.GET_ACTIVE_SUBSCRIBERS)
-            users = cursor.fetchall()
-            total_users = len(users)
-
-            if not users:
-                logger.warning("구독 중인 사용자가 없습니다.")
-                return {
-                    "statusCode": 200,
-                    "body": json.dumps(
-                        {
-                            "message": "구독 중인 사용자가 없습니다.",
-                            "total_users": 0,
-                            "success": 0,
-                            "failed": 0,
-                            "execution_time_seconds": 0,
-                        },
-                        ensure_ascii=False,
-                    ),
-                }
-
-            logger.info(f"발송 대상: {total_users}명")
-
-        # 각 사용자별로 개인화된 이메일 발송
-        for idx, user in enumerate(users):
-            user_id, email, name = user[0], user[1], user[2]
-            logger.info(f"사용자 처리 중 ({idx+1}/{total_users}): {name}({email})")
-
-            try:
-                # 개인화된 채용공고 가져오기
-                recommended_jobs = get_personalized_jobs(email, top_n=10)
-
-                if recommended_jobs:
-                    logger.info(f"추천 공고 {len(recommended_jobs)}개 발견 - {email}")
-
-                    # 개인화된 이메일 발송
-                    results = send_personalized_email(email, name, recommended_jobs)
-
-                    # 발송 결과 로그 기록
-                    with Database.get_cursor() as (cursor, connection):
-                        status = (
-                            "SUCCESS" if results[email][0] == "SUCCESS" else "FAILED"
-                        )
-                        error_msg = results[email][1] if status == "FAILED" else None
-
-                        cursor.execute(
-                            EmailQueries.INSERT_EMAIL_LOG,
-                            (
-                                user_id,
-                                email,
-                                f"{name}님을 위한 맞춤 채용공고",
-                                "PERSONALIZED",
-                                status,
-                                error_msg,
-                                len(recommended_jobs),
-                            ),
-                        )
-                        connection.commit()
-
-                        if status == "SUCCESS":
-                            success_count += 1
-                            logger.info(f"✅ 이메일 발송 성공: {email}")
-                        else:
-                            fail_count += 1
-                            logger.error(f"❌ 이메일 발송 실패: {email} - {error_msg}")
-
-                else:
-                    logger.warning(f"추천할 공고가 없습니다: {email}")
-                    # 추천 공고 없는 경우도 로그 기록
-                    with Database.get_cursor() as (cursor, connection):
-                        cursor.execute(
-                            EmailQueries.INSERT_EMAIL_LOG,
-                            (
-                                user_id,
-                                email,
-                                "추천 공고 없음",
-                                "PERSONALIZED",
-                                "FAILED",
-                                "추천할 공고가 없습니다",
-                                0,
-                            ),
-                        )
-                        connection.commit()
-                    fail_count += 1
-
-            except Exception as user_error:
-                fail_count += 1
-                logger.error(f"사용자 {email} 처리 중 오류: {user_error}")
-
-                # 에러 로그 기록
+        event = event or {}
+        if event.get("action") == "migrate":
+            # 배포 단계: 발송 없이 스키마만 적용
+            applied = run_migrations()
+            return {
+                "statusCode": 200 if applied else 500,
+                "body": json.dumps(
+                    {"message": "스키마 적용 완료" if applied else "스키마 적용 실패"},
+                    ensure_ascii=False,
+                ),
+            }
+        if RUN_MIGRATIONS:
+            # 발송에 필요한 테이블과 인덱스 확인 (콜드 스타트에서 한 번)
+            run_migrations()
+
+        # 발송 회차의 체크포인트 조회 (재시도/이어서 발송이면 그 다음 사용자부터)
+        run_id = resolve_run_id(event, context, start_time)
+        progress = SendProgress.load(run_id, save_every=CHECKPOINT_EVERY)
+        if progress.completed:
+            logger.info(f"이미 발송을 마친 회차입니다: {run_id}")
+            return {
+                "statusCode": 200,
+                "body": json.dumps(
+                    {
+                        "message": "이미 발송을 마친 회차입니다.",
+                        "run_id": run_id,
+                        "total_users": 0,
+                        "success": 0,
+                        "failed": 0,
+                        "execution_time_seconds": 0,
+                    },
+                    ensure_ascii=False,
+                ),
+            }
+
+        resume_after = max(progress.last_user_id, int(event.get("resume_after") or 0))
+        progress.last_user_id = resume_after
+        if resume_after:
+            logger.info(f"체크포인트에서 이어서 발송: user_id {resume_after} 이후")
+
+        # DB에서 구독자 수 조회 (목록은 발송하면서 페이지 단위로 스트리밍)
+        total_users = count_active_subscribers(resume_after)
+
+        if not total_users:
+            logger.warning("구독 중인 사용자가 없습니다.")
+            return {
+                "statusCode": 200,
+                "body": json.dumps(
+                    {
+                        "message": "구독 중인 사용자가 없습니다.",
+                        "total_users": 0,
+                        "success": 0,
+                        "failed": 0,
+                        "execution_time_seconds": 0,
+                    },
+                    ensure_ascii=False,
+                ),
+            }
+
+        logger.info(f"발송 대상: {total_users}명")
+
+        # 희망조건이 같은 사용자는 매칭 결과를 공유
+        match_cache = MatchResultCache()
+        mode = RECOMMENDATION_MODE
+        if resume_after and mode in ("materialized", "incremental"):
+            # 앞선 호출에서 저장한 추천 결과로 이어서 발송 (매칭을 다시 하지 않음)
+            mode = "precomputed"
+        logger.info(f"추천 방식: {mode}")
+
+        catalog = None
+        if mode not in ("precomputed", "pushdown"):
+            # 활성 채용공고 스냅샷은 배치 전체에서 한 번만 로드
+            # (pushdown은 사용자마다 DB에서 필터링하므로 로드하지 않음)
+            catalog = JobCatalog.load()
+
+        # 병렬 매칭: 구독자를 앞서 읽어 새 희망조건을 워커가 매칭하고 결과를
+        # match_cache에 등록한 뒤 구독자를 그대로 내보냄
+        # 워커는 match_parallel() 호출 시점에 fork하므로 파이프라인, 로그 기록,
+        # SMTP 세션 스레드를 시작하기 전에 만든다
+        parallel = MATCH_WORKERS > 1 and mode in ("inline", "materialized")
+
+        if mode in ("materialized", "incremental"):
+            # 매칭 단계: 발송 전에 전체 추천 결과를 한 번에 저장 (또는 증분 갱신)
+            match_start = datetime.now()
+            if mode == "incremental":
+                # 저장된 추천 결과 전체와 비교하므로 희망조건도 한 번에 조회
+                refresh_recommendations(
+                    catalog,
+                    load_subscriber_preferences(SUBSCRIBER_PAGE_SIZE),
+                    top_n=10,
+                    match_cache=match_cache,
+                )
+            else:
+                subscribers = iter_subscriber_preferences(SUBSCRIBER_PAGE_SIZE)
+                if parallel:
+                    subscribers = match_parallel(
+                        catalog, subscribers, 10, match_cache, MATCH_WORKERS
+                    )
+                materialize_recommendations(
+                    catalog,
+                    ((user[0], user[3]) for user in subscribers),
+                    top_n=10,
+                    match_cache=match_cache,
+                )
+            logger.info(
+                f"매칭 단계 완료: {(datetime.now() - match_start).total_seconds():.2f}초"
+            )
+
+        if mode in ("inline", "pushdown"):
+            # 희망조건은 구독자와 같은 keyset 페이지로 함께 조회
+            # (한 번에 한 페이지만 메모리에 두고 사용자별 DB 왕복 제거)
+            users = iter_subscriber_preferences(
+                page_size=SUBSCRIBER_PAGE_SIZE, after_user_id=resume_after
+            )
+            if parallel:
+                users = match_parallel(catalog, users, 10, match_cache, MATCH_WORKERS)
+        else:
+            # 저장된 추천 결과로 발송하므로 희망조건은 조회하지 않음
+            users = iter_active_subscribers(
+                page_size=SUBSCRIBER_PAGE_SIZE, after_user_id=resume_after
+            )
+
+        # 사용자별 처리를 매칭 → 렌더링 → 발송 → 로그 기록 파이프라인으로 실행
+        # (매칭 단계는 사용자 순서대로 병렬 매칭 결과를 받으므로 워커 1개)
+        email_service = get_default_email_service()
+        # 날짜·주차·마감일 문구를 배치 동안 고정 (자정을 넘겨도 같은 날짜로 렌더링)
+        email_service.begin_render_batch(start_time)
+        log_writer = BufferedLogWriter(
+            Database.get_cursor,
+            EmailQueries.INSERT_EMAIL_LOG,
+            batch_size=LOG_BATCH_SIZE,
+            flush_interval=LOG_FLUSH_INTERVAL,
+            on_flush=lambda rows: _complete_logged(rows, progress),
+        )
+        pipeline = Pipeline(
+            [
+                Stage(
+                    "match",
+                    lambda task: _match_user(task, mode, catalog, match_cache),
+                    queue_size=PIPELINE_QUEUE_SIZE,
+                ),
+                Stage(
+                    "render",
+                    lambda task: _render_email(task, email_service),
+                    workers=PIPELINE_RENDER_WORKERS,
+                    queue_size=PIPELINE_QUEUE_SIZE,
+                ),
+                Stage(
+                    "send",
+                    lambda task: _send_email(task, email_service),
+                    workers=PIPELINE_SEND_WORKERS,
+                    queue_size=PIPELINE_QUEUE_SIZE,
+                ),
+                Stage(
+                    "log",
+                    lambda task: _log_result(task, log_writer),
+                    workers=PIPELINE_LOG_WORKERS,
+                    queue_size=PIPELINE_QUEUE_SIZE,
+                ),
+            ],
+            on_error=_pipeline_error,
+        )
+        pipeline.run(_subscriber_tasks(users, total_users, progress, context))
+        # 시간이 부족해 멈췄으면 앞서 읽던 구독자 페이지와 매칭 워커 정리
+        users.close()
+        pipeline.log_summary()
+
+        # 실제로 스트리밍된 사용자 수 (조회 중 구독 상태가 바뀌었을 수 있음)
+        first_stage = pipeline.stages[0].metrics
+        total_users = first_stage.processed + first_stage.failed
+
+        # 버퍼에 남은 발송 로그 기록 (기록된 사용자까지 체크포인트가 이동)
+        log_writer.close()
+
+        # 시간이 부족해 멈췄으면 마친 사용자까지 체크포인트를 저장하고
+        # 남은 사용자를 이어서 발송하도록 요청
+        continuation = None
+        if progress.interrupted:
+            progress.save()
+            continuation = progress.continuation()
+            if _continuation_invoker is not None:
                 try:
-                    with Database.get_cursor() as (cursor, connection):
-                        cursor.execute(
-                            EmailQueries.INSERT_EMAIL_LOG,
-                            (
-                                user_id,
-                                email,
-                                "처리 오류",
-                                "PERSONALIZED",
-                                "FAILED",
-                                str(user_error),
-                                0,
-                            ),
-                        )
-                        connection.commit()
-                except Exception as log_error:
-                    logger.error(f"에러 로그 기록 실패: {log_error}")
+                    _continuation_invoker(continuation, context)
+                except Exception as e:
+                    logger.error(f"이어서 발송 요청 실패: {e}")
+        elif progress.pending():
+            # 로그를 기록하지 못한 사용자가 있으면 회차를 끝내지 않고
+            # 기록된 사용자까지만 저장 (재시도는 그 다음부터)
+            logger.error(
+                f"발송 로그를 기록하지 못한 사용자 {progress.pending()}명, "
+                f"체크포인트는 user_id {progress.last_user_id}까지 저장"
+            )
+            progress.save()
+        else:
+            progress.save(completed=True)
+        completed = continuation is None and not progress.pending()
+
+        # 로그 기록까지 마치지 못한 사용자도 실패로 집계
+        success_count = progress.succeeded
+        fail_count = total_users - success_count
+
+        # 발송이 끝나면 유지하던 SMTP 세션 종료
+        close_email_sessions()
 
         # 실행 시간 계산
         end_time = datetime.now()
@@ -151,6 +441,15 @@ def lambda_handler(event, context):
         logger.info(f"발송 성공: {success_count}건")
         logger.info(f"발송 실패: {fail_count}건")
         logger.info(f"성공률: {success_rate:.1f}%")
+        logger.info(
+            f"매칭 중복 제거: 고유 조건 {match_cache.distinct}개 / "
+            f"조회 {match_cache.lookups}건 ({match_cache.dedup_ratio * 100:.1f}% 절감)"
+        )
+        card_cache = email_service.card_cache
+        logger.info(
+            f"공고 카드 캐시: 적중 {card_cache.hits}건 / 생성 {card_cache.misses}건 "
+            f"(적중률 {card_cache.hit_rate * 100:.1f}%)"
+        )
         logger.info(f"총 실행 시간: {execution_time:.2f}초")
 
         # Lambda 응답 반환
@@ -158,11 +457,22 @@ def lambda_handler(event, context):
             "statusCode": 200,
             "body": json.dumps(
                 {
-                    "message": "이메일 발송 완료",
+                    "message": (
+                        "이메일 발송 완료"
+                        if completed
+                        else "이메일 발송 일부 완료 (이어서 발송 필요)"
+                    ),
+                    "run_id": run_id,
+                    "completed": completed,
+                    "continuation": continuation,
                     "total_users": total_users,
                     "success": success_count,
                     "failed": fail_count,
                     "success_rate": round(success_rate, 1),
+                    "distinct_profiles": match_cache.distinct,
+                    "dedup_ratio": round(match_cache.dedup_ratio, 3),
+                    "pipeline": pipeline.summary(),
+                    "job_card_cache": card_cache.stats(),
                     "execution_time_seconds": round(execution_time, 2),
                     "start_time": start_time.isoformat(),
                     "end_time": end_time.isoformat(),
@@ -183,6 +493,12 @@ def lambda_handler(event, context):
 
         logger.critical(f"Lambda 실행 중 치명적 오류: {e}")
         logger.error(f"실행 시간: {execution_time:.2f}초")
+        close_email_sessions()
+        if log_writer is not None:
+            log_writer.close()
+        if progress is not None:
+            # 로그 기록까지 마친 사용자까지만 저장 (재시도는 그 다음부터)
+            progress.save()
 
         return {
             "statusCode": 500,
@@ -198,3 +514,8 @@ def lambda_handler(event, context):
                 ensure_ascii=False,
             ),
         }
+
+    finally:
+        # 웜 컨테이너에서 재사용되는 서비스에 이번 배치의 날짜가 남지 않도록 해제
+        if email_service is not None:
+            email_service.end_render_batch()
@@ -0,0 +1,351 @@
+# services/async_smtp.py
+import asyncio
+import base64
+import logging
+import re
+import smtplib
+import ssl
+from email.generator import BytesGenerator
+from io import BytesIO
+
+logger = logging.getLogger(__name__)
+
+_LINE_START_DOT = re.compile(rb"(?m)^\.")
+_BARE_EOL = re.compile(rb"\r\n|\r|\n")
+
+# MAIL FROM / RCPT TO / DATA 명령별 성공 응답 코드
+_ACCEPTED = ((250,), (250, 251), (354,))
+
+
+def message_to_bytes(message):
+    """email.message.Message → SMTP DATA용 바이트 (smtplib.send_message와 같은 직렬화)"""
+    buffer = BytesIO()
+    BytesGenerator(buffer, policy=message.policy.clone(linesep="\r\n")).flatten(
+        message
+    )
+    return buffer.getvalue()
+
+
+def _quote_data(data):
+    """줄바꿈을 CRLF로 맞추고 '.'으로 시작하는 줄을 이스케이프 (RFC 5321 4.5.2)"""
+    data = _LINE_START_DOT.sub(b"..", _BARE_EOL.sub(b"\r\n", data))
+    if not data.endswith(b"\r\n"):
+        data += b"\r\n"
+    return data + b".\r\n"
+
+
+class AsyncSMTPSession:
+    """asyncio 스트림 위의 SMTP 연결 하나 (EHLO → STARTTLS → AUTH → 메시지 반복)
+
+    실패는 smtplib 예외(SMTPAuthenticationError, SMTPRecipientsRefused 등)로 알려
+    SMTPEmailService.send_message와 같은 방식으로 처리할 수 있게 한다.
+    """
+
+    def __init__(self, host, port, username, password, ssl_context, starttls, timeout):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.ssl_context = ssl_context
+        self.starttls = starttls
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+        self.features = {}
+        self.sent = 0
+
+    @property
+    def connected(self):
+        return self.writer is not None and not self.writer.is_closing()
+
+    async def _reply(self):
+        """여러 줄 응답을 읽어 (코드, 메시지) 반환"""
+        lines = []
+        while True:
+            line = await asyncio.wait_for(self.reader.readline(), self.timeout)
+            if not line:
+                raise smtplib.SMTPServerDisconnected("서버가 연결을 종료했습니다")
+            lines.append(line[4:].rstrip(b"\r\n"))
+            if line[3:4] != b"-":
+                return int(line[:3]), b"\n".join(lines)
+
+    async def command(self, line):
+        self.writer.write(line + b"\r\n")
+        await self.writer.drain()
+        return await self._reply()
+
+    async def _ehlo(self):
+        code, reply = await self.command(b"EHLO job-finder")
+        if code != 250:
+            raise smtplib.SMTPHeloError(code, reply)
+        self.features = {}
+        for line in reply.split(b"\n")[1:]:
+            name, _, params = line.decode("ascii", "replace").partition(" ")
+            self.features[name.lower()] = params
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        code, reply = await self._reply()
+        if code != 220:
+            raise smtplib.SMTPConnectError(code, reply)
+        await self._ehlo()
+
+        if self.starttls:
+            code, reply = await self.command(b"STARTTLS")
+            if code != 220:
+                raise smtplib.SMTPNotSupportedError(f"STARTTLS 실패: {code} {reply}")
+            await self.writer.start_tls(self.ssl_context, server_hostname=self.host)
+            await self._ehlo()
+
+        if self.username:
+            await self._login()
+
+    async def _login(self):
+        methods = self.features.get("auth", "").upper().split()
+        if "PLAIN" in methods or not methods:
+            token = f"\0{self.username}\0{self.password}".encode("utf-8")
+            code, reply = await self.command(b"AUTH PLAIN " + base64.b64encode(token))
+        else:
+            code, reply = await self.command(b"AUTH LOGIN")
+            if code == 334:
+                username = base64.b64encode(self.username.encode("utf-8"))
+                code, reply = await self.command(username)
+            if code == 334:
+                code, reply = await self.command(
+                    base64.b64encode(self.password.encode("utf-8"))
+                )
+        if code not in (235, 503):
+            raise smtplib.SMTPAuthenticationError(code, reply)
+
+    async def _reset(self, code):
+        """거부된 트랜잭션 정리 (421이면 서버가 연결을 끊으므로 RSET 대신 종료)"""
+        if code == 421:
+            await self.close()
+        else:
+            await self.command(b"RSET")
+
+    async def _transaction(self, commands):
+        """MAIL/RCPT/DATA를 보내고 응답 목록 반환
+
+        서버가 PIPELINING을 지원하면 세 명령을 한 번에 쓰고 응답을 차례로 읽어
+        메시지당 왕복을 한 번으로 줄인다 (RFC 2920). 지원하지 않으면 한 명령씩
+        보내고 거부되면 그 자리에서 멈춘다. 421은 서버가 연결을 끊으므로 더 읽지 않는다.
+        """
+        replies = []
+        if "pipelining" in self.features:
+            self.writer.write(b"".join(line + b"\r\n" for line in commands))
+            await self.writer.drain()
+            for _ in commands:
+                replies.append(await self._reply())
+                if replies[-1][0] == 421:
+                    break
+            return replies
+
+        for line, accepted in zip(commands, _ACCEPTED):
+            replies.append(await self.command(line))
+            if replies[-1][0] not in accepted:
+                break
+        return replies
+
+    async def send(self, from_addr, to_addr, data):
+        """메시지 한 통 발송 (거부되면 RSET 후 예외)"""
+        replies = await self._transaction(
+            [
+                f"MAIL FROM:<{from_addr}>".encode("utf-8"),
+                f"RCPT TO:<{to_addr}>".encode("utf-8"),
+                b"DATA",
+            ]
+        )
+        refused = next(
+            (
+                step
+                for step, ((code, _), accepted) in enumerate(zip(replies, _ACCEPTED))
+                if code not in accepted
+            ),
+            None,
+        )
+        if refused is not None:
+            code, reply = replies[refused]
+            if replies[-1][0] == 354:
+                # 수신자가 거부됐는데 DATA가 수락되면 빈 메시지로 끝낸다 (RFC 2920 3.1)
+                self.writer.write(b".\r\n")
+                await self.writer.drain()
+                await self._reply()
+            await self._reset(code)
+            if refused == 0:
+                raise smtplib.SMTPSenderRefused(code, reply, from_addr)
+            if refused == 1:
+                raise smtplib.SMTPRecipientsRefused({to_addr: (code, reply)})
+            raise smtplib.SMTPDataError(code, reply)
+
+        self.writer.write(_quote_data(data))
+        await self.writer.drain()
+        code, reply = await self._reply()
+        if code != 250:
+            raise smtplib.SMTPDataError(code, reply)
+        self.sent += 1
+
+    async def close(self):
+        if self.writer is None:
+            return
+        try:
+            if self.connected:
+                await self.command(b"QUIT")
+        except Exception:
+            pass
+        finally:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except Exception:
+                pass
+            self.writer = None
+
+
+class AsyncSMTPEngine:
+    """여러 SMTP 세션으로 많은 메시지를 동시에 보내는 asyncio 발송 엔진
+
+    sessions: 동시에 여는 SMTP 연결 수 = 동시에 발송 중인 메시지 수
+              (연결마다 메시지를 순서대로 전송, PIPELINING이면 명령 왕복을 묶음)
+    queue_size: 세션에 넘기기 전 직렬화해 대기열에 쌓아 둘 메시지 수
+    max_messages: 세션 하나로 보낼 최대 메시지 수 (넘으면 새로 연결)
+    rate_limiter: AdaptiveRateLimiter가 주어지면 공급자/수신 도메인별 속도를 지킨다
+    결과는 SMTPEmailService.send_message와 같은
+    {"status": "SUCCESS"|"FAIL", "email": ..., "error": ...} 형식이다.
+    """
+
+    def __init__(
+        self,
+        smtp_server,
+        smtp_port,
+        email,
+        password,
+        sessions=10,
+        queue_size=500,
+        max_messages=100,
+        timeout=30,
+        ssl_context=None,
+        starttls=True,
+        rate_limiter=None,
+    ):
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.email = email
+        self.password = password
+        self.sessions = sessions
+        self.queue_size = queue_size
+        self.max_messages = max_messages
+        self.timeout = timeout
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self.starttls = starttls
+        self.rate_limiter = rate_limiter
+
+    def _new_session(self):
+        return AsyncSMTPSession(
+            self.smtp_server,
+            self.smtp_port,
+            self.email,
+            self.password,
+            self.ssl_context,
+            self.starttls,
+            self.timeout,
+        )
+
+    async def _deliver(self, session, to, data):
+        """세션으로 한 통 발송
+
+        연결이 끊겼거나 서버가 421로 세션을 닫았으면 다시 연결해 한 번 재시도한다.
+        재시도도 실패하면 원래 예외를 그대로 올려 rate_limiter가 속도를 줄이게 한다.
+        """
+        for attempt in range(2):
+            if not session.connected or session.sent >= self.max_messages:
+                await session.close()
+                session.sent = 0
+                try:
+                    await session.connect()
+                except Exception:
+                    # 인증 등에 실패한 연결은 다음 메시지에서 다시 연결
+                    await session.close()
+                    raise
+            try:
+                await session.send(self.email, to, data)
+                return
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                await session.close()
+                if attempt:
+                    raise
+            except smtplib.SMTPException:
+                if attempt or session.connected:
+                    raise
+
+    async def _worker(self, queue, results):
+        session = self._new_session()
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                index, to, data = item
+                try:
+                    if self.rate_limiter is None:
+                        await self._deliver(session, to, data)
+                    else:
+                        await self.rate_limiter.run_async(
+                            self.smtp_server,
+                            to,
+                            lambda: self._deliver(session, to, data),
+                        )
+                    results[index] = {"status": "SUCCESS", "email": to}
+                except smtplib.SMTPAuthenticationError as error:
+                    results[index] = {
+                        "status": "FAIL",
+                        "email": to,
+                        "error": f"인증 실패: {str(error)}",
+                    }
+                except smtplib.SMTPRecipientsRefused as error:
+                    results[index] = {
+                        "status": "FAIL",
+                        "email": to,
+                        "error": f"수신자 주소 오류: {str(error)}",
+                    }
+                except Exception as error:
+                    await session.close()
+                    results[index] = {
+                        "status": "FAIL",
+                        "email": to,
+                        "error": str(error),
+                    }
+        finally:
+            await session.close()
+
+    async def send_all(self, messages):
+        """[(수신자, email.message.Message 또는 bytes), ...]를 발송하고 입력 순서대로 결과 반환"""
+        messages = list(messages)
+        results = [None] * len(messages)
+        if not messages:
+            return results
+
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        workers = [
+            asyncio.create_task(self._worker(queue, results))
+            for _ in range(min(self.sessions, len(messages)))
+        ]
+        for index, (to, message) in enumerate(messages):
+            data = message if isinstance(message, bytes) else message_to_bytes(message)
+            await queue.put((index, to, data))
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+
+        success = sum(1 for result in results if result["status"] == "SUCCESS")
+        logger.info(
+            f"비동기 발송 완료: 성공 {success}건, 실패 {len(results) - success}건 "
+            f"(세션 {len(workers)}개)"
+        )
+        return results
+
+    def send_batch(self, messages):
+        """동기 코드에서 호출하는 send_all() 래퍼"""
+        return asyncio.run(self.send_all(messages))
@@ -1,10 +1,66 @@
 import os
 import logging
-from concurrent.futures import ThreadPoolExecutor
 from .smtp_client import SMTPEmailService
+from .rate_limiter import AdaptiveRateLimiter, parse_rates
+from .template_compiler import load_template
 
 logger = logging.getLogger(__name__)
 
+# 개인화 이메일 HTML 템플릿
+PERSONALIZED_TEMPLATE_PATH = "templates/email_template.html"
+
+# SMTP 세션 풀을 호출 간에 공유하기 위한 서비스 인스턴스 (설정별 1개)
+_email_services = {}
+
+# 모든 발송 경로가 함께 쓰는 속도 제한기 (공급자/수신 도메인별 AIMD 토큰 버킷)
+_rate_limiter = AdaptiveRateLimiter(
+    rate=float(os.getenv("SEND_RATE") or 5),
+    max_rate=float(os.getenv("SEND_RATE_MAX") or 20),
+    min_rate=float(os.getenv("SEND_RATE_MIN") or 0.5),
+    domain_rates=parse_rates(os.getenv("DOMAIN_RATE_LIMITS")),
+)
+
+
+def get_email_service(smtp_server, smtp_port, sender_email, sender_password):
+    """설정이 같으면 같은 SMTPEmailService(세션 풀 포함)를 반환"""
+    key = (smtp_server, smtp_port, sender_email)
+    email_service = _email_services.get(key)
+    if email_service is None:
+        email_service = SMTPEmailService(
+            smtp_server,
+            smtp_port,
+            sender_email,
+            sender_password,
+            max_sessions=int(os.getenv("SMTP_MAX_SESSIONS") or 5),
+            max_messages=int(os.getenv("SMTP_MAX_MESSAGES_PER_SESSION") or 100),
+            idle_timeout=int(os.getenv("SMTP_IDLE_TIMEOUT") or 60),
+            rate_limiter=_rate_limiter,
+            job_card_cache_size=int(os.getenv("JOB_CARD_CACHE_SIZE") or 2048),
+        )
+        _email_services[key] = email_service
+    return email_service
+
+
+def close_email_sessions():
+    """유지 중인 SMTP 세션을 모두 종료 (배치 종료 시 호출)"""
+    while _email_services:
+        _, email_service = _email_services.popitem()
+        email_service.close()
+
+
+def get_default_email_service():
+    """환경변수의 SMTP 설정으로 이메일 서비스 인스턴스 반환 (SMTP 세션 재사용)"""
+    smtp_server = os.getenv("SMTP_SERVER")
+    smtp_port = int(os.getenv("SMTP_PORT", 587))
+    sender_email = os.getenv("SENDER_EMAIL")
+    sender_password = os.getenv("SENDER_PASSWORD")
+
+    if not all([smtp_server, sender_email, sender_password]):
+        logger.error("SMTP 환경변수 누락")
+        raise ValueError("SMTP 설정이 완전하지 않습니다. 환경변수를 확인하세요.")
+
+    return get_email_service(smtp_server, smtp_port, sender_email, sender_password)
+
 
 def send_emails(
     email_list,
@@ -16,30 +72,11 @@ def send_emails(
     user_name=None,
 ):
     """이메일 일괄 발송 함수"""
-    # SMTP 설정
-    smtp_server = os.getenv("SMTP_SERVER")
-    smtp_port = int(os.getenv("SMTP_PORT", 587))
-    sender_email = os.getenv("SENDER_EMAIL")
-    sender_password = os.getenv("SENDER_PASSWORD")
+    # 이메일 서비스 인스턴스 (SMTP 세션 재사용)
+    email_service = get_default_email_service()
 
-    if not all([smtp_server, sender_email, sender_password]):
-        logger.error("SMTP 환경변수 누락")
-        raise ValueError("SMTP 설정이 완전하지 않습니다. 환경변수를 확인하세요.")
-
-    # 이메일 서비스 인스턴스 생성
-    email_service = SMTPEmailService(
-        smtp_server, smtp_port, sender_email, sender_password
-    )
-
-    # HTML 파일 읽기
-    html_content = None
-    if html_file_path and os.path.exists(html_file_path):
-        try:
-            with open(html_file_path, "r", encoding="utf-8") as file:
-                html_content = file.read()
-        except Exception as e:
-            logger.error(f"HTML 템플릿 파일 읽기 실패: {e}")
-            html_content = None
+    # HTML 템플릿 (파일이 바뀌지 않았으면 컴파일해 둔 템플릿 재사용)
+    html_content = load_template(html_file_path) if html_file_path else None
 
     # 단일 이메일 발송
     if len(email_list) == 1:
@@ -55,46 +92,53 @@ def send_emails(
         )
         return {email: (result["status"], result.get("error"))}
 
-    # 여러 이메일 병렬 발송
+    # 여러 이메일 병렬 발송 (asyncio 엔진, 여러 SMTP 세션 동시 사용)
     logger.info(f"병렬 발송 시작: {len(email_list)}명")
 
-    def send_single_email(email):
-        try:
-            result = email_service.send_message(
-                to=email,
-                subject=subject,
-                message_text=message_text,
-                html_content=html_content,
-                attachment_path=attachment_path,
-                job_data=job_data,
-                user_name=user_name,
-            )
-            return email, (result["status"], result.get("error"))
-        except Exception as e:
-            logger.error(f"발송 실패: {email} - {e}")
-            return email, ("FAIL", str(e))
-
-    # 병렬 처리
+    send_results = email_service.send_messages(
+        [
+            {
+                "to": email,
+                "subject": subject,
+                "message_text": message_text,
+                "html_content": html_content,
+                "attachment_path": attachment_path,
+                "job_data": job_data,
+                "user_name": user_name,
+            }
+            for email in email_list
+        ],
+        sessions=int(os.getenv("ASYNC_SMTP_SESSIONS") or 10),
+    )
+
     results = {}
     success_count = 0
     fail_count = 0
 
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        futures = [executor.submit(send_single_email, email) for email in email_list]
+    for email, result in zip(email_list, send_results):
+        results[email] = (result["status"], result.get("error"))
 
-        for future in futures:
-            email, result = future.result()
-            results[email] = result
-
-            if result[0] == "SUCCESS":
-                success_count += 1
-            else:
-                fail_count += 1
+        if result["status"] == "SUCCESS":
+            success_count += 1
+        else:
+            fail_count += 1
 
     logger.info(f"병렬 발송 완료: 성공 {success_count}건, 실패 {fail_count}건")
     return results
 
 
+def personalized_email_request(email, user_name, recommended_jobs):
+    """개인화된 채용공고 이메일의 send_message() 인자 (파이프라인 렌더링 단계용)"""
+    return {
+        "to": email,
+        "subject": f"{user_name}님을 위한 맞춤 채용공고",
+        "message_text": f"안녕하세요 {user_name}님!\n\n맞춤형 채용공고를 확인해보세요.",
+        "html_content": load_template(PERSONALIZED_TEMPLATE_PATH),
+        "job_data": recommended_jobs,
+        "user_name": user_name,
+    }
+
+
 def send_personalized_email(email, user_name, recommended_jobs):
     """개인화된 채용공고 이메일 발송"""
     try:
@@ -102,7 +146,7 @@ def send_personalized_email(email, user_name, recommended_jobs):
             email_list=[email],
             subject=f"{user_name}님을 위한 맞춤 채용공고",
             message_text=f"안녕하세요 {user_name}님!\n\n맞춤형 채용공고를 확인해보세요.",
-            html_file_path="templates/email_template.html",
+            html_file_path=PERSONALIZED_TEMPLATE_PATH,
             job_data=recommended_jobs,
             user_name=user_name,
         )
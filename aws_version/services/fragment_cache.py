@@ -0,0 +1,70 @@
+# services/fragment_cache.py
+import threading
+from collections import OrderedDict
+
+
+class FragmentCache:
+    """렌더링한 HTML 조각을 사용자 사이에서 재사용하는 크기 제한 LRU 캐시
+
+    인기 공고는 수많은 사용자의 추천 목록에 함께 들어가므로, 공고 카드를
+    (공고 id, 희망기업 여부, 렌더링 날짜, 템플릿 버전) 같은 키로 한 번만 만들고
+    이후에는 캐시된 조각을 이어 붙인다. 가장 오래 쓰이지 않은 조각부터 버린다.
+    """
+
+    def __init__(self, max_size=2048):
+        self.max_size = max_size
+        self._fragments = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """key의 조각 (없으면 None, 적중/실패 횟수에 반영)"""
+        with self._lock:
+            fragment = self._fragments.get(key)
+            if fragment is None:
+                self.misses += 1
+                return None
+            self._fragments.move_to_end(key)
+            self.hits += 1
+            return fragment
+
+    def put(self, key, fragment):
+        with self._lock:
+            self._fragments[key] = fragment
+            self._fragments.move_to_end(key)
+            while len(self._fragments) > self.max_size:
+                self._fragments.popitem(last=False)
+
+    def get_or_create(self, key, create):
+        """key의 조각을 반환 (없으면 create()로 만들어 저장)
+
+        여러 렌더링 워커가 동시에 같은 조각을 만들 수 있지만 결과는 같다.
+        """
+        fragment = self.get(key)
+        if fragment is None:
+            fragment = create()
+            self.put(key, fragment)
+        return fragment
+
+    def clear(self):
+        with self._lock:
+            self._fragments.clear()
+
+    @property
+    def size(self):
+        return len(self._fragments)
+
+    @property
+    def hit_rate(self):
+        """캐시에서 조각을 찾은 비율 (0~1)"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+            "size": self.size,
+        }
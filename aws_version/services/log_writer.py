@@ -0,0 +1,138 @@
+# services/log_writer.py
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedLogWriter:
+    """로그 행을 모아 executemany 한 번으로 INSERT하는 버퍼
+
+    pymysql은 INSERT ... VALUES (...)의 executemany를 multi-row INSERT로
+    바꿔 보내므로 행마다 연결/INSERT/commit 하던 왕복이 묶음당 한 번이 된다.
+    batch_size건이 쌓이거나 flush_interval초가 지나면 기록하고, close()에서
+    남은 행을 모두 기록한다. 기록에 실패한 행은 버퍼 앞에 되돌려 다음 기록 때
+    다시 시도한다 (최소 한 번 기록, commit 직후 오류가 나면 중복될 수 있음).
+    on_flush가 주어지면 commit을 마친 행 목록으로 호출한다 (기록 완료 확인용).
+    """
+
+    def __init__(
+        self,
+        get_cursor,
+        query,
+        batch_size=200,
+        flush_interval=5.0,
+        close_retries=3,
+        on_flush=None,
+    ):
+        self.get_cursor = get_cursor
+        self.query = query
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.close_retries = close_retries
+        self.on_flush = on_flush
+
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = None
+        self._flusher = None
+        self._retry_at = 0.0
+        self.rows_written = 0
+        self.flushes = 0
+
+    def write(self, row):
+        """행 하나를 버퍼에 추가 (batch_size에 도달하면 바로 기록)"""
+        with self._lock:
+            self._buffer.append(row)
+            # 직전 기록이 실패했으면 크기로는 바로 재시도하지 않음 (주기 기록에 맡김)
+            full = (
+                len(self._buffer) >= self.batch_size
+                and time.monotonic() >= self._retry_at
+            )
+            if self.flush_interval and self._flusher is None:
+                self._start_flusher()
+        if full:
+            self.flush()
+
+    def _start_flusher(self):
+        """flush_interval마다 버퍼를 기록하는 백그라운드 스레드 시작"""
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically,
+            args=(self._stop,),
+            name="log-writer",
+            daemon=True,
+        )
+        self._flusher.start()
+
+    def _flush_periodically(self, stop):
+        while not stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """버퍼의 행을 한 번에 기록하고 기록한 행 수 반환 (실패하면 0)"""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+
+            start = time.perf_counter()
+            try:
+                with self.get_cursor() as (cursor, connection):
+                    cursor.executemany(self.query, rows)
+                    connection.commit()
+            except Exception as e:
+                # 기록하지 못한 행은 순서를 유지해 버퍼 앞에 되돌림
+                with self._lock:
+                    self._buffer[:0] = rows
+                    self._retry_at = time.monotonic() + (self.flush_interval or 1)
+                logger.error(f"로그 일괄 기록 실패 ({len(rows)}건, 재시도 예정): {e}")
+                return 0
+
+            self.rows_written += len(rows)
+            self.flushes += 1
+            if self.on_flush is not None:
+                self.on_flush(rows)
+            logger.debug(
+                f"로그 {len(rows)}건 일괄 기록: {time.perf_counter() - start:.3f}초"
+            )
+            return len(rows)
+
+    def pending(self):
+        """아직 기록하지 않은 행 수"""
+        with self._lock:
+            return len(self._buffer)
+
+    def close(self):
+        """백그라운드 기록을 멈추고 남은 행을 모두 기록
+
+        재시도해도 기록하지 못한 행은 유실되지 않도록 로그에 남긴다.
+        """
+        with self._lock:
+            stop, flusher = self._stop, self._flusher
+            self._stop = self._flusher = None
+        if stop is not None:
+            stop.set()
+            flusher.join()
+
+        for attempt in range(self.close_retries):
+            self.flush()
+            if not self.pending() or attempt + 1 == self.close_retries:
+                break
+            time.sleep(2**attempt)
+
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+        if rows:
+            logger.critical(f"로그 {len(rows)}건 기록 실패: {rows}")
+        if self.flushes:
+            logger.info(f"로그 {self.rows_written}건을 {self.flushes}번에 나눠 기록")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,139 @@
+# services/parallel_matcher.py
+import collections
+import logging
+import multiprocessing
+import os
+from services.job_matcher import match_catalog
+
+logger = logging.getLogger(__name__)
+
+
+def _match_worker(connection, catalog, top_n):
+    """워커 프로세스: 받은 프로필을 순서대로 매칭해 같은 파이프로 결과 전송 (None이면 종료)"""
+    try:
+        while True:
+            profile = connection.recv()
+            if profile is None:
+                break
+            connection.send(match_catalog(profile, catalog, top_n))
+    except (EOFError, BrokenPipeError):
+        pass  # 부모 프로세스가 매칭을 마쳤거나 중단함
+    except Exception as e:
+        connection.send(RuntimeError(f"매칭 워커 오류: {e}"))
+    finally:
+        connection.close()
+
+
+def match_parallel(catalog, users, top_n, match_cache, workers=None, window=128):
+    """users를 그대로 내보내면서, 처음 보는 희망조건은 워커 프로세스가 미리 매칭해
+    match_cache에 등록하는 이터레이터 반환
+
+    users: iter_subscriber_preferences()의 (user_id, email, name, UserProfile) 튜플
+    워커는 fork로 만들어 catalog를 copy-on-write로 공유하므로 작업마다
+    스냅샷을 직렬화하지 않는다. Lambda에는 /dev/shm이 없어 Pool/Queue 대신
+    Process + Pipe를 사용한다.
+    워커는 결과를 처음 읽을 때가 아니라 이 함수를 호출할 때 바로 fork하므로,
+    파이프라인이나 로그 기록 스레드를 시작하기 전에 호출해야 한다 (다른
+    스레드가 잡고 있던 잠금이나 DB/SMTP 소켓이 자식 프로세스에 복제되지 않도록).
+    사용자를 window명까지 앞서 읽어 그 안의 새 희망조건 시그니처만 워커에
+    라운드로빈으로 보내므로, 구독자 수와 상관없이 메모리에는 window명과
+    match_cache(고유 희망조건 수)만 남는다. 사용자를 내보낼 때는 그 사용자의
+    결과가 match_cache에 있어 get_personalized_jobs()가 바로 결과를 얻는다.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+        # 단일 프로세스: 호출 측에서 match_cache로 직접 매칭
+        return iter(users)
+
+    logger.info(f"병렬 매칭 시작: 워커 {workers}개, 선행 읽기 {window}명")
+
+    context = multiprocessing.get_context("fork")
+    connections = []
+    processes = []
+    for _ in range(workers):
+        connection, child = context.Pipe()
+        process = context.Process(
+            target=_match_worker, args=(child, catalog, top_n), daemon=True
+        )
+        process.start()
+        child.close()
+        connections.append(connection)
+        processes.append(process)
+
+    return _stream_matched(
+        users, catalog, top_n, match_cache, connections, processes, window
+    )
+
+
+def _stream_matched(users, catalog, top_n, match_cache, connections, processes, window):
+    """앞서 읽은 사용자의 새 희망조건을 워커에 보내고, 결과를 등록한 사용자부터
+    입력 순서대로 내보냄 (끝나면 워커 정리)
+
+    워커 오류로 매칭이 끊기면 오류를 기록하고 나머지 사용자는 그대로 내보내
+    호출 측에서 직접 매칭하게 한다.
+    """
+    ahead = collections.deque()
+    # 워커별로 보낸 프로필 (워커는 받은 순서대로 결과를 보낸다)
+    sent = [collections.deque() for _ in connections]
+    # 결과를 기다리는 희망조건 시그니처 → 워커 번호
+    pending = {}
+    turn = 0
+    failed = False
+
+    def stop(error):
+        nonlocal failed
+        logger.error(f"병렬 매칭 중단, 직접 매칭으로 전환: {error}")
+        failed = True
+        pending.clear()
+
+    def dispatch(profile):
+        nonlocal turn
+        if profile.signature in pending or match_cache.has(profile, catalog, top_n):
+            return
+        connections[turn].send(profile)
+        sent[turn].append(profile)
+        pending[profile.signature] = turn
+        turn = (turn + 1) % len(connections)
+
+    def receive(worker):
+        result = connections[worker].recv()
+        if isinstance(result, Exception):
+            raise result
+        profile = sent[worker].popleft()
+        del pending[profile.signature]
+        match_cache.store(profile, catalog, top_n, result)
+
+    def release():
+        user = ahead.popleft()
+        try:
+            while user[3].signature in pending:
+                receive(pending[user[3].signature])
+        except Exception as e:
+            stop(e)
+        return user
+
+    try:
+        for user in users:
+            ahead.append(user)
+            if not failed:
+                try:
+                    dispatch(user[3])
+                except Exception as e:
+                    stop(e)
+            if len(ahead) >= window:
+                yield release()
+        while ahead:
+            yield release()
+    finally:
+        # 나중에 fork한 워커도 앞 워커의 파이프를 물려받아 닫기만으로는 EOF가
+        # 가지 않으므로 종료 신호를 보냄
+        for connection in connections:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+            connection.close()
+        for process in processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
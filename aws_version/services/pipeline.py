@@ -0,0 +1,201 @@
+# services/pipeline.py
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# 단계 종료 신호
+_DONE = object()
+
+
+class StageMetrics:
+    """단계별 처리량과 대기 시간 (역압 지표)
+
+    busy: 작업 함수를 실행한 시간 합계 (초)
+    starved: 입력 큐가 비어 기다린 시간 합계 (앞 단계가 느림)
+    blocked: 다음 단계 큐가 가득 차 기다린 시간 합계 (뒤 단계가 느림)
+    max_depth: 입력 큐에 쌓였던 최대 작업 수
+    """
+
+    __slots__ = ("processed", "failed", "busy", "starved", "blocked", "max_depth")
+
+    def __init__(self):
+        self.processed = 0
+        self.failed = 0
+        self.busy = 0.0
+        self.starved = 0.0
+        self.blocked = 0.0
+        self.max_depth = 0
+
+    def as_dict(self):
+        return {
+            "processed": self.processed,
+            "failed": self.failed,
+            "busy_seconds": round(self.busy, 2),
+            "starved_seconds": round(self.starved, 2),
+            "blocked_seconds": round(self.blocked, 2),
+            "max_queue_depth": self.max_depth,
+        }
+
+
+class Stage:
+    """파이프라인 단계: func(item)의 반환값을 다음 단계로 넘긴다 (None이면 버림)
+
+    workers: 이 단계를 동시에 실행할 스레드 수
+    queue_size: 입력 큐 크기 (가득 차면 앞 단계가 기다림)
+    """
+
+    def __init__(self, name, func, workers=1, queue_size=50):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.metrics = StageMetrics()
+        self._lock = threading.Lock()
+        self._alive = 0
+
+
+class Pipeline:
+    """크기가 제한된 큐로 연결된 단계를 각자의 스레드에서 동시에 실행
+
+    사용자 k의 SMTP 왕복 동안 사용자 k+1의 매칭/렌더링이 진행되므로
+    전체 시간이 단계 합계가 아니라 가장 느린 단계에 가까워진다.
+    단계에서 예외가 나면 on_error(item, stage_name, error)의 반환값을
+    마지막 단계로 바로 넘긴다 (on_error가 없거나 None을 반환하면 버림).
+    run()은 마지막 단계의 반환값 중 None이 아닌 것을 완료 순서대로 모아 반환한다
+    (마지막 단계가 None을 반환하면 처리한 작업 수만큼 메모리를 쓰지 않는다).
+    """
+
+    def __init__(self, stages, on_error=None):
+        self.stages = list(stages)
+        self.on_error = on_error
+        self.source_blocked = 0.0
+        self.results = []
+        self.elapsed = 0.0
+
+    def _put(self, metrics, lock, stage, item):
+        """다음 단계 큐에 넣고 기다린 시간을 보내는 쪽 지표에 기록"""
+        start = time.perf_counter()
+        stage.queue.put(item)
+        waited = time.perf_counter() - start
+        depth = stage.queue.qsize()
+        with lock:
+            metrics.blocked += waited
+        with stage._lock:
+            stage.metrics.max_depth = max(stage.metrics.max_depth, depth)
+
+    def _work(self, position):
+        stage = self.stages[position]
+        following = (
+            self.stages[position + 1] if position + 1 < len(self.stages) else None
+        )
+        last = self.stages[-1]
+        metrics = stage.metrics
+
+        try:
+            while True:
+                start = time.perf_counter()
+                item = stage.queue.get()
+                started = time.perf_counter()
+                if item is _DONE:
+                    break
+
+                try:
+                    result = stage.func(item)
+                    error = None
+                except Exception as e:
+                    result, error = None, e
+                finished = time.perf_counter()
+
+                with stage._lock:
+                    metrics.starved += started - start
+                    metrics.busy += finished - started
+                    if error is None:
+                        metrics.processed += 1
+                    else:
+                        metrics.failed += 1
+
+                if error is not None:
+                    logger.error(f"파이프라인 {stage.name} 단계 오류: {error}")
+                    fallback = self._fallback(item, stage, following, error)
+                    if fallback is not None:
+                        self._put(metrics, stage._lock, last, fallback)
+                elif result is None:
+                    continue
+                elif following is None:
+                    self.results.append(result)
+                else:
+                    self._put(metrics, stage._lock, following, result)
+        finally:
+            # 단계의 마지막 워커가 끝나면 다음 단계 워커에 종료 신호 전달
+            with stage._lock:
+                stage._alive -= 1
+                last_worker = stage._alive == 0
+            if last_worker and following is not None:
+                for _ in range(following.workers):
+                    following.queue.put(_DONE)
+
+    def _fallback(self, item, stage, following, error):
+        """실패한 작업을 마지막 단계로 넘길 값 (없으면 None)"""
+        if following is None or self.on_error is None:
+            return None
+        try:
+            return self.on_error(item, stage.name, error)
+        except Exception as e:
+            logger.error(f"파이프라인 오류 처리 실패: {e}")
+            return None
+
+    def run(self, items):
+        """items를 첫 단계에 넣고 모든 단계가 끝날 때까지 대기"""
+        start = time.perf_counter()
+        threads = []
+        for position, stage in enumerate(self.stages):
+            stage._alive = stage.workers
+            for worker_id in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._work,
+                    args=(position,),
+                    name=f"{stage.name}-{worker_id}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        first = self.stages[0]
+        source_lock = threading.Lock()
+        source = StageMetrics()
+        try:
+            for item in items:
+                self._put(source, source_lock, first, item)
+        finally:
+            for _ in range(first.workers):
+                first.queue.put(_DONE)
+            for thread in threads:
+                thread.join()
+            self.source_blocked = source.blocked
+            self.elapsed = time.perf_counter() - start
+
+        return self.results
+
+    def summary(self):
+        """단계별 지표 딕셔너리"""
+        return {stage.name: stage.metrics.as_dict() for stage in self.stages}
+
+    def log_summary(self):
+        """단계별 처리 시간과 역압 지표를 로그로 남기고 병목 단계를 표시"""
+        bottleneck = max(
+            self.stages, key=lambda stage: stage.metrics.busy / stage.workers
+        )
+        logger.info(
+            f"파이프라인 완료: {self.elapsed:.2f}초 (병목: {bottleneck.name}, "
+            f"입력 공급 대기 {self.source_blocked:.2f}초)"
+        )
+        for stage in self.stages:
+            m = stage.metrics
+            logger.info(
+                f"  {stage.name} (워커 {stage.workers}): 처리 {m.processed}건, "
+                f"실패 {m.failed}건, 작업 {m.busy:.2f}초, 입력 대기 {m.starved:.2f}초, "
+                f"출력 대기 {m.blocked:.2f}초, 최대 큐 {m.max_depth}"
+            )
@@ -0,0 +1,139 @@
+# services/send_progress.py
+import collections
+import json
+import logging
+import threading
+from db.db_aws import Database
+from db.db_query import EmailQueries
+
+logger = logging.getLogger(__name__)
+
+
+class SendProgress:
+    """발송 회차(run_id)의 체크포인트를 email_send_progress 테이블에 기록
+
+    파이프라인은 여러 발송 워커가 순서와 다르게 끝내므로, 보낸 순서대로
+    user_id를 기억해 두고 앞선 사용자가 모두 끝난 지점까지만 체크포인트를
+    옮긴다. 그래서 재시도는 체크포인트 다음 사용자부터 시작해도 빠지는
+    사용자가 없고, 이미 발송한 사용자에게 다시 보내지 않는다.
+    save_every명을 마칠 때마다 저장하므로 Lambda가 시간 초과로 강제 종료돼도
+    잃는 진행은 그 이하이다.
+    테이블이 없거나 조회에 실패하면 체크포인트 없이 처음부터 발송한다.
+    """
+
+    def __init__(self, run_id, last_user_id=0, completed=False, save_every=100):
+        self.run_id = run_id
+        self.last_user_id = last_user_id
+        self.completed = completed
+        self.save_every = save_every
+        self.enabled = True
+        self.interrupted = False
+        # 이번 호출에서 발송 로그까지 기록된 발송 성공 수
+        self.succeeded = 0
+
+        self._issued = collections.deque()
+        self._done = set()
+        self._lock = threading.Lock()
+        self._since_save = 0
+
+    @classmethod
+    def load(cls, run_id, save_every=100):
+        """저장된 체크포인트를 읽어 생성 (없으면 처음부터)"""
+        try:
+            with Database.get_cursor() as (cursor, connection):
+                cursor.execute(EmailQueries.GET_SEND_PROGRESS, (run_id,))
+                row = cursor.fetchone()
+        except Exception as e:
+            logger.error(f"발송 진행 상황 조회 실패, 체크포인트 없이 진행: {e}")
+            progress = cls(run_id, save_every=save_every)
+            progress.enabled = False
+            return progress
+
+        if row is None:
+            return cls(run_id, save_every=save_every)
+        return cls(run_id, row[0], bool(row[1]), save_every=save_every)
+
+    def issue(self, user_id):
+        """파이프라인에 넣은 사용자 (user_id 오름차순으로 호출)"""
+        with self._lock:
+            self._issued.append(user_id)
+
+    def complete(self, user_id, succeeded=False):
+        """발송 로그가 기록된 사용자 (완료 순서는 상관없음, succeeded면 발송 성공)"""
+        with self._lock:
+            self.succeeded += succeeded
+            self._done.add(user_id)
+            while self._issued and self._issued[0] in self._done:
+                self._done.discard(self._issued[0])
+                self.last_user_id = self._issued.popleft()
+                self._since_save += 1
+            due = self._since_save >= self.save_every
+        if due:
+            self.save()
+
+    def pending(self):
+        """파이프라인에 넣었지만 체크포인트에 들지 못한 사용자 수"""
+        with self._lock:
+            return len(self._issued)
+
+    def save(self, completed=False):
+        """체크포인트 저장 (실패해도 발송은 계속)"""
+        with self._lock:
+            last_user_id = self.last_user_id
+            self._since_save = 0
+        if not self.enabled:
+            return
+        try:
+            with Database.get_cursor() as (cursor, connection):
+                cursor.execute(
+                    EmailQueries.UPSERT_SEND_PROGRESS,
+                    (self.run_id, last_user_id, int(completed)),
+                )
+                connection.commit()
+        except Exception as e:
+            logger.error(f"발송 체크포인트 저장 실패 (user_id={last_user_id}): {e}")
+            return
+
+        self.completed = completed
+        logger.info(
+            f"발송 체크포인트 저장: {self.run_id} user_id={last_user_id}"
+            f"{' (완료)' if completed else ''}"
+        )
+
+    def continuation(self):
+        """다음 호출에서 이어서 발송할 때 넘길 이벤트"""
+        return {"run_id": self.run_id, "resume_after": self.last_user_id}
+
+
+def resolve_run_id(event, context, now):
+    """발송 회차 id (재시도와 이어서 발송이 자정을 넘겨도 같은 값)
+
+    호출 시각이 아니라 배치를 시작한 호출에서 정한다.
+    - 이벤트의 run_id (이어서 발송, 수동 실행)
+    - EventBridge 예약 이벤트의 예약 시각(time) 날짜: 재시도해도 같은 이벤트가
+      다시 전달되므로 같은 회차가 된다
+    - 비동기 호출의 요청 id: Lambda는 같은 요청 id로 재시도한다
+    - 로컬 실행(context 없음)이면 now의 날짜
+    """
+    if event.get("run_id"):
+        return str(event["run_id"])
+    if event.get("time"):
+        return str(event["time"])[:10]
+    if context is not None:
+        return context.aws_request_id
+    return now.strftime("%Y-%m-%d")
+
+
+def invoke_lambda(payload, context):
+    """같은 Lambda 함수를 비동기(Event)로 다시 호출해 남은 사용자를 발송
+
+    boto3는 Lambda 런타임에 포함되어 있으므로 호출할 때만 불러온다.
+    """
+    import boto3
+
+    boto3.client("lambda").invoke(
+        FunctionName=context.invoked_function_arn,
+        InvocationType="Event",
+        Payload=json.dumps(payload).encode("utf-8"),
+    )
+    logger.info(f"남은 발송을 위해 Lambda 재호출: {payload}")
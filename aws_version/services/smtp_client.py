@@ -5,17 +5,55 @@ from email import encoders
 import smtplib
 import os
 import logging
-from datetime import datetime
+from .smtp_pool import SMTPSessionPool
+from .async_smtp import AsyncSMTPEngine, message_to_bytes
+from .mime_builder import MessageBuilder
+from .template_compiler import CompiledTemplate, compile_template
+from .fragment_cache import FragmentCache
+from .template_minifier import minify_html
+from .render_context import RenderContext, calculate_deadline_info, get_week_info
 
 logger = logging.getLogger(__name__)
 
+# 공고 카드 마크업 버전 (create_job_card_html()의 HTML을 바꾸면 올림)
+JOB_CARD_VERSION = 2
+
 
 class SMTPEmailService:
-    def __init__(self, smtp_server, smtp_port, email, password):
+    def __init__(
+        self,
+        smtp_server,
+        smtp_port,
+        email,
+        password,
+        max_sessions=5,
+        max_messages=100,
+        idle_timeout=60,
+        rate_limiter=None,
+        job_card_cache_size=2048,
+    ):
         self.smtp_server = smtp_server
         self.smtp_port = smtp_port
         self.email = email
         self.password = password
+        # 인증된 SMTP 세션을 여러 메시지에 재사용
+        self.pool = SMTPSessionPool(
+            smtp_server,
+            smtp_port,
+            email,
+            password,
+            max_sessions=max_sessions,
+            max_messages=max_messages,
+            idle_timeout=idle_timeout,
+        )
+        # 공급자/수신 도메인별 발송 속도 제한 (AdaptiveRateLimiter, 없으면 제한 없음)
+        self.rate_limiter = rate_limiter
+        # 수신자마다 같은 헤더/MIME 경계를 미리 인코딩해 둔 메시지 조립기
+        self.message_builder = MessageBuilder(email)
+        # 사용자 사이에서 공유하는 공고 카드 HTML 조각
+        self.card_cache = FragmentCache(job_card_cache_size)
+        # 배치 동안 고정하는 날짜 관련 렌더링 값 (begin_render_batch()에서 생성)
+        self.render_context = None
 
     def create_message(
         self,
@@ -27,7 +65,20 @@ class SMTPEmailService:
         job_data=None,
         user_name=None,
     ):
-        """이메일 메시지 생성"""
+        """이메일 메시지 생성 (SMTP DATA로 바로 보낼 수 있는 바이트)"""
+        # HTML 본문 (job_data가 있으면 템플릿에 삽입)
+        if html_content:
+            if job_data:
+                html_content = self.insert_job_data(
+                    html_content, job_data, user_name or ""
+                )
+            elif isinstance(html_content, CompiledTemplate):
+                html_content = html_content.source
+
+        # 첨부파일이 없으면 미리 인코딩한 헤더/경계에 본문만 붙여 바로 조립
+        if not (attachment_path and os.path.exists(attachment_path)):
+            return self.message_builder.build(to, subject, message_text, html_content)
+
         message = MIMEMultipart("alternative")
         message["From"] = self.email
         message["To"] = to
@@ -38,28 +89,23 @@ class SMTPEmailService:
             text_part = MIMEText(message_text, "plain", "utf-8")
             message.attach(text_part)
 
-        # HTML 본문 추가 (job_data가 있으면 템플릿에 삽입)
+        # HTML 본문 추가
         if html_content:
-            if job_data:
-                html_content = self.insert_job_data(
-                    html_content, job_data, user_name or ""
-                )
             html_part = MIMEText(html_content, "html", "utf-8")
             message.attach(html_part)
 
-        # 첨부파일이 있으면 추가
-        if attachment_path and os.path.exists(attachment_path):
-            with open(attachment_path, "rb") as attachment:
-                part = MIMEBase("application", "octet-stream")
-                part.set_payload(attachment.read())
-            encoders.encode_base64(part)
-            part.add_header(
-                "Content-Disposition",
-                f"attachment; filename={os.path.basename(attachment_path)}",
-            )
-            message.attach(part)
+        # 첨부파일 추가
+        with open(attachment_path, "rb") as attachment:
+            part = MIMEBase("application", "octet-stream")
+            part.set_payload(attachment.read())
+        encoders.encode_base64(part)
+        part.add_header(
+            "Content-Disposition",
+            f"attachment; filename={os.path.basename(attachment_path)}",
+        )
+        message.attach(part)
 
-        return message
+        return message_to_bytes(message)
 
     def send_message(
         self,
@@ -84,12 +130,22 @@ class SMTPEmailService:
                 job_data,
                 user_name,
             )
+        except Exception as error:
+            logger.error(f"❌ 발송 실패: {to} - {error}")
+            return {"status": "FAIL", "email": to, "error": str(error)}
+
+        return self.deliver(to, message)
 
-            # SMTP 서버 연결 및 발송
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.email, self.password)
-                server.send_message(message)
+    def deliver(self, to, message):
+        """create_message()로 만든 메시지 발송 (send_message()와 같은 결과 형식)"""
+        try:
+            # 풀에서 인증된 SMTP 세션을 빌려 발송
+            if self.rate_limiter is None:
+                self.pool.send(message, to)
+            else:
+                self.rate_limiter.run(
+                    self.smtp_server, to, lambda: self.pool.send(message, to)
+                )
 
             logger.info(f"✅ 발송 성공: {to}")
             return {"status": "SUCCESS", "email": to}
@@ -110,27 +166,105 @@ class SMTPEmailService:
             logger.error(f"❌ 발송 실패: {to} - {error}")
             return {"status": "FAIL", "email": to, "error": str(error)}
 
+    def send_messages(self, requests, sessions=10, queue_size=500):
+        """여러 이메일을 AsyncSMTPEngine으로 동시에 발송
+
+        requests: send_message() 키워드 인자 딕셔너리 목록
+        sessions: 동시에 여는 SMTP 연결 수 (동시 발송 수)
+        queue_size: 발송 대기열 크기 (AsyncSMTPEngine 참고)
+        send_message()와 같은 형식의 결과 딕셔너리를 입력 순서대로 반환한다.
+        """
+        results = [None] * len(requests)
+        messages = []
+        positions = []
+        for i, request in enumerate(requests):
+            try:
+                messages.append((request["to"], self.create_message(**request)))
+                positions.append(i)
+            except Exception as error:
+                logger.error(f"❌ 메시지 생성 실패: {request['to']} - {error}")
+                results[i] = {
+                    "status": "FAIL",
+                    "email": request["to"],
+                    "error": str(error),
+                }
+
+        engine = AsyncSMTPEngine(
+            self.smtp_server,
+            self.smtp_port,
+            self.email,
+            self.password,
+            sessions=sessions,
+            queue_size=queue_size,
+            max_messages=self.pool.max_messages,
+            rate_limiter=self.rate_limiter,
+        )
+        for i, result in zip(positions, engine.send_batch(messages)):
+            results[i] = result
+        return results
+
+    def close(self):
+        """유지 중인 SMTP 세션 종료"""
+        self.pool.close()
+
+    def begin_render_batch(self, now=None):
+        """배치 렌더링 시작: 오늘 날짜·주차·마감일 문구를 배치 동안 고정"""
+        self.render_context = RenderContext(now)
+        return self.render_context
+
+    def end_render_batch(self):
+        """배치 렌더링 종료: 이후 렌더링은 다시 렌더링 시점 기준 날짜를 사용"""
+        self.render_context = None
+
+    def _current_render_context(self):
+        """배치 중이면 배치의 RenderContext, 아니면 지금 기준으로 새로 생성"""
+        return self.render_context or RenderContext()
+
     def insert_job_data(self, html_content, job_data, user_name):
-        """HTML 템플릿에 채용공고 데이터 삽입"""
-        # 기본 정보 교체
-        current_date = datetime.now().strftime("%Y.%m.%d")
-        week_info = self.get_week_info()
+        """HTML 템플릿에 채용공고 데이터 삽입
 
-        html_content = html_content.replace("{{USER_NAME}}", user_name)
-        html_content = html_content.replace("{{CURRENT_DATE}}", current_date)
-        html_content = html_content.replace("{{WEEK}}", week_info)
+        html_content: 템플릿 문자열 또는 CompiledTemplate
+        """
+        template = compile_template(html_content)
+        context = self._current_render_context()
 
         # 채용공고 카드들 생성
         job_cards_html = "".join(
-            self.create_job_card_html(job_info) for job_info in job_data
+            self.cached_job_card_html(job_info, context) for job_info in job_data
+        )
+
+        # 기본 정보와 카드를 치환 자리에 넣어 한 번에 조립
+        html_content = template.render(
+            {
+                "USER_NAME": user_name,
+                "CURRENT_DATE": context.current_date,
+                "WEEK": context.week_info,
+                "JOB_CARDS": job_cards_html,
+            }
         )
-        html_content = html_content.replace("{{JOB_CARDS}}", job_cards_html)
 
         logger.info(f"템플릿 생성 완료: {len(job_data)}개 공고")
         return html_content
 
-    def create_job_card_html(self, job_info):
-        """개별 채용공고 카드 HTML 생성"""
+    def cached_job_card_html(self, job_info, context=None):
+        """공고 카드 HTML (같은 공고·희망기업 여부·날짜면 다른 사용자와 공유)"""
+        context = context or self._current_render_context()
+        job = job_info["job"]
+        if job.get("id") is None:
+            return self.create_job_card_html(job_info, context)
+
+        key = (
+            job["id"],
+            job_info["scores"].get("company_bonus", 0) > 0,
+            context.today,
+            JOB_CARD_VERSION,
+        )
+        return self.card_cache.get_or_create(
+            key, lambda: self.create_job_card_html(job_info, context)
+        )
+
+    def create_job_card_html(self, job_info, context=None):
+        """개별 채용공고 카드 HTML 생성 (들여쓰기·줄바꿈을 줄인 형태)"""
         job = job_info["job"]
         scores = job_info["scores"]
 
@@ -140,15 +274,14 @@ class SMTPEmailService:
 
         # 태그 및 마감일 정보
         tags_html = self.create_tags_html(job)
-        deadline_info = self.calculate_deadline_info(
-            job.get("application_deadline_date")
-        )
+        context = context or self._current_render_context()
+        deadline_info = context.deadline_info(job.get("application_deadline_date"))
         apply_link = job.get("application_link", "#")
 
         if apply_link == "#":
             logger.warning(f"지원 링크 없음: {job['company_name']}")
 
-        return f"""
+        card_html = f"""
         <div class="job-card">
           <div class="job-content">
             <table class="job-header-table">
@@ -179,6 +312,7 @@ class SMTPEmailService:
           </div>
         </div>
         """
+        return minify_html(card_html)
 
     def create_tags_html(self, job):
         """경력/고용형태 태그 HTML 생성"""
@@ -201,35 +335,8 @@ class SMTPEmailService:
 
     def calculate_deadline_info(self, deadline_date):
         """마감일 정보 계산"""
-        if not deadline_date:
-            return "마감일 미정"
-
-        try:
-            from datetime import date
-
-            if isinstance(deadline_date, str):
-                deadline = datetime.strptime(deadline_date, "%Y-%m-%d").date()
-            else:
-                deadline = deadline_date
-
-            today = date.today()
-            days_left = (deadline - today).days
-            deadline_str = deadline.strftime("~%y년 %m월 %d일")
-
-            if days_left < 0:
-                return f"{deadline_str} <span class='job-dday'>(마감)</span>"
-            elif days_left == 0:
-                return f"{deadline_str} <span class='job-dday'>(오늘마감)</span>"
-            else:
-                return f"{deadline_str} <span class='job-dday'>(D-{days_left})</span>"
-
-        except Exception as e:
-            logger.error(f"마감일 계산 오류: {e}")
-            return "마감일 확인 필요"
+        return calculate_deadline_info(deadline_date)
 
     def get_week_info(self):
         """현재 주차 정보 반환"""
-        now = datetime.now()
-        month = now.month
-        week = (now.day - 1) // 7 + 1
-        return f"{month}월 {week}주차"
+        return get_week_info()
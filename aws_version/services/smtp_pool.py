@@ -0,0 +1,163 @@
+# services/smtp_pool.py
+import logging
+import smtplib
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class _PooledSession:
+    """STARTTLS/로그인을 마친 SMTP 연결과 사용 기록"""
+
+    __slots__ = ("server", "sent", "last_used")
+
+    def __init__(self, server):
+        self.server = server
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPSessionPool:
+    """인증된 SMTP 세션을 유지하며 여러 메시지를 보내는 세션 풀
+
+    연결/STARTTLS/로그인은 세션을 새로 열 때만 수행한다.
+    max_sessions: 동시에 빌려줄 수 있는 최대 세션 수 (스레드 발송 대비)
+    max_messages: 세션 하나로 보낼 최대 메시지 수 (넘으면 종료 후 새로 연결)
+    idle_timeout: 이 시간(초) 이상 쉬었던 세션은 버리고 새로 연결
+    발송 중 SMTPServerDisconnected가 나면 새 세션으로 한 번 다시 보낸다.
+    """
+
+    def __init__(
+        self,
+        smtp_server,
+        smtp_port,
+        email,
+        password,
+        max_sessions=5,
+        max_messages=100,
+        idle_timeout=60,
+        timeout=30,
+    ):
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.email = email
+        self.password = password
+        self.max_messages = max_messages
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_sessions)
+        self.sessions_opened = 0
+        self.messages_sent = 0
+
+    def _connect(self):
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout)
+        try:
+            server.starttls()
+            server.login(self.email, self.password)
+        except Exception:
+            self._close(server)
+            raise
+
+        with self._lock:
+            self.sessions_opened += 1
+        logger.debug(f"SMTP 세션 연결: {self.smtp_server}:{self.smtp_port}")
+        return _PooledSession(server)
+
+    @staticmethod
+    def _close(server):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _acquire(self):
+        """유휴 세션을 꺼내거나 (오래 쉰 세션은 버림) 새로 연결"""
+        self._slots.acquire()
+        try:
+            now = time.monotonic()
+            while True:
+                with self._lock:
+                    session = self._idle.pop() if self._idle else None
+                if session is None:
+                    return self._connect()
+                if now - session.last_used <= self.idle_timeout:
+                    return session
+                self._close(session.server)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release(self, session, reusable):
+        """세션 반납 (재사용 불가이거나 발송 한도에 도달하면 종료)"""
+        try:
+            if session is None:
+                return
+            if reusable and session.sent < self.max_messages:
+                session.last_used = time.monotonic()
+                with self._lock:
+                    self._idle.append(session)
+            else:
+                self._close(session.server)
+        finally:
+            self._slots.release()
+
+    def _transmit(self, server, message, to):
+        if isinstance(message, bytes):
+            # 이미 직렬화된 메시지: 보내는 사람은 로그인 계정, 받는 사람은 to
+            server.sendmail(self.email, [to], message)
+        else:
+            server.send_message(message)
+
+    def send(self, message, to=None):
+        """풀의 세션으로 메시지 발송 (smtplib.SMTP.send_message와 같은 예외)
+
+        message: email.message.Message 또는 SMTP DATA용 바이트 (바이트면 to 필수)
+        """
+        session = self._acquire()
+        reusable = False
+        try:
+            try:
+                self._transmit(session.server, message, to)
+            except smtplib.SMTPServerDisconnected:
+                # 서버가 먼저 끊은 세션: 새로 연결해 한 번 재시도
+                logger.info("SMTP 세션이 끊겨 다시 연결합니다")
+                self._close(session.server)
+                session = None
+                session = self._connect()
+                self._transmit(session.server, message, to)
+
+            session.sent += 1
+            reusable = True
+            with self._lock:
+                self.messages_sent += 1
+        except (
+            smtplib.SMTPRecipientsRefused,
+            smtplib.SMTPSenderRefused,
+            smtplib.SMTPDataError,
+        ):
+            # 메시지 단위 거부: smtplib이 RSET을 보냈으므로 세션은 계속 사용
+            reusable = True
+            raise
+        finally:
+            self._release(session, reusable)
+
+    def close(self):
+        """유휴 세션을 모두 종료"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for session in idle:
+            self._close(session.server)
+        if self.sessions_opened:
+            logger.info(
+                f"SMTP 세션 {self.sessions_opened}개로 {self.messages_sent}건 발송"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
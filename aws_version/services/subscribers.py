@@ -0,0 +1,42 @@
+# services/subscribers.py
+import logging
+from db.db_aws import Database
+from db.db_query import EmailQueries
+
+logger = logging.getLogger(__name__)
+
+
+def count_active_subscribers(after_user_id=0):
+    """구독 중인 사용자 수 (after_user_id 다음 사용자부터)"""
+    with Database.get_cursor() as (cursor, connection):
+        cursor.execute(EmailQueries.COUNT_ACTIVE_SUBSCRIBERS, (after_user_id,))
+        return cursor.fetchone()[0]
+
+
+def iter_active_subscribers(page_size=1000, after_user_id=0):
+    """구독자 (user_id, email, name)을 user_id 순서로 한 페이지씩 조회하며 생성
+
+    user_id keyset 페이지네이션으로 읽으므로 전체 목록을 메모리에 올리지 않고,
+    첫 페이지가 도착하면 바로 발송을 시작할 수 있다.
+    페이지마다 연결을 빌렸다 반납하므로 발송 중에 연결을 붙잡고 있지 않는다.
+    after_user_id를 주면 그 다음 사용자부터 조회한다 (체크포인트에서 재개).
+    """
+    last_user_id = after_user_id
+    pages = 0
+    while True:
+        with Database.get_cursor() as (cursor, connection):
+            cursor.execute(
+                EmailQueries.GET_ACTIVE_SUBSCRIBERS_PAGE, (last_user_id, page_size)
+            )
+            rows = cursor.fetchall()
+        if not rows:
+            break
+
+        pages += 1
+        yield from rows
+
+        last_user_id = rows[-1][0]
+        if len(rows) < page_size:
+            break
+
+    logger.info(f"구독자 조회 완료: {pages}페이지")
@@ -0,0 +1,101 @@
+# services/template_compiler.py
+import logging
+import os
+import re
+import threading
+from .template_minifier import minify_html, size_report
+
+logger = logging.getLogger(__name__)
+
+# 치환 자리 표시 ({{USER_NAME}}, {{CURRENT_DATE}}, {{WEEK}}, {{JOB_CARDS}} 등)
+PLACEHOLDER = re.compile(r"\{\{([A-Z_]+)\}\}")
+
+# 문자열로 넘어온 템플릿의 컴파일 결과 (같은 템플릿을 수신자마다 다시 나누지 않음)
+_MAX_COMPILED_SOURCES = 8
+_compiled_sources = {}
+
+# (경로, minify)별 (mtime, CompiledTemplate) 캐시
+_compiled_files = {}
+_lock = threading.Lock()
+
+
+class CompiledTemplate:
+    """템플릿을 정적 조각과 치환 자리로 한 번만 나눠 둔 형태
+
+    수신자마다 str.replace()로 CSS가 포함된 문서 전체를 여러 번 복사하는 대신
+    조각 목록의 치환 자리만 바꿔 한 번의 join으로 렌더링한다.
+    값을 주지 않은 자리는 원래 표시({{NAME}})를 그대로 둔다.
+    """
+
+    __slots__ = ("source", "parts", "slots")
+
+    def __init__(self, source):
+        self.source = source
+        # split 결과의 홀수 위치가 자리 이름 (정적 조각은 짝수 위치)
+        self.parts = PLACEHOLDER.split(source)
+        self.slots = {}
+        for position in range(1, len(self.parts), 2):
+            name = self.parts[position]
+            self.slots.setdefault(name, []).append(position)
+            self.parts[position] = "{{" + name + "}}"
+
+    def render(self, values):
+        """values: {자리 이름: 문자열}"""
+        parts = self.parts.copy()
+        for name, positions in self.slots.items():
+            value = values.get(name)
+            if value is not None:
+                for position in positions:
+                    parts[position] = value
+        return "".join(parts)
+
+
+def compile_template(source):
+    """템플릿 문자열을 컴파일 (같은 문자열은 캐시된 결과 사용)"""
+    if isinstance(source, CompiledTemplate):
+        return source
+
+    compiled = _compiled_sources.get(source)
+    if compiled is None:
+        compiled = CompiledTemplate(source)
+        with _lock:
+            if len(_compiled_sources) >= _MAX_COMPILED_SOURCES:
+                _compiled_sources.clear()
+            _compiled_sources[source] = compiled
+    return compiled
+
+
+def load_template(path, minify=True):
+    """템플릿 파일을 읽어 컴파일 (경로와 수정 시각이 같으면 캐시된 결과 사용)
+
+    minify이면 컴파일 전에 주석·공백을 줄여(minify_html) 모든 메시지의 크기를
+    줄인다. 템플릿 버전(수정 시각)마다 한 번만 수행한다.
+    파일이 없거나 읽지 못하면 None을 반환한다.
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except (OSError, TypeError, ValueError):
+        return None
+
+    cached = _compiled_files.get((path, minify))
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            source = file.read()
+        html = minify_html(source) if minify else source
+        compiled = CompiledTemplate(html)
+    except Exception as e:
+        logger.error(f"HTML 템플릿 파일 읽기 실패: {e}")
+        return None
+
+    with _lock:
+        _compiled_files[(path, minify)] = (mtime, compiled)
+    logger.info(
+        f"템플릿 컴파일: {path} (조각 {len(compiled.parts)}개, "
+        f"자리 {', '.join(compiled.slots)})"
+    )
+    if minify:
+        logger.info(size_report(f"템플릿 최적화 {path}", source, html))
+    return compiled
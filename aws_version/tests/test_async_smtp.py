@@ -0,0 +1,186 @@
+# tests/test_async_smtp.py
+# aws_version 디렉터리에서 실행: python -m pytest tests (또는 python -m unittest discover tests)
+import asyncio
+import unittest
+
+from services.async_smtp import AsyncSMTPEngine
+from services.rate_limiter import AdaptiveRateLimiter
+
+
+class FakeSMTPServer:
+    """수신자 주소에 따라 정해진 응답을 돌려주는 로컬 SMTP 서버
+
+    - reject@: RCPT에 550
+    - busy@: 처음 한 번은 RCPT에 451 (일시적 속도 제한)
+    drop_first면 첫 MAIL에 421을 보내고 연결을 끊는다.
+    """
+
+    def __init__(self, pipelining, drop_first=False):
+        self.pipelining = pipelining
+        self.drop_first = drop_first
+        self.received = []
+        self.connections = 0
+        self.seen = set()
+        self.server = None
+        self.port = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def _once(self, key):
+        """key에 대해 처음 호출될 때만 True"""
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        return True
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+
+        async def reply(line):
+            writer.write(line.encode("ascii") + b"\r\n")
+            await writer.drain()
+
+        await reply("220 fake ready")
+        sender = recipient = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                command = line.decode("utf-8").strip()
+                verb = command[:4].upper()
+
+                if verb == "EHLO":
+                    features = ["250-fake", "250-AUTH PLAIN"]
+                    if self.pipelining:
+                        features.append("250-PIPELINING")
+                    await reply("\r\n".join(features + ["250 SIZE 10485760"]))
+                elif verb == "AUTH":
+                    await reply("235 ok")
+                elif verb == "MAIL":
+                    sender = recipient = None
+                    if self.drop_first and self._once("drop"):
+                        await reply("421 closing")
+                        return
+                    sender = command
+                    await reply("250 ok")
+                elif verb == "RCPT":
+                    address = command.partition("<")[2].rstrip(">")
+                    if sender is None:
+                        await reply("503 need MAIL")
+                    elif address.startswith("reject@"):
+                        await reply("550 no such user")
+                    elif address.startswith("busy@") and self._once(address):
+                        await reply("451 try again later")
+                    else:
+                        recipient = address
+                        await reply("250 ok")
+                elif verb == "DATA":
+                    if recipient is None:
+                        await reply("554 no valid recipients")
+                        continue
+                    await reply("354 go ahead")
+                    data = await reader.readuntil(b"\r\n.\r\n")
+                    self.received.append((recipient, data))
+                    await reply("250 queued")
+                elif verb == "RSET":
+                    sender = recipient = None
+                    await reply("250 ok")
+                elif verb == "QUIT":
+                    await reply("221 bye")
+                    return
+                else:
+                    await reply("500 unknown")
+        finally:
+            writer.close()
+
+
+class AsyncSMTPEngineTest(unittest.TestCase):
+    def _send(self, pipelining, recipients, rate_limiter=None, drop_first=False):
+        async def run():
+            server = FakeSMTPServer(pipelining, drop_first)
+            await server.start()
+            try:
+                engine = AsyncSMTPEngine(
+                    "127.0.0.1",
+                    server.port,
+                    "sender@example.com",
+                    "password",
+                    sessions=1,
+                    timeout=5,
+                    starttls=False,
+                    rate_limiter=rate_limiter,
+                )
+                messages = [
+                    (to, f"Subject: hi\r\n\r\n.line for {to}\r\n".encode("ascii"))
+                    for to in recipients
+                ]
+                return await engine.send_all(messages), server
+            finally:
+                await server.stop()
+
+        return asyncio.run(run())
+
+    def _limiter(self):
+        return AdaptiveRateLimiter(rate=1000, max_rate=1000, min_rate=100)
+
+    def test_success(self):
+        for pipelining in (True, False):
+            with self.subTest(pipelining=pipelining):
+                recipients = ["a@example.com", "b@example.com"]
+                results, server = self._send(pipelining, recipients)
+                self.assertEqual(
+                    [result["status"] for result in results], ["SUCCESS"] * 2
+                )
+                self.assertEqual([to for to, _ in server.received], recipients)
+                # '.'으로 시작하는 줄은 이스케이프되어 전송
+                self.assertIn(b"\r\n..line for a@example.com", server.received[0][1])
+
+    def test_rejected_recipient_does_not_break_session(self):
+        for pipelining in (True, False):
+            with self.subTest(pipelining=pipelining):
+                recipients = ["reject@example.com", "c@example.com"]
+                results, server = self._send(pipelining, recipients)
+                self.assertEqual(results[0]["status"], "FAIL")
+                self.assertIn("550", results[0]["error"])
+                self.assertEqual(results[1]["status"], "SUCCESS")
+                self.assertEqual([to for to, _ in server.received], ["c@example.com"])
+                self.assertEqual(server.connections, 1)
+
+    def test_421_reconnects_and_retries(self):
+        for pipelining in (True, False):
+            with self.subTest(pipelining=pipelining):
+                recipients = ["d@example.com", "e@example.com"]
+                results, server = self._send(pipelining, recipients, drop_first=True)
+                self.assertEqual(
+                    [result["status"] for result in results], ["SUCCESS"] * 2
+                )
+                self.assertEqual([to for to, _ in server.received], recipients)
+                self.assertEqual(server.connections, 2)
+
+    def test_throttle_is_retried_by_rate_limiter(self):
+        for pipelining in (True, False):
+            with self.subTest(pipelining=pipelining):
+                limiter = self._limiter()
+                recipients = ["busy@example.com", "f@example.com"]
+                results, server = self._send(pipelining, recipients, limiter)
+                self.assertEqual(
+                    [result["status"] for result in results], ["SUCCESS"] * 2
+                )
+                self.assertEqual(limiter.throttled, 1)
+                self.assertEqual([to for to, _ in server.received], recipients)
+
+    def test_throttle_without_rate_limiter_fails(self):
+        results, _ = self._send(True, ["busy@example.com"])
+        self.assertEqual(results[0]["status"], "FAIL")
+        self.assertIn("451", results[0]["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
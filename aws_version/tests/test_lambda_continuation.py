@@ -0,0 +1,242 @@
+# tests/test_lambda_continuation.py
+# aws_version 디렉터리에서 실행: python -m pytest tests (또는 python -m unittest discover tests)
+import json
+import threading
+import time
+import unittest
+from contextlib import contextmanager
+from datetime import datetime
+from unittest import mock
+
+import lambda_function
+from db.db_aws import Database
+from db.db_query import EmailQueries
+
+
+class FakeDatabase:
+    """발송 체크포인트와 발송 로그만 다루는 메모리 DB"""
+
+    def __init__(self):
+        self.progress = {}
+        self.logs = []
+        self.fail_logs = False
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def get_cursor(self):
+        yield FakeCursor(self), mock.Mock()
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+
+    def execute(self, query, params=None):
+        self.rows = []
+        if query == EmailQueries.GET_SEND_PROGRESS:
+            row = self.db.progress.get(params[0])
+            self.rows = [row] if row else []
+        elif query == EmailQueries.UPSERT_SEND_PROGRESS:
+            run_id, last_user_id, completed = params
+            previous = self.db.progress.get(run_id, (0, 0))[0]
+            self.db.progress[run_id] = (max(previous, last_user_id), completed)
+
+    def executemany(self, query, rows):
+        assert query == EmailQueries.INSERT_EMAIL_LOG
+        if self.db.fail_logs:
+            raise RuntimeError("DB 연결 끊김")
+        with self.db.lock:
+            self.db.logs.extend(rows)
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+
+class FakeEmailService:
+    """발송에 시간이 걸리는 SMTP 서비스 (여러 발송 워커가 동시에 보냄)"""
+
+    card_cache = mock.Mock(hits=0, misses=0, hit_rate=0.0)
+    card_cache.stats.return_value = {}
+
+    def __init__(self):
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def begin_render_batch(self, now=None):
+        pass
+
+    def end_render_batch(self):
+        pass
+
+    def create_message(self, to, **kwargs):
+        return to
+
+    def deliver(self, to, message):
+        time.sleep(0.01)
+        with self.lock:
+            self.sent.append(to)
+        return {"status": "SUCCESS", "email": to}
+
+
+class DeadlineContext:
+    """구독자를 budget명 넣은 뒤부터 남은 시간이 부족하다고 알리는 Lambda 컨텍스트"""
+
+    function_name = "job-mailer"
+    aws_request_id = "test"
+    invoked_function_arn = "arn:aws:lambda:test"
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.calls = 0
+
+    def get_remaining_time_in_millis(self):
+        self.calls += 1
+        if self.calls > self.budget:
+            return 0
+        return 10**9
+
+
+USERS = [
+    (user_id, f"user{user_id}@example.com", f"name{user_id}")
+    for user_id in range(1, 41)
+]
+
+
+class LambdaContinuationTest(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeDatabase()
+        self.email_service = FakeEmailService()
+        self.invocations = []
+        self.migrations = 0
+
+        def iter_users(page_size=1000, after_user_id=0):
+            # 희망조건과 함께 조회 (get_personalized_jobs를 대체하므로 프로필은 없음)
+            for user in USERS:
+                if user[0] > after_user_id:
+                    yield (*user, None)
+
+        def count_users(after_user_id=0):
+            return sum(1 for user in USERS if user[0] > after_user_id)
+
+        patches = [
+            mock.patch.object(Database, "get_cursor", self.db.get_cursor),
+            mock.patch.object(lambda_function, "run_migrations", self._migrate),
+            mock.patch.object(lambda_function, "RECOMMENDATION_MODE", "inline"),
+            mock.patch.object(lambda_function, "PIPELINE_SEND_WORKERS", 4),
+            mock.patch.object(lambda_function, "PIPELINE_QUEUE_SIZE", 4),
+            mock.patch.object(lambda_function, "CHECKPOINT_EVERY", 5),
+            mock.patch.object(lambda_function, "count_active_subscribers", count_users),
+            mock.patch.object(
+                lambda_function, "iter_subscriber_preferences", iter_users
+            ),
+            mock.patch.object(lambda_function.JobCatalog, "load", lambda: None),
+            mock.patch.object(
+                lambda_function,
+                "get_personalized_jobs",
+                lambda email, **kwargs: [{"job": {"id": 1}, "scores": {}}],
+            ),
+            mock.patch.object(
+                lambda_function,
+                "personalized_email_request",
+                lambda email, name, jobs: {"to": email},
+            ),
+            mock.patch.object(
+                lambda_function,
+                "get_default_email_service",
+                lambda: self.email_service,
+            ),
+            mock.patch.object(lambda_function, "close_email_sessions", lambda: None),
+            mock.patch("services.log_writer.time.sleep", lambda seconds: None),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        lambda_function.set_continuation_invoker(
+            lambda payload, context: self.invocations.append(payload)
+        )
+        self.addCleanup(lambda_function.set_continuation_invoker, None)
+
+    def _migrate(self):
+        self.migrations += 1
+        return True
+
+    def _invoke(self, event, budget):
+        response = lambda_function.lambda_handler(event, DeadlineContext(budget))
+        return json.loads(response["body"])
+
+    def test_schema_applied_only_by_migrate_event(self):
+        # 기본 발송 경로에서는 DDL을 실행하지 않음
+        self._invoke({"run_id": "run-1"}, budget=10**6)
+        self.assertEqual(self.migrations, 0)
+
+        # 배포 단계의 migrate 이벤트는 발송 없이 스키마만 적용
+        sent = len(self.email_service.sent)
+        response = lambda_function.lambda_handler({"action": "migrate"}, None)
+        self.assertEqual(response["statusCode"], 200)
+        self.assertEqual(self.migrations, 1)
+        self.assertEqual(len(self.email_service.sent), sent)
+
+    def test_deadline_mid_batch_leaves_clean_prefix(self):
+        body = self._invoke({"run_id": "run-1"}, budget=13)
+
+        # 시간이 부족해지기 전에 넣은 13명은 발송 워커 수와 상관없이 모두 발송·기록
+        expected = [user[1] for user in USERS[:13]]
+        self.assertEqual(sorted(self.email_service.sent), sorted(expected))
+        self.assertEqual(sorted(row[1] for row in self.db.logs), sorted(expected))
+        self.assertFalse(body["completed"])
+        self.assertEqual(body["success"], 13)
+        self.assertEqual(body["continuation"], {"run_id": "run-1", "resume_after": 13})
+        self.assertEqual(self.invocations, [body["continuation"]])
+        self.assertEqual(self.db.progress["run-1"], (13, 0))
+
+        # 이어서 발송: 나머지 사용자만 한 번씩 발송하고 회차 완료
+        body = self._invoke(self.invocations[0], budget=10**6)
+        self.assertTrue(body["completed"])
+        self.assertEqual(body["success"], len(USERS) - 13)
+        self.assertEqual(
+            sorted(self.email_service.sent), sorted(user[1] for user in USERS)
+        )
+        self.assertEqual(len(self.db.logs), len(USERS))
+        self.assertEqual(self.db.progress["run-1"], (40, 1))
+
+    def test_retry_after_midnight_resumes_same_run(self):
+        # EventBridge 예약 이벤트가 자정 직전에 시간 부족으로 멈추고,
+        # 같은 이벤트의 재시도가 다음 날 실행되는 경우
+        event = {"source": "aws.events", "time": "2026-04-01T02:00:00Z"}
+        self._invoke_at(datetime(2026, 4, 1, 23, 59), event, budget=13)
+        body = self._invoke_at(datetime(2026, 4, 2, 0, 5), event, budget=10**6)
+
+        self.assertEqual(body["run_id"], "2026-04-01")
+        self.assertTrue(body["completed"])
+        # 체크포인트 다음 사용자부터 발송하므로 중복 발송 없음
+        self.assertEqual(
+            sorted(self.email_service.sent), sorted(user[1] for user in USERS)
+        )
+        self.assertEqual(self.db.progress, {"2026-04-01": (40, 1)})
+
+    def _invoke_at(self, now, event, budget):
+        class FakeDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return now
+
+        with mock.patch.object(lambda_function, "datetime", FakeDatetime):
+            return self._invoke(event, budget)
+
+    def test_unflushed_logs_do_not_advance_checkpoint(self):
+        self.db.fail_logs = True
+        body = self._invoke({"run_id": "run-2"}, budget=10**6)
+
+        # 발송은 했지만 로그를 기록하지 못했으므로 완료로 표시하지 않음
+        self.assertEqual(len(self.email_service.sent), len(USERS))
+        self.assertEqual(self.db.logs, [])
+        self.assertEqual(body["success"], 0)
+        self.assertFalse(body["completed"])
+        self.assertIsNone(body["continuation"])
+        self.assertEqual(self.db.progress["run-2"], (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+# tests/test_parallel_matcher.py
+# aws_version 디렉터리에서 실행: python -m pytest tests (또는 python -m unittest discover tests)
+import collections
+import multiprocessing
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from services import parallel_matcher
+from services.job_matcher import MatchResultCache
+
+Profile = collections.namedtuple("Profile", "signature")
+
+CATALOG = SimpleNamespace(version="v1")
+
+
+def fake_match_catalog(profile, catalog, top_n):
+    """워커 프로세스에서 실행 (fork로 패치가 그대로 전달됨)"""
+    if profile.signature == "boom":
+        raise ValueError("잘못된 희망조건")
+    return [f"{profile.signature}-{top_n}"], [1, 1, 1, 1]
+
+
+def subscribers(signatures):
+    return [
+        (user_id, f"user{user_id}@example.com", f"name{user_id}", Profile(signature))
+        for user_id, signature in enumerate(signatures, 1)
+    ]
+
+
+@unittest.skipUnless(
+    "fork" in multiprocessing.get_all_start_methods(), "fork를 지원하는 환경에서만"
+)
+class MatchParallelTest(unittest.TestCase):
+    def setUp(self):
+        patch = mock.patch.object(parallel_matcher, "match_catalog", fake_match_catalog)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.cache = MatchResultCache()
+
+    def _stream(self, users, window):
+        return parallel_matcher.match_parallel(
+            CATALOG, iter(users), 10, self.cache, workers=3, window=window
+        )
+
+    def test_streams_users_in_order_with_results_cached(self):
+        users = subscribers(["a", "b", "a", "c", "b", "d", "a", "e"])
+        for window in (1, 3, 100):
+            with self.subTest(window=window):
+                self.cache = MatchResultCache()
+                for user in self._stream(users, window):
+                    # 사용자를 내보낼 때는 그 희망조건 결과가 이미 등록됨
+                    self.assertTrue(self.cache.has(user[3], CATALOG, 10))
+                self.assertEqual(list(self._stream(users, window)), users)
+                self.assertEqual(self.cache.distinct, 5)
+                self.assertEqual(
+                    self.cache.match(Profile("c"), CATALOG, 10),
+                    (["c-10"], [1, 1, 1, 1]),
+                )
+
+    def test_worker_error_passes_remaining_users_through(self):
+        users = subscribers(["a", "b", "boom", "c", "d", "e", "f"])
+        with self.assertLogs(parallel_matcher.logger, "ERROR"):
+            self.assertEqual(list(self._stream(users, 2)), users)
+        # 결과를 받지 못한 사용자는 호출 측이 match_cache로 직접 매칭
+        self.assertFalse(self.cache.has(Profile("f"), CATALOG, 10))
+
+    def test_closing_early_stops_workers(self):
+        stream = self._stream(subscribers("abcdefgh"), 4)
+        next(stream)
+        stream.close()
+        self.assertEqual(multiprocessing.active_children(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+# tests/test_render_batch.py
+# aws_version 디렉터리에서 실행: python -m pytest tests (또는 python -m unittest discover tests)
+import unittest
+from datetime import date, datetime
+from unittest import mock
+
+from services import render_context
+from services.smtp_client import SMTPEmailService
+
+TEMPLATE = "<p>{{CURRENT_DATE}} {{WEEK}}</p>{{JOB_CARDS}}"
+
+JOBS = [
+    {
+        "job": {
+            "id": 1,
+            "company_name": "테스트",
+            "job_title": "백엔드 개발자",
+            "application_deadline_date": date(2026, 4, 3),
+        },
+        "scores": {},
+    }
+]
+
+
+class Clock:
+    """render_context 모듈이 보는 현재 시각 (테스트에서 앞으로 돌림)"""
+
+    def __init__(self, now):
+        self.now = now
+        clock = self
+
+        class FakeDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return clock.now
+
+        self.datetime = FakeDatetime
+
+
+class RenderBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock(datetime(2026, 3, 31, 23, 50))
+        patch = mock.patch.object(render_context, "datetime", self.clock.datetime)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.service = SMTPEmailService("127.0.0.1", 25, "sender@example.com", "pw")
+
+    def _render(self):
+        return self.service.insert_job_data(TEMPLATE, JOBS, "사용자")
+
+    def test_batch_freezes_date_until_it_ends(self):
+        self.service.begin_render_batch()
+        first = self._render()
+        self.clock.now = datetime(2026, 4, 1, 0, 10)
+        # 자정을 넘겨도 배치 안에서는 시작한 날짜로 렌더링
+        self.assertEqual(self._render(), first)
+        self.assertIn("2026.03.31 3월 5주차", first)
+        self.assertIn("(D-3)", first)
+
+        self.service.end_render_batch()
+        self.assertIsNone(self.service.render_context)
+        # 배치가 끝난 뒤의 발송은 지금 날짜를 사용
+        outside = self._render()
+        self.assertIn("2026.04.01 4월 1주차", outside)
+        self.assertIn("(D-2)", outside)
+
+    def test_next_batch_uses_advanced_clock(self):
+        self.service.begin_render_batch()
+        self.assertIn("2026.03.31", self._render())
+        self.service.end_render_batch()
+
+        self.clock.now = datetime(2026, 4, 2, 11, 0)
+        self.service.begin_render_batch()
+        second = self._render()
+        self.service.end_render_batch()
+        self.assertIn("2026.04.02 4월 1주차", second)
+        self.assertIn("(D-1)", second)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,5 +7,43 @@ class EmailConfig:
     SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
     EMAIL_ADDRESS = os.getenv("EMAIL_ADDRESS")
     EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
+    # SMTP 세션 풀 (동시 세션 수, 세션당 최대 발송 수, 유휴 세션 만료 초)
+    SMTP_MAX_SESSIONS = int(os.getenv("SMTP_MAX_SESSIONS") or 5)
+    SMTP_MAX_MESSAGES_PER_SESSION = int(os.getenv("SMTP_MAX_MESSAGES_PER_SESSION") or 100)
+    SMTP_IDLE_TIMEOUT = int(os.getenv("SMTP_IDLE_TIMEOUT") or 60)
+    # 발송 엔진 (sync: 한 통씩 발송 / async: asyncio 엔진으로 모아서 동시 발송)
+    DELIVERY_ENGINE = os.getenv("DELIVERY_ENGINE") or "sync"
+    ASYNC_SMTP_SESSIONS = int(os.getenv("ASYNC_SMTP_SESSIONS") or 10)
+    ASYNC_SEND_BATCH = int(os.getenv("ASYNC_SEND_BATCH") or 500)
+    # 발송 속도 제한 (AIMD: 성공하면 조금씩 올리고 스로틀링 응답에는 절반으로 감소)
+    # 초기/최대/최소 초당 발송 수, 수신 도메인별 최대 초당 발송 수 ("gmail.com:5,...")
+    SEND_RATE = float(os.getenv("SEND_RATE") or 5)
+    SEND_RATE_MAX = float(os.getenv("SEND_RATE_MAX") or 20)
+    SEND_RATE_MIN = float(os.getenv("SEND_RATE_MIN") or 0.5)
+    DOMAIN_RATE_LIMITS = os.getenv("DOMAIN_RATE_LIMITS") or ""
+    # 발송 파이프라인 단계별 워커 스레드 수와 단계 사이 큐 크기 (sync 엔진)
+    PIPELINE_RENDER_WORKERS = int(os.getenv("PIPELINE_RENDER_WORKERS") or 1)
+    PIPELINE_SEND_WORKERS = int(
+        os.getenv("PIPELINE_SEND_WORKERS") or os.getenv("SMTP_MAX_SESSIONS") or 5
+    )
+    PIPELINE_LOG_WORKERS = int(os.getenv("PIPELINE_LOG_WORKERS") or 1)
+    PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE") or 50)
+    # 배치 시작 시 스키마(테이블/인덱스) 확인 여부
+    # (기본은 끄고 배포할 때 python -m db.migrations로 한 번 적용)
+    RUN_MIGRATIONS = os.getenv("RUN_MIGRATIONS") == "true"
+    # 구독자 스트리밍 페이지 크기
+    SUBSCRIBER_PAGE_SIZE = int(os.getenv("SUBSCRIBER_PAGE_SIZE") or 1000)
+    # 발송 로그 일괄 기록 (버퍼 크기, 주기 초)
+    LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE") or 200)
+    LOG_FLUSH_INTERVAL = float(os.getenv("LOG_FLUSH_INTERVAL") or 5)
     TEMPLATE_PATH = os.getenv("TEMPLATE_PATH", "templates/email_template.html")
+    # 사용자 사이에서 공유하는 공고 카드 HTML 조각 캐시 크기
+    JOB_CARD_CACHE_SIZE = int(os.getenv("JOB_CARD_CACHE_SIZE") or 2048)
     MAX_RECOMMENDED_JOBS = 10
+    # inline: 발송 직전 매칭 / materialized: 전체 매칭 결과 저장 후 발송
+    # incremental: 저장된 추천 결과를 바뀐 부분만 갱신한 뒤 발송
+    # precomputed: 저장된 추천 결과로만 발송 (발송 재시도용)
+    # pushdown: 공고 스냅샷 없이 사용자마다 DB에서 필터/정렬한 상위 공고만 조회
+    RECOMMENDATION_MODE = os.getenv("RECOMMENDATION_MODE") or "inline"
+    # 매칭 워커 프로세스 수 (1이면 현재 프로세스에서 직접 매칭)
+    MATCH_WORKERS = int(os.getenv("MATCH_WORKERS") or 1)
@@ -3,6 +3,7 @@ import pymysql
 from dotenv import load_dotenv
 import os
 from contextlib import contextmanager
+from db.db_pool import ConnectionPool
 
 load_dotenv()
 
@@ -22,12 +23,23 @@ class Database:
     @staticmethod
     @contextmanager
     def get_cursor():
-        connection = Database.get_connection()
+        # 연결은 풀에서 빌리고, 반납할 때 rollback으로 커밋하지 않은 작업 정리
+        connection = _pool.acquire()
         try:
             cursor = connection.cursor()
             yield cursor, connection
-        except Exception as e:
-            connection.rollback()
-            raise e
         finally:
-            connection.close()
+            _pool.release(connection)
+
+    @staticmethod
+    def close_pool():
+        """풀의 유휴 연결 종료"""
+        _pool.close()
+
+
+# 모듈 스코프 연결 풀 (배치 동안 연결 재사용)
+_pool = ConnectionPool(
+    Database.get_connection,
+    max_size=int(os.getenv("DB_POOL_SIZE") or 5),
+    timeout=float(os.getenv("DB_POOL_TIMEOUT") or 10),
+)
@@ -0,0 +1,69 @@
+# db_pool.py
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """pymysql 연결 풀
+
+    모듈 스코프에 두면 Lambda warm 호출 간에도 연결을 재사용한다.
+    - 꺼낼 때 ping(reconnect=True)으로 확인하여 서버가 끊은 연결은 다시 연결
+    - 최대 max_size개까지 빌려주고, 모두 사용 중이면 timeout초까지 대기
+    - 반납할 때 rollback()으로 끝나지 않은 트랜잭션을 정리
+    """
+
+    def __init__(self, connect, max_size=5, timeout=10):
+        self._connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self.connections_opened = 0
+
+    def acquire(self):
+        """유휴 연결을 꺼내거나 새로 연결"""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"DB 연결 대기 시간 초과 ({self.timeout}초)")
+        try:
+            with self._lock:
+                connection = self._idle.pop() if self._idle else None
+            if connection is None:
+                connection = self._connect()
+                with self._lock:
+                    self.connections_opened += 1
+            else:
+                connection.ping(reconnect=True)
+            return connection
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, connection):
+        """연결 반납 (트랜잭션을 정리할 수 없는 연결은 종료)"""
+        try:
+            connection.rollback()
+        except Exception as e:
+            logger.warning(f"DB 연결 정리 실패, 연결 종료: {e}")
+            self._close(connection)
+        else:
+            with self._lock:
+                self._idle.append(connection)
+        finally:
+            self._slots.release()
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close(self):
+        """유휴 연결을 모두 종료"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self._close(connection)
@@ -7,6 +7,20 @@ class EmailQueries:
         WHERE consent = 'Y'
     """
 
+    # 구독자 수 조회
+    COUNT_ACTIVE_SUBSCRIBERS = """
+        SELECT COUNT(*) FROM users WHERE consent = 'Y'
+    """
+
+    # 구독자 페이지 조회 (user_id 기준 keyset 페이지네이션)
+    GET_ACTIVE_SUBSCRIBERS_PAGE = """
+        SELECT user_id, email, name
+        FROM users
+        WHERE consent = 'Y' AND user_id > %s
+        ORDER BY user_id
+        LIMIT %s
+    """
+
     # 이메일 발송 로그 삽입
     INSERT_EMAIL_LOG = """
         INSERT INTO email_send_logs 
@@ -10,6 +10,19 @@ class MatchingQueries:
         WHERE u.email = %s
     """
 
+    # 구독자와 희망조건 페이지 조회 (user_id 기준 keyset 페이지네이션)
+    # GET_USER_PREFERENCES와 같은 컬럼 순서에 발송용 이름을 덧붙임
+    GET_SUBSCRIBER_PREFERENCES_PAGE = """
+        SELECT u.user_id, u.email, u.target_edu, u.target_career, 
+               u.target_emp_type, u.target_job_role1, u.target_job_role2, u.target_job_role3,
+               utc.target_companies_json, u.name
+        FROM users u
+        LEFT JOIN user_target_companies utc ON u.user_id = utc.user_id
+        WHERE u.consent = 'Y' AND u.user_id > %s
+        ORDER BY u.user_id
+        LIMIT %s
+    """
+
     # 활성 채용공고 조회
     GET_ACTIVE_JOB_POSTINGS = """
         SELECT id, company_name, job_title, position_name, experience_level, education, 
@@ -18,3 +31,235 @@ class MatchingQueries:
         WHERE application_deadline_date >= CURDATE()
         ORDER BY created_at DESC
     """
+
+    # 사용자별 추천 결과 저장 테이블 (매칭 단계와 발송 단계 분리)
+    # run_migrations()가 시작 시 생성한다
+    CREATE_USER_RECOMMENDATIONS_TABLE = """
+        CREATE TABLE IF NOT EXISTS user_recommendations (
+            user_id INT NOT NULL,
+            rank_no SMALLINT NOT NULL,
+            job_posting_id INT NOT NULL,
+            is_preferred TINYINT(1) NOT NULL DEFAULT 0,
+            catalog_version CHAR(12) NOT NULL,
+            created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, rank_no)
+        )
+    """
+
+    # 이전 배치 추천 결과 삭제 (새 결과와 같은 트랜잭션에서 교체)
+    DELETE_USER_RECOMMENDATIONS = """
+        DELETE FROM user_recommendations
+    """
+
+    # 추천 결과 일괄 삽입 (executemany)
+    INSERT_USER_RECOMMENDATION = """
+        INSERT INTO user_recommendations
+        (user_id, rank_no, job_posting_id, is_preferred, catalog_version)
+        VALUES (%s, %s, %s, %s, %s)
+    """
+
+    # 사용자 한 명의 추천 결과 조회 (희망기업 여부 + GET_ACTIVE_JOB_POSTINGS 컬럼 순서)
+    GET_USER_RECOMMENDATIONS = """
+        SELECT ur.is_preferred, jp.id, jp.company_name, jp.job_title, jp.position_name,
+               jp.experience_level, jp.education, jp.employment_type,
+               jp.application_deadline_date, jp.created_at
+        FROM user_recommendations ur
+        JOIN job_postings jp ON jp.id = ur.job_posting_id
+        WHERE ur.user_id = %s AND jp.application_deadline_date >= CURDATE()
+        ORDER BY ur.rank_no
+    """
+
+    # 증분 갱신 상태 테이블 (run_migrations()가 시작 시 생성)
+    # - recommendation_watermark: 마지막 갱신의 top_n
+    # - user_recommendation_state: 사용자별 희망조건 해시
+    # - recommendation_catalog_state: 마지막 갱신 때 공고별 행 해시
+    #   (새로 등록·재게시·수정된 공고와 마감·삭제된 공고를 created_at과 무관하게 감지)
+    CREATE_RECOMMENDATION_STATE_TABLES = (
+        """
+        CREATE TABLE IF NOT EXISTS recommendation_watermark (
+            id TINYINT NOT NULL PRIMARY KEY,
+            last_created_at DATETIME NULL,
+            top_n SMALLINT NOT NULL,
+            updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+                ON UPDATE CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS user_recommendation_state (
+            user_id INT NOT NULL PRIMARY KEY,
+            preference_hash CHAR(16) NOT NULL,
+            updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+                ON UPDATE CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS recommendation_catalog_state (
+            job_posting_id INT NOT NULL PRIMARY KEY,
+            row_hash CHAR(16) NOT NULL
+        )
+        """,
+    )
+
+    # 마지막 갱신 워터마크 조회/저장
+    GET_RECOMMENDATION_WATERMARK = """
+        SELECT last_created_at, top_n
+        FROM recommendation_watermark
+        WHERE id = 1
+    """
+
+    UPSERT_RECOMMENDATION_WATERMARK = """
+        INSERT INTO recommendation_watermark (id, last_created_at, top_n)
+        VALUES (1, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            last_created_at = VALUES(last_created_at), top_n = VALUES(top_n)
+    """
+
+    # 사용자별 희망조건 해시 조회/저장/삭제
+    GET_USER_PREFERENCE_HASHES = """
+        SELECT user_id, preference_hash
+        FROM user_recommendation_state
+    """
+
+    UPSERT_USER_PREFERENCE_HASH = """
+        INSERT INTO user_recommendation_state (user_id, preference_hash)
+        VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE preference_hash = VALUES(preference_hash)
+    """
+
+    DELETE_USER_PREFERENCE_HASHES = """
+        DELETE FROM user_recommendation_state
+    """
+
+    DELETE_USER_PREFERENCE_HASH = """
+        DELETE FROM user_recommendation_state WHERE user_id = %s
+    """
+
+    # 마지막 갱신 때의 공고별 행 해시 조회/저장/삭제
+    GET_RECOMMENDATION_CATALOG_STATE = """
+        SELECT job_posting_id, row_hash
+        FROM recommendation_catalog_state
+    """
+
+    UPSERT_RECOMMENDATION_CATALOG_STATE = """
+        INSERT INTO recommendation_catalog_state (job_posting_id, row_hash)
+        VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE row_hash = VALUES(row_hash)
+    """
+
+    DELETE_RECOMMENDATION_CATALOG_STATE = """
+        DELETE FROM recommendation_catalog_state
+    """
+
+    DELETE_RECOMMENDATION_CATALOG_STATE_BY_ID = """
+        DELETE FROM recommendation_catalog_state WHERE job_posting_id = %s
+    """
+
+    # 저장된 추천 결과 전체 조회 (증분 갱신용)
+    GET_ALL_USER_RECOMMENDATIONS = """
+        SELECT user_id, job_posting_id
+        FROM user_recommendations
+        ORDER BY user_id, rank_no
+    """
+
+    DELETE_USER_RECOMMENDATIONS_BY_USER = """
+        DELETE FROM user_recommendations WHERE user_id = %s
+    """
+
+    # 개인화 추천 조회용 복합 인덱스 (run_migrations()가 시작 시 생성)
+    # - 경력 조건(= '신입' OR IS NULL)과 마감일 범위를 먼저 좁히고,
+    #   나머지 필터 컬럼은 인덱스 안에서 평가한다 (Index Condition Pushdown)
+    # - 전체 스냅샷 조회(GET_ACTIVE_JOB_POSTINGS)는 마감일 + 등록일 순서를 사용
+    CREATE_MATCHING_INDEXES = (
+        """
+        CREATE INDEX idx_job_postings_match
+        ON job_postings (experience_level, application_deadline_date,
+                         employment_type, education, position_name)
+        """,
+        """
+        CREATE INDEX idx_job_postings_active
+        ON job_postings (application_deadline_date, created_at)
+        """,
+    )
+
+    @staticmethod
+    def _placeholders(values):
+        return ", ".join(["%s"] * len(values))
+
+    @classmethod
+    def _priority_case(cls, column, values, params):
+        """get_priority()와 같은 점수: NULL=2, 희망조건 일치=1, 그 외=3"""
+        if not values:
+            return f"CASE WHEN {column} IS NULL THEN 2 ELSE 3 END"
+        params.extend(values)
+        return (
+            f"CASE WHEN {column} IS NULL THEN 2 "
+            f"WHEN {column} IN ({cls._placeholders(values)}) THEN 1 ELSE 3 END"
+        )
+
+    @classmethod
+    def build_personalized_job_postings(cls, profile, top_n):
+        """UserProfile로 필터/정렬/LIMIT까지 DB에서 처리하는 조회문 생성
+
+        filter_jobs()/rank_jobs()와 같은 규칙(NULL 통과, 희망조건 없음 통과,
+        희망기업 우선 → NULL 개수 → 직무 → 학력 → 고용형태 → 회사명)으로
+        상위 top_n개 행만 가져온다. 컬럼 순서는 GET_ACTIVE_JOB_POSTINGS와 같다.
+        (query, params)를 반환한다.
+        """
+        where = [
+            "application_deadline_date >= CURDATE()",
+            "(experience_level = %s OR experience_level IS NULL)",
+        ]
+        where_params = ["신입"]
+        for column, values in (
+            ("employment_type", sorted(profile.employment_types)),
+            ("position_name", sorted(profile.role_rank)),
+            ("education", sorted(profile.education)),
+        ):
+            if values:
+                where.append(
+                    f"({column} IS NULL OR {column} IN ({cls._placeholders(values)}))"
+                )
+                where_params.extend(values)
+
+        # ORDER BY의 정수 상수는 컬럼 위치로 해석되므로 모든 공고에 같은 값인 키는 생략
+        order_by = []
+        order_params = []
+        companies = sorted(c for c in profile.companies if c)
+        if companies:
+            order_by.append(
+                f"CASE WHEN company_name IN ({cls._placeholders(companies)}) "
+                "THEN 0 ELSE 1 END"
+            )
+            order_params.extend(companies)
+        order_by.append(
+            "(education IS NULL) + (experience_level IS NULL) "
+            "+ (employment_type IS NULL)"
+        )
+
+        # 직무(position_name) 순위: NULL=4, 희망 순위(1~3), 그 외=5
+        role_priority = "CASE WHEN position_name IS NULL THEN 4"
+        for role, rank in sorted(profile.role_rank.items(), key=lambda item: item[1]):
+            role_priority += f" WHEN position_name = %s THEN {rank}"
+            order_params.append(role)
+        order_by.append(role_priority + " ELSE 5 END")
+
+        order_by += [
+            cls._priority_case("education", sorted(profile.education), order_params),
+            cls._priority_case(
+                "employment_type", sorted(profile.employment_types), order_params
+            ),
+            "company_name",
+            "created_at DESC",
+        ]
+
+        where_clause = " AND ".join(where)
+        order_clause = ", ".join(order_by)
+        query = f"""
+        SELECT id, company_name, job_title, position_name, experience_level, education, 
+               employment_type, application_deadline_date, created_at
+        FROM job_postings
+        WHERE {where_clause}
+        ORDER BY {order_clause}
+        LIMIT %s
+    """
+        return query, tuple(where_params + order_params + [top_n])
@@ -0,0 +1,65 @@
+# db/migrations.py
+import logging
+import pymysql
+from db.db_local import Database
+from db.db_query.matching_query import MatchingQueries
+
+logger = logging.getLogger(__name__)
+
+# 이미 있는 인덱스를 다시 만들 때의 MySQL 오류 (Duplicate key name)
+DUPLICATE_KEY_NAME = 1061
+
+# 발송에 필요한 스키마 (여러 번 실행해도 결과가 같은 문장만)
+MIGRATIONS = [
+    MatchingQueries.CREATE_USER_RECOMMENDATIONS_TABLE,
+    *MatchingQueries.CREATE_RECOMMENDATION_STATE_TABLES,
+    *MatchingQueries.CREATE_MATCHING_INDEXES,
+]
+
+_applied = False
+
+
+def run_migrations():
+    """발송에 필요한 테이블과 인덱스 생성 (프로세스당 한 번)
+
+    배포 단계에서 한 번 실행한다 (local_version에서 python -m db.migrations).
+    RUN_MIGRATIONS=true면 발송을 시작할 때도 확인하지만, DDL이 발송 경로에
+    들어가므로 기본값은 끈다.
+    CREATE TABLE은 IF NOT EXISTS로, CREATE INDEX는 이미 있을 때 나는
+    Duplicate key name 오류를 무시해 여러 번 실행해도 된다.
+    DB 계정에 DDL 권한이 없으면 오류만 기록하므로, 그때는 MIGRATIONS의
+    문장을 관리자 계정으로 한 번 실행한다.
+    모든 문장을 적용했으면 True를 반환한다.
+    """
+    global _applied
+    if _applied:
+        return True
+
+    failed = 0
+    try:
+        with Database.get_cursor() as (cursor, connection):
+            for statement in MIGRATIONS:
+                try:
+                    cursor.execute(statement)
+                except pymysql.MySQLError as e:
+                    if e.args and e.args[0] == DUPLICATE_KEY_NAME:
+                        continue
+                    failed += 1
+                    logger.error(f"스키마 적용 실패: {e}")
+            connection.commit()
+    except Exception as e:
+        logger.error(f"스키마 적용 중 DB 오류, 다음 실행에서 다시 시도: {e}")
+        return False
+
+    _applied = True
+    logger.info(f"스키마 확인 완료 ({len(MIGRATIONS)}개 문장, 실패 {failed}개)")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    import sys
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(0 if run_migrations() else 1)
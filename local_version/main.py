@@ -21,6 +21,7 @@ def main():
     logger.info(f"발송 성공: {results['success_count']}건")
     logger.info(f"발송 실패: {results['fail_count']}건")
     logger.info(f"성공률: {results['success_rate']:.1f}%")
+    logger.info(f"매칭 중복 제거율: {results['dedup_ratio'] * 100:.1f}%")
 
 
 if __name__ == "__main__":
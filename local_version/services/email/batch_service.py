@@ -1,11 +1,26 @@
 import logging
-from typing import List, Dict, Any
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 from local_version.services.email.stmp_service import SMTPEmailService
-from local_version.services.job.job_matcher import get_personalized_jobs
+from local_version.services.job.job_matcher import (
+    MatchResultCache,
+    get_personalized_jobs,
+    iter_subscriber_preferences,
+    load_recommendations,
+    load_subscriber_preferences,
+    materialize_recommendations,
+    refresh_recommendations,
+)
+from local_version.services.job.job_catalog import JobCatalog
+from local_version.services.job.parallel_matcher import match_parallel
+from local_version.services.email.pipeline import Pipeline, Stage
+from local_version.services.email.template_compiler import CompiledTemplate
 from local_version.services.email.template_loader import TemplateLoader
 from local_version.services.user.user_service import UserService
+from local_version.services.user.user_profile import UserProfile
 from local_version.services.log.email_logger import EmailLogger
 from config.email_config import EmailConfig
+from db.migrations import run_migrations
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +32,7 @@ class EmailBatchService:
         self.email_service = SMTPEmailService.from_config()
         self.template_loader = TemplateLoader()
         self.user_service = UserService()
-        self.email_logger = EmailLogger()
+        self.email_logger = None
 
     def send_personalized_emails(self) -> Dict[str, Any]:
         """개인화된 이메일 배치 발송"""
@@ -26,86 +41,396 @@ class EmailBatchService:
         if not html_template:
             raise RuntimeError("HTML 템플릿 로드 실패")
 
-        # 구독자 목록 가져오기
-        users = self.user_service.get_active_subscribers()
-        if not users:
+        if EmailConfig.RUN_MIGRATIONS:
+            # 발송에 필요한 테이블과 인덱스 확인 (기본은 배포 단계에서 적용)
+            run_migrations()
+
+        # 구독자 수 확인 (목록은 발송하면서 페이지 단위로 스트리밍)
+        total_users = self.user_service.count_active_subscribers()
+        if not total_users:
             logger.warning("구독 중인 사용자가 없습니다.")
             return self._create_result(0, 0, 0)
 
-        total_users = len(users)
         logger.info(f"발송 대상: {total_users}명")
 
+        # 희망조건이 같은 사용자는 매칭 결과를 공유
+        match_cache = MatchResultCache()
+        mode = EmailConfig.RECOMMENDATION_MODE
+        logger.info(f"추천 방식: {mode}")
+
+        catalog = None
+        if mode not in ("precomputed", "pushdown"):
+            # 활성 채용공고 스냅샷은 배치 전체에서 한 번만 로드
+            # (pushdown은 사용자마다 DB에서 필터링하므로 로드하지 않음)
+            catalog = JobCatalog.load()
+
+        # 병렬 매칭: 구독자를 앞서 읽어 새 희망조건을 워커가 매칭하고 결과를
+        # match_cache에 등록한 뒤 구독자를 그대로 내보냄
+        # 워커는 match_parallel() 호출 시점에 fork하므로 파이프라인, 로그 기록,
+        # SMTP 세션 스레드를 시작하기 전에 만든다
+        top_n = EmailConfig.MAX_RECOMMENDED_JOBS
+        page_size = EmailConfig.SUBSCRIBER_PAGE_SIZE
+        workers = EmailConfig.MATCH_WORKERS
+        parallel = workers > 1 and mode in ("inline", "materialized")
+
+        if mode in ("materialized", "incremental"):
+            # 매칭 단계: 발송 전에 전체 추천 결과를 한 번에 저장 (또는 증분 갱신)
+            match_start = datetime.now()
+            if mode == "incremental":
+                # 저장된 추천 결과 전체와 비교하므로 희망조건도 한 번에 조회
+                refresh_recommendations(
+                    catalog,
+                    load_subscriber_preferences(page_size),
+                    top_n=top_n,
+                    match_cache=match_cache,
+                )
+            else:
+                subscribers = iter_subscriber_preferences(page_size)
+                if parallel:
+                    subscribers = match_parallel(
+                        catalog, subscribers, top_n, match_cache, workers
+                    )
+                materialize_recommendations(
+                    catalog,
+                    ((user[0], user[3]) for user in subscribers),
+                    top_n=top_n,
+                    match_cache=match_cache,
+                )
+            logger.info(
+                f"매칭 단계 완료: {(datetime.now() - match_start).total_seconds():.2f}초"
+            )
+
         # 각 사용자 처리
-        success_count = 0
-        fail_count = 0
+        # - sync: 매칭 → 렌더링 → 발송 → 로그 기록 파이프라인
+        # - async: 발송 요청을 모아 asyncio 엔진으로 한 번에 전송
+        if mode in ("inline", "pushdown"):
+            # 희망조건은 구독자와 같은 keyset 페이지로 함께 조회
+            # (한 번에 한 페이지만 메모리에 두고 사용자별 DB 왕복 제거)
+            users = iter_subscriber_preferences(page_size)
+            if parallel:
+                users = match_parallel(catalog, users, top_n, match_cache, workers)
+        else:
+            # 저장된 추천 결과로 발송하므로 희망조건은 조회하지 않음
+            users = self.user_service.iter_active_subscribers(page_size=page_size)
+        # 발송 로그는 모아서 일괄 기록 (성공 수는 실제로 기록된 행으로 집계)
+        self.email_logger = EmailLogger.buffered(
+            batch_size=EmailConfig.LOG_BATCH_SIZE,
+            flush_interval=EmailConfig.LOG_FLUSH_INTERVAL,
+        )
+        # 날짜·주차·마감일 문구를 배치 동안 고정 (자정을 넘겨도 같은 날짜로 렌더링)
+        self.email_service.template.begin_render_batch()
+        try:
+            if EmailConfig.DELIVERY_ENGINE == "async":
+                processed = self._send_batched(
+                    users, total_users, html_template, catalog, match_cache
+                )
+            else:
+                processed = self._run_pipeline(
+                    users, total_users, html_template, catalog, match_cache
+                )
+        finally:
+            # 앞서 읽던 구독자 페이지와 매칭 워커 정리
+            users.close()
+            # 배치가 끝나면 고정한 날짜를 풀고 유지하던 SMTP 세션 종료,
+            # 버퍼에 남은 발송 로그 기록
+            self.email_service.template.end_render_batch()
+            self.email_service.close()
+            self.email_logger.close()
+
+        # 로그 기록까지 마치지 못한 사용자도 실패로 집계
+        success_count = self.email_logger.succeeded
+        fail_count = processed - success_count
+
+        logger.info(
+            f"매칭 중복 제거: 고유 조건 {match_cache.distinct}개 / "
+            f"조회 {match_cache.lookups}건 ({match_cache.dedup_ratio * 100:.1f}% 절감)"
+        )
+        card_cache = self.email_service.template.card_cache
+        logger.info(
+            f"공고 카드 캐시: 적중 {card_cache.hits}건 / 생성 {card_cache.misses}건 "
+            f"(적중률 {card_cache.hit_rate * 100:.1f}%)"
+        )
+        return self._create_result(
+            total_users, success_count, fail_count, match_cache.dedup_ratio
+        )
+
+    def _run_pipeline(
+        self,
+        users: Iterable[Tuple],
+        total_users: int,
+        html_template: CompiledTemplate,
+        catalog: Optional[JobCatalog],
+        match_cache: MatchResultCache,
+    ) -> int:
+        """매칭/렌더링/발송/로그 기록을 단계별 스레드로 동시에 실행
+
+        users는 iter_subscriber_preferences()처럼 희망조건(UserProfile)을 네 번째
+        값으로 함께 낼 수 있다. 매칭 단계는 워커 1개로 둔다.
+        total_users는 진행 표시용 예상 인원이며 처리한 사용자 수를 반환한다.
+        """
+        queue_size = EmailConfig.PIPELINE_QUEUE_SIZE
+        pipeline = Pipeline(
+            [
+                Stage(
+                    "match",
+                    lambda task: self._match_user(task, catalog, match_cache),
+                    queue_size=queue_size,
+                ),
+                Stage(
+                    "render",
+                    lambda task: self._render_email(task, html_template),
+                    workers=EmailConfig.PIPELINE_RENDER_WORKERS,
+                    queue_size=queue_size,
+                ),
+                Stage(
+                    "send",
+                    self._send_email,
+                    workers=EmailConfig.PIPELINE_SEND_WORKERS,
+                    queue_size=queue_size,
+                ),
+                Stage(
+                    "log",
+                    self._log_task,
+                    workers=EmailConfig.PIPELINE_LOG_WORKERS,
+                    queue_size=queue_size,
+                ),
+            ],
+            on_error=self._pipeline_error,
+        )
+        pipeline.run(
+            {
+                "user_id": user[0],
+                "email": user[1],
+                "name": user[2],
+                "profile": user[3] if len(user) > 3 else None,
+                "position": f"{i}/{total_users}",
+            }
+            for i, user in enumerate(users, 1)
+        )
+        pipeline.log_summary()
+
+        first_stage = pipeline.stages[0].metrics
+        return first_stage.processed + first_stage.failed
+
+    def _match_user(
+        self,
+        task: Dict[str, Any],
+        catalog: Optional[JobCatalog],
+        match_cache: MatchResultCache,
+    ) -> Dict[str, Any]:
+        """매칭 단계: 사용자의 추천 공고 조회 (inline/pushdown이 아니면 저장된 결과)"""
+        logger.info(f"[{task['position']}] 처리 중: {task['email']}")
+
+        profile = task["profile"]
+        mode = EmailConfig.RECOMMENDATION_MODE
+        if mode not in ("inline", "pushdown"):
+            task["jobs"] = load_recommendations(task["user_id"])
+            return task
+
+        task["jobs"] = get_personalized_jobs(
+            task["email"],
+            top_n=EmailConfig.MAX_RECOMMENDED_JOBS,
+            catalog=catalog,
+            profile=profile,
+            match_cache=match_cache,
+            pushdown=mode == "pushdown",
+        )
+        return task
+
+    def _render_email(
+        self, task: Dict[str, Any], html_template: CompiledTemplate
+    ) -> Dict[str, Any]:
+        """렌더링 단계: 개인화된 이메일 메시지 생성 (추천 공고가 없으면 건너뜀)"""
+        email, name, jobs = task["email"], task["name"], task["jobs"]
+        if not jobs:
+            logger.warning(f"추천할 공고가 없음: {email}")
+            return task
+
+        logger.info(f"추천 공고 {len(jobs)}개 발견: {email}")
+        task["message"] = self.email_service.create_message(
+            to=email,
+            subject=f"{name}님을 위한 맞춤 채용공고",
+            html_content=html_template,
+            job_data=jobs,
+            user_name=name,
+        )
+        return task
+
+    def _send_email(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """발송 단계: 만들어 둔 메시지를 SMTP 세션 풀로 발송"""
+        if "message" in task:
+            task["result"] = self.email_service.deliver(
+                task["email"], task.pop("message")
+            )
+        return task
+
+    def _pipeline_error(
+        self, task: Dict[str, Any], stage_name: str, error: Exception
+    ) -> Dict[str, Any]:
+        """앞 단계에서 실패한 사용자는 오류 내용을 로그 단계로 넘김"""
+        logger.error(f"사용자 처리 중 오류: {task['email']} - {error}")
+        task["failure"] = str(error)
+        return task
+
+    def _log_task(self, task: Dict[str, Any]) -> None:
+        """로그 단계: 발송 결과를 로그 버퍼에 추가"""
+        user_id, email, name = task["user_id"], task["email"], task["name"]
+        if "failure" in task:
+            self.email_logger.log_result(
+                user_id, email, name, "FAILED", task["failure"], 0
+            )
+        elif not task["jobs"]:
+            self.email_logger.log_result(
+                user_id, email, name, "FAILED", "추천할 공고가 없습니다", 0
+            )
+        else:
+            self._log_send_result(
+                user_id, email, name, task["result"], len(task["jobs"])
+            )
+
+    def _send_batched(
+        self,
+        users: Iterable[Tuple],
+        total_users: int,
+        html_template: CompiledTemplate,
+        catalog: Optional[JobCatalog],
+        match_cache: MatchResultCache,
+    ) -> int:
+        """사용자별 발송 요청을 모아 ASYNC_SEND_BATCH건씩 비동기 엔진으로 전송
+
+        처리한 사용자 수를 반환한다.
+        """
+        mode = EmailConfig.RECOMMENDATION_MODE
+        processed = 0
+        deferred = []
 
         for i, user in enumerate(users, 1):
             user_id, email, name = user[0], user[1], user[2]
+            profile = user[3] if len(user) > 3 else None
             logger.info(f"[{i}/{total_users}] 처리 중: {email}")
 
-            if self._process_single_user(user_id, email, name, html_template):
-                success_count += 1
-            else:
-                fail_count += 1
+            self._process_single_user(
+                user_id,
+                email,
+                name,
+                html_template,
+                catalog,
+                profile,
+                match_cache,
+                precomputed=mode not in ("inline", "pushdown"),
+                pushdown=mode == "pushdown",
+                deferred=deferred,
+            )
+            processed += 1
+            if len(deferred) >= EmailConfig.ASYNC_SEND_BATCH:
+                self._send_deferred(deferred)
 
-        return self._create_result(total_users, success_count, fail_count)
+        if deferred:
+            self._send_deferred(deferred)
+
+        return processed
 
     def _process_single_user(
-        self, user_id: int, email: str, name: str, html_template: str
-    ) -> bool:
-        """단일 사용자 처리"""
+        self,
+        user_id: int,
+        email: str,
+        name: str,
+        html_template: CompiledTemplate,
+        catalog: Optional[JobCatalog],
+        profile: Optional[UserProfile],
+        match_cache: MatchResultCache,
+        precomputed: bool = False,
+        pushdown: bool = False,
+        deferred: Optional[List] = None,
+    ) -> None:
+        """단일 사용자 처리 (precomputed면 저장된 추천 결과로 발송)
+
+        pushdown이면 공고 스냅샷 대신 DB에서 필터/정렬한 상위 공고를 조회한다.
+
+        deferred가 주어지면 바로 보내지 않고 발송 요청을 추가한다.
+        결과는 로그 버퍼에 기록하며, 성공 수는 기록된 로그로 집계한다.
+        """
         logger.info(f"처리 시작: {name}({email})")
 
         try:
             # 개인화된 채용공고 가져오기
-            recommended_jobs = get_personalized_jobs(
-                email, top_n=EmailConfig.MAX_RECOMMENDED_JOBS
-            )
+            if precomputed:
+                recommended_jobs = load_recommendations(user_id)
+            else:
+                recommended_jobs = get_personalized_jobs(
+                    email,
+                    top_n=EmailConfig.MAX_RECOMMENDED_JOBS,
+                    catalog=catalog,
+                    profile=profile,
+                    match_cache=match_cache,
+                    pushdown=pushdown,
+                )
 
             if not recommended_jobs:
                 logger.warning(f"추천할 공고가 없음: {email}")
-                return self.email_logger.log_result(
+                self.email_logger.log_result(
                     user_id, email, name, "FAILED", "추천할 공고가 없습니다", 0
                 )
+                return
 
             logger.info(f"추천 공고 {len(recommended_jobs)}개 발견: {email}")
 
             # 개인화된 이메일 발송
-            subject = f"{name}님을 위한 맞춤 채용공고"
-            result = self.email_service.send_message(
-                to=email,
-                subject=subject,
-                html_content=html_template,
-                job_data=recommended_jobs,
-                user_name=name,
-            )
+            request = {
+                "to": email,
+                "subject": f"{name}님을 위한 맞춤 채용공고",
+                "html_content": html_template,
+                "job_data": recommended_jobs,
+                "user_name": name,
+            }
+            if deferred is not None:
+                deferred.append((user_id, name, len(recommended_jobs), request))
+                return
 
-            # 발송 결과 처리
-            if result["status"] == "SUCCESS":
-                return self.email_logger.log_result(
-                    user_id, email, name, "SUCCESS", None, len(recommended_jobs)
-                )
-            else:
-                return self.email_logger.log_result(
-                    user_id,
-                    email,
-                    name,
-                    "FAILED",
-                    result.get("error", "알 수 없는 오류"),
-                    len(recommended_jobs),
-                )
+            result = self.email_service.send_message(**request)
+            self._log_send_result(user_id, email, name, result, len(recommended_jobs))
 
         except Exception as e:
             logger.error(f"사용자 처리 중 오류: {email} - {e}")
-            return self.email_logger.log_result(
-                user_id, email, name, "FAILED", str(e), 0
+            self.email_logger.log_result(user_id, email, name, "FAILED", str(e), 0)
+
+    def _log_send_result(
+        self, user_id: int, email: str, name: str, result: Dict, job_count: int
+    ) -> None:
+        """send_message() 결과를 발송 로그로 기록"""
+        if result["status"] == "SUCCESS":
+            self.email_logger.log_result(
+                user_id, email, name, "SUCCESS", None, job_count
             )
+            return
+        self.email_logger.log_result(
+            user_id,
+            email,
+            name,
+            "FAILED",
+            result.get("error", "알 수 없는 오류"),
+            job_count,
+        )
+
+    def _send_deferred(self, deferred: List) -> None:
+        """모아 둔 발송 요청을 비동기 엔진으로 보내고 결과 기록 (deferred를 비운다)"""
+        results = self.email_service.send_messages(
+            [request for _, _, _, request in deferred],
+            sessions=EmailConfig.ASYNC_SMTP_SESSIONS,
+        )
+
+        for (user_id, name, job_count, request), result in zip(deferred, results):
+            self._log_send_result(user_id, request["to"], name, result, job_count)
+        deferred.clear()
 
-    def _create_result(self, total: int, success: int, fail: int) -> Dict[str, Any]:
+    def _create_result(
+        self, total: int, success: int, fail: int, dedup_ratio: float = 0.0
+    ) -> Dict[str, Any]:
         """결과 딕셔너리 생성"""
         return {
             "total_users": total,
             "success_count": success,
             "fail_count": fail,
             "success_rate": (success / total * 100) if total > 0 else 0,
+            "dedup_ratio": dedup_ratio,
         }
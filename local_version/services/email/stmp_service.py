@@ -7,17 +7,47 @@ import smtplib
 import os
 import logging
 from local_version.services.email.template_renderer import EmailTemplate
+from local_version.services.email.template_compiler import CompiledTemplate
+from local_version.services.email.smtp_pool import SMTPSessionPool
+from local_version.services.email.async_smtp import AsyncSMTPEngine, message_to_bytes
+from local_version.services.email.mime_builder import MessageBuilder
+from local_version.services.email.rate_limiter import AdaptiveRateLimiter, parse_rates
 
 logger = logging.getLogger(__name__)
 
 
 class SMTPEmailService:
-    def __init__(self, smtp_server, smtp_port, email, password):
+    def __init__(
+        self,
+        smtp_server,
+        smtp_port,
+        email,
+        password,
+        max_sessions=5,
+        max_messages=100,
+        idle_timeout=60,
+        rate_limiter=None,
+        job_card_cache_size=2048,
+    ):
         self.smtp_server = smtp_server
         self.smtp_port = smtp_port
         self.email = email
         self.password = password
-        self.template = EmailTemplate()
+        # 인증된 SMTP 세션을 여러 메시지에 재사용
+        self.pool = SMTPSessionPool(
+            smtp_server,
+            smtp_port,
+            email,
+            password,
+            max_sessions=max_sessions,
+            max_messages=max_messages,
+            idle_timeout=idle_timeout,
+        )
+        # 공급자/수신 도메인별 발송 속도 제한 (AdaptiveRateLimiter, 없으면 제한 없음)
+        self.rate_limiter = rate_limiter
+        # 수신자마다 같은 헤더/MIME 경계를 미리 인코딩해 둔 메시지 조립기
+        self.message_builder = MessageBuilder(email)
+        self.template = EmailTemplate(job_card_cache_size)
 
     @classmethod
     def from_config(cls):
@@ -29,6 +59,16 @@ class SMTPEmailService:
             EmailConfig.SMTP_PORT,
             EmailConfig.EMAIL_ADDRESS,
             EmailConfig.EMAIL_PASSWORD,
+            max_sessions=EmailConfig.SMTP_MAX_SESSIONS,
+            max_messages=EmailConfig.SMTP_MAX_MESSAGES_PER_SESSION,
+            idle_timeout=EmailConfig.SMTP_IDLE_TIMEOUT,
+            rate_limiter=AdaptiveRateLimiter(
+                rate=EmailConfig.SEND_RATE,
+                max_rate=EmailConfig.SEND_RATE_MAX,
+                min_rate=EmailConfig.SEND_RATE_MIN,
+                domain_rates=parse_rates(EmailConfig.DOMAIN_RATE_LIMITS),
+            ),
+            job_card_cache_size=EmailConfig.JOB_CARD_CACHE_SIZE,
         )
 
     def create_message(
@@ -41,7 +81,20 @@ class SMTPEmailService:
         job_data=None,
         user_name=None,
     ):
-        """이메일 메시지 생성"""
+        """이메일 메시지 생성 (SMTP DATA로 바로 보낼 수 있는 바이트)"""
+        # HTML 본문 (job_data가 있으면 템플릿에 삽입)
+        if html_content:
+            if job_data:
+                html_content = self.template.insert_job_data(
+                    html_content, job_data, user_name or ""
+                )
+            elif isinstance(html_content, CompiledTemplate):
+                html_content = html_content.source
+
+        # 첨부파일이 없으면 미리 인코딩한 헤더/경계에 본문만 붙여 바로 조립
+        if not (attachment_path and os.path.exists(attachment_path)):
+            return self.message_builder.build(to, subject, message_text, html_content)
+
         message = MIMEMultipart("alternative")
         message["From"] = self.email
         message["To"] = to
@@ -52,28 +105,23 @@ class SMTPEmailService:
             text_part = MIMEText(message_text, "plain", "utf-8")
             message.attach(text_part)
 
-        # HTML 본문 추가 (job_data가 있으면 템플릿에 삽입)
+        # HTML 본문 추가
         if html_content:
-            if job_data:
-                html_content = self.template.insert_job_data(
-                    html_content, job_data, user_name or ""
-                )
             html_part = MIMEText(html_content, "html", "utf-8")
             message.attach(html_part)
 
-        # 첨부파일이 있으면 추가
-        if attachment_path and os.path.exists(attachment_path):
-            with open(attachment_path, "rb") as attachment:
-                part = MIMEBase("application", "octet-stream")
-                part.set_payload(attachment.read())
-            encoders.encode_base64(part)
-            part.add_header(
-                "Content-Disposition",
-                f"attachment; filename={os.path.basename(attachment_path)}",
-            )
-            message.attach(part)
+        # 첨부파일 추가
+        with open(attachment_path, "rb") as attachment:
+            part = MIMEBase("application", "octet-stream")
+            part.set_payload(attachment.read())
+        encoders.encode_base64(part)
+        part.add_header(
+            "Content-Disposition",
+            f"attachment; filename={os.path.basename(attachment_path)}",
+        )
+        message.attach(part)
 
-        return message
+        return message_to_bytes(message)
 
     def send_message(
         self,
@@ -98,12 +146,22 @@ class SMTPEmailService:
                 job_data,
                 user_name,
             )
+        except Exception as error:
+            logger.error(f"❌ 발송 실패: {to} - {error}")
+            return {"status": "FAIL", "email": to, "error": str(error)}
 
-            # SMTP 서버 연결 및 발송
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.email, self.password)
-                server.send_message(message)
+        return self.deliver(to, message)
+
+    def deliver(self, to, message):
+        """create_message()로 만든 메시지 발송 (send_message()와 같은 결과 형식)"""
+        try:
+            # 풀에서 인증된 SMTP 세션을 빌려 발송
+            if self.rate_limiter is None:
+                self.pool.send(message, to)
+            else:
+                self.rate_limiter.run(
+                    self.smtp_server, to, lambda: self.pool.send(message, to)
+                )
 
             logger.info(f"✅ 발송 성공: {to}")
             return {"status": "SUCCESS", "email": to}
@@ -123,3 +181,44 @@ class SMTPEmailService:
         except Exception as error:
             logger.error(f"❌ 발송 실패: {to} - {error}")
             return {"status": "FAIL", "email": to, "error": str(error)}
+
+    def send_messages(self, requests, sessions=10, queue_size=500):
+        """여러 이메일을 AsyncSMTPEngine으로 동시에 발송
+
+        requests: send_message() 키워드 인자 딕셔너리 목록
+        sessions: 동시에 여는 SMTP 연결 수 (동시 발송 수)
+        queue_size: 발송 대기열 크기 (AsyncSMTPEngine 참고)
+        send_message()와 같은 형식의 결과 딕셔너리를 입력 순서대로 반환한다.
+        """
+        results = [None] * len(requests)
+        messages = []
+        positions = []
+        for i, request in enumerate(requests):
+            try:
+                messages.append((request["to"], self.create_message(**request)))
+                positions.append(i)
+            except Exception as error:
+                logger.error(f"❌ 메시지 생성 실패: {request['to']} - {error}")
+                results[i] = {
+                    "status": "FAIL",
+                    "email": request["to"],
+                    "error": str(error),
+                }
+
+        engine = AsyncSMTPEngine(
+            self.smtp_server,
+            self.smtp_port,
+            self.email,
+            self.password,
+            sessions=sessions,
+            queue_size=queue_size,
+            max_messages=self.pool.max_messages,
+            rate_limiter=self.rate_limiter,
+        )
+        for i, result in zip(positions, engine.send_batch(messages)):
+            results[i] = result
+        return results
+
+    def close(self):
+        """유지 중인 SMTP 세션 종료"""
+        self.pool.close()
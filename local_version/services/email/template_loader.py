@@ -1,5 +1,10 @@
 import logging
+from typing import Optional
 from config.email_config import EmailConfig
+from local_version.services.email.template_compiler import (
+    CompiledTemplate,
+    load_template,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -8,14 +13,13 @@ class TemplateLoader:
     """템플릿 로더 서비스"""
 
     @staticmethod
-    def load_email_template() -> str:
-        """이메일 HTML 템플릿 로드"""
-        try:
-            with open(EmailConfig.TEMPLATE_PATH, "r", encoding="utf-8") as f:
-                return f.read()
-        except FileNotFoundError:
-            logger.error(f"템플릿 파일을 찾을 수 없음: {EmailConfig.TEMPLATE_PATH}")
-            return None
-        except Exception as e:
-            logger.error(f"템플릿 로드 오류: {e}")
-            return None
+    def load_email_template() -> Optional[CompiledTemplate]:
+        """이메일 HTML 템플릿 로드
+
+        정적 조각과 치환 자리로 컴파일해 두고, 파일이 바뀌지 않았으면
+        컴파일한 템플릿을 재사용한다.
+        """
+        template = load_template(EmailConfig.TEMPLATE_PATH)
+        if template is None:
+            logger.error(f"템플릿 파일을 불러올 수 없음: {EmailConfig.TEMPLATE_PATH}")
+        return template
@@ -1,33 +1,81 @@
 # services/email_template.py
 import logging
-from datetime import datetime
-from utils.date_utils import calculate_deadline_info, get_week_info
+from utils.date_utils import RenderContext
+from local_version.services.email.template_compiler import compile_template
+from local_version.services.email.fragment_cache import FragmentCache
+from local_version.services.email.template_minifier import minify_html
 
 logger = logging.getLogger(__name__)
 
+# 공고 카드 마크업 버전 (create_job_card_html()의 HTML을 바꾸면 올림)
+JOB_CARD_VERSION = 2
+
 
 class EmailTemplate:
+    def __init__(self, card_cache_size=2048):
+        # 사용자 사이에서 공유하는 공고 카드 HTML 조각
+        self.card_cache = FragmentCache(card_cache_size)
+        # 배치 동안 고정하는 날짜 관련 렌더링 값 (begin_render_batch()에서 생성)
+        self.render_context = None
+
+    def begin_render_batch(self, now=None):
+        """배치 렌더링 시작: 오늘 날짜·주차·마감일 문구를 배치 동안 고정"""
+        self.render_context = RenderContext(now)
+        return self.render_context
+
+    def end_render_batch(self):
+        """배치 렌더링 종료: 이후 렌더링은 다시 렌더링 시점 기준 날짜를 사용"""
+        self.render_context = None
+
+    def _current_render_context(self):
+        """배치 중이면 배치의 RenderContext, 아니면 지금 기준으로 새로 생성"""
+        return self.render_context or RenderContext()
+
     def insert_job_data(self, html_content, job_data, user_name):
-        """HTML 템플릿에 채용공고 데이터 삽입"""
-        # 기본 정보 교체
-        current_date = datetime.now().strftime("%Y.%m.%d")
-        week_info = get_week_info()
+        """HTML 템플릿에 채용공고 데이터 삽입
 
-        html_content = html_content.replace("{{USER_NAME}}", user_name)
-        html_content = html_content.replace("{{CURRENT_DATE}}", current_date)
-        html_content = html_content.replace("{{WEEK}}", week_info)
+        html_content: 템플릿 문자열 또는 CompiledTemplate
+        """
+        template = compile_template(html_content)
+        context = self._current_render_context()
 
         # 채용공고 카드들 생성
         job_cards_html = "".join(
-            self.create_job_card_html(job_info) for job_info in job_data
+            self.cached_job_card_html(job_info, context) for job_info in job_data
+        )
+
+        # 기본 정보와 카드를 치환 자리에 넣어 한 번에 조립
+        html_content = template.render(
+            {
+                "USER_NAME": user_name,
+                "CURRENT_DATE": context.current_date,
+                "WEEK": context.week_info,
+                "JOB_CARDS": job_cards_html,
+            }
         )
-        html_content = html_content.replace("{{JOB_CARDS}}", job_cards_html)
 
         logger.info(f"템플릿 생성 완료: {len(job_data)}개 공고")
         return html_content
 
-    def create_job_card_html(self, job_info):
-        """개별 채용공고 카드 HTML 생성"""
+    def cached_job_card_html(self, job_info, context=None):
+        """공고 카드 HTML (같은 공고·희망기업 여부·날짜면 다른 사용자와 공유)"""
+        context = context or self._current_render_context()
+        job = job_info["job"]
+        if job.get("id") is None:
+            return self.create_job_card_html(job_info, context)
+
+        key = (
+            job["id"],
+            job_info["scores"].get("company_bonus", 0) > 0,
+            context.today,
+            JOB_CARD_VERSION,
+        )
+        return self.card_cache.get_or_create(
+            key, lambda: self.create_job_card_html(job_info, context)
+        )
+
+    def create_job_card_html(self, job_info, context=None):
+        """개별 채용공고 카드 HTML 생성 (들여쓰기·줄바꿈을 줄인 형태)"""
         job = job_info["job"]
         scores = job_info["scores"]
 
@@ -37,13 +85,14 @@ class EmailTemplate:
 
         # 태그 및 마감일 정보
         tags_html = self.create_tags_html(job)
-        deadline_info = calculate_deadline_info(job.get("application_deadline_date"))
+        context = context or self._current_render_context()
+        deadline_info = context.deadline_info(job.get("application_deadline_date"))
         apply_link = job.get("application_link", "#")
 
         if apply_link == "#":
             logger.warning(f"지원 링크 없음: {job['company_name']}")
 
-        return f"""
+        card_html = f"""
         <div class="job-card">
           <div class="job-content">
             <table class="job-header-table">
@@ -74,6 +123,7 @@ class EmailTemplate:
           </div>
         </div>
         """
+        return minify_html(card_html)
 
     def create_tags_html(self, job):
         """경력/고용형태 태그 HTML 생성"""
@@ -0,0 +1,266 @@
+# services/job/job_catalog.py
+import hashlib
+import logging
+from datetime import datetime
+from types import MappingProxyType
+from db.db_local import Database
+from db.db_query.matching_query import MatchingQueries
+
+try:
+    import numpy as np
+except ImportError:  # numpy가 없으면 매칭은 파이썬 순회 경로를 사용
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# 정렬 시 NULL 개수를 세는 필드
+NULLABLE_FIELDS = ("education", "experience_level", "employment_type")
+
+
+def row_to_job(job):
+    """GET_ACTIVE_JOB_POSTINGS 결과 행을 채용공고 딕셔너리로 변환"""
+    return {
+        "id": job[0],
+        "company_name": job[1],
+        "job_title": job[2],
+        "position_name": job[3],
+        "experience_level": job[4],
+        "education": job[5],
+        "employment_type": job[6],
+        "application_deadline_date": job[7],
+        "created_at": job[8],
+        "job_role": job[3],  # position_name을 job_role로 사용
+    }
+
+
+class CatalogColumns:
+    """범주형 매칭 속성을 정수 코드 배열로 저장한 컬럼 뷰 (numpy 필요)
+
+    경력/학력/고용형태/직무/회사명이 하나의 어휘(vocab)를 공유하며,
+    코드 0은 NULL을 뜻한다. 사용자별 필터와 정렬을 배열 연산으로 처리한다.
+    """
+
+    NULL_CODE = 0
+
+    def __init__(self, jobs):
+        self.vocab = {}
+        self.experience_level = self._encode(jobs, "experience_level")
+        self.education = self._encode(jobs, "education")
+        self.employment_type = self._encode(jobs, "employment_type")
+        self.job_role = self._encode(jobs, "job_role")
+        self.company_name = self._encode(jobs, "company_name")
+
+        # 정렬 키 중 사용자와 무관한 부분은 미리 계산
+        self.null_counts = (
+            (self.education == self.NULL_CODE).astype(np.int8)
+            + (self.experience_level == self.NULL_CODE)
+            + (self.employment_type == self.NULL_CODE)
+        )
+        names = sorted({job["company_name"] for job in jobs if job["company_name"]})
+        name_order = {name: i for i, name in enumerate(names)}
+        self.company_order = np.fromiter(
+            (name_order.get(job["company_name"], -1) for job in jobs),
+            dtype=np.int32,
+            count=len(jobs),
+        )
+
+    def _encode(self, jobs, field):
+        vocab = self.vocab
+        codes = np.zeros(len(jobs), dtype=np.int32)
+        for i, job in enumerate(jobs):
+            value = job.get(field)
+            if value is not None:
+                codes[i] = vocab.setdefault(value, len(vocab) + 1)
+        return codes
+
+    def isin(self, column, values):
+        """column 값이 values 중 하나인지 여부 (어휘에 없는 값은 무시)"""
+        codes = [self.vocab[v] for v in values if v in self.vocab]
+        return np.isin(column, np.array(codes, dtype=np.int32))
+
+    def lookup_table(self, mapping, default, null):
+        """{값: 점수} 매핑을 코드로 바로 조회할 수 있는 배열로 변환"""
+        table = np.full(len(self.vocab) + 1, default, dtype=np.int8)
+        table[self.NULL_CODE] = null
+        for value, score in mapping.items():
+            code = self.vocab.get(value)
+            if code is not None:
+                table[code] = score
+        return table
+
+
+def popcount(bits):
+    """비트셋에 포함된 공고 수"""
+    return bin(bits).count("1")
+
+
+class CatalogIndex:
+    """(속성, 값) → 공고 비트셋 역색인
+
+    비트 i는 catalog.jobs[i]를 뜻하며, 속성별 NULL 비트셋을 따로 둔다.
+    매칭 규칙(NULL 통과, 희망조건 없음 통과, 그 외 포함 여부)은
+    희망조건 값 개수만큼의 비트셋 합집합/교집합으로 계산된다.
+    """
+
+    ATTRIBUTES = ("experience_level", "employment_type", "education", "job_role")
+
+    def __init__(self, jobs):
+        self.size = len(jobs)
+        self.all_bits = (1 << self.size) - 1
+
+        nbytes = (self.size + 7) // 8
+        self.postings = {}
+        self.nulls = {}
+        for attr in self.ATTRIBUTES:
+            buffers = {}
+            for i, job in enumerate(jobs):
+                buffer = buffers.setdefault(job.get(attr), bytearray(nbytes))
+                buffer[i >> 3] |= 1 << (i & 7)
+
+            null_buffer = buffers.pop(None, None)
+            self.nulls[attr] = int.from_bytes(null_buffer, "little") if null_buffer else 0
+            self.postings[attr] = {
+                value: int.from_bytes(buffer, "little")
+                for value, buffer in buffers.items()
+            }
+
+    def allowed(self, attr, values):
+        """NULL이거나 values 중 하나인 공고 비트셋 (values가 비면 전체)"""
+        if not values:
+            return self.all_bits
+
+        postings = self.postings[attr]
+        bits = self.nulls[attr]
+        for value in values:
+            bits |= postings.get(value, 0)
+        return bits
+
+    def to_indices(self, bits):
+        """비트셋 → 오름차순 공고 인덱스 리스트"""
+        indices = []
+        for byte_idx, byte in enumerate(bits.to_bytes((self.size + 7) // 8, "little")):
+            while byte:
+                low = byte & -byte
+                indices.append((byte_idx << 3) + low.bit_length() - 1)
+                byte ^= low
+        return indices
+
+    def to_mask(self, bits):
+        """비트셋 → numpy bool 배열 (numpy 필요)"""
+        raw = np.frombuffer(bits.to_bytes((self.size + 7) // 8, "little"), np.uint8)
+        return np.unpackbits(raw, count=self.size, bitorder="little").astype(bool)
+
+
+class JobCatalog:
+    """배치 전체에서 공유하는 활성 채용공고 스냅샷 (읽기 전용)
+
+    배치 시작 시 한 번만 조회하고, 모든 사용자 매칭에서 재사용한다.
+    version은 공고 내용으로 계산되므로 같은 데이터면 같은 값을 가진다.
+    후보 검색용 비트셋 역색인(index)은 스냅샷마다 한 번 만들어 공유하고,
+    numpy가 있으면 범주형 속성을 컬럼 코드 배열(columns)로도 보관한다.
+    """
+
+    __slots__ = (
+        "_jobs",
+        "_version",
+        "_loaded_at",
+        "_watermark",
+        "_row_hashes",
+        "_null_counts",
+        "_index",
+        "_columns",
+    )
+
+    def __init__(self, rows, loaded_at=None):
+        digest = hashlib.sha1()
+        jobs = []
+        row_hashes = []
+        for row in rows:
+            encoded = repr(tuple(row)).encode("utf-8")
+            digest.update(encoded)
+            row_hashes.append(hashlib.sha1(encoded).hexdigest()[:16])
+            jobs.append(MappingProxyType(row_to_job(row)))
+
+        object.__setattr__(self, "_jobs", tuple(jobs))
+        object.__setattr__(self, "_version", digest.hexdigest()[:12])
+        object.__setattr__(self, "_loaded_at", loaded_at or datetime.now())
+        object.__setattr__(
+            self,
+            "_watermark",
+            max(
+                (job["created_at"] for job in jobs if job["created_at"] is not None),
+                default=None,
+            ),
+        )
+        object.__setattr__(self, "_row_hashes", tuple(row_hashes))
+        object.__setattr__(
+            self,
+            "_null_counts",
+            tuple(
+                sum(1 for field in NULLABLE_FIELDS if job.get(field) is None)
+                for job in self._jobs
+            ),
+        )
+        object.__setattr__(self, "_index", CatalogIndex(self._jobs))
+        object.__setattr__(
+            self, "_columns", CatalogColumns(self._jobs) if np is not None else None
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError("JobCatalog는 변경할 수 없습니다")
+
+    @classmethod
+    def load(cls):
+        """DB에서 활성 채용공고를 한 번 조회하여 스냅샷 생성"""
+        with Database.get_cursor() as (cursor, connection):
+            cursor.execute(MatchingQueries.GET_ACTIVE_JOB_POSTINGS)
+            rows = cursor.fetchall()
+
+        catalog = cls(rows)
+        logger.info(
+            f"채용공고 스냅샷 로드 완료: {len(catalog)}개 (version={catalog.version})"
+        )
+        return catalog
+
+    @property
+    def jobs(self):
+        return self._jobs
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def loaded_at(self):
+        return self._loaded_at
+
+    @property
+    def watermark(self):
+        """스냅샷에서 가장 최근 공고의 created_at (갱신 시점 기록용)"""
+        return self._watermark
+
+    @property
+    def row_hashes(self):
+        """공고별 행 내용 해시 (증분 갱신에서 수정·재게시된 공고 감지)"""
+        return self._row_hashes
+
+    @property
+    def null_counts(self):
+        """공고별 NULL 필드 개수 (정렬 키 중 사용자와 무관한 부분)"""
+        return self._null_counts
+
+    @property
+    def index(self):
+        """CatalogIndex (속성 값별 공고 비트셋)"""
+        return self._index
+
+    @property
+    def columns(self):
+        """CatalogColumns (numpy가 없으면 None)"""
+        return self._columns
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def __iter__(self):
+        return iter(self._jobs)
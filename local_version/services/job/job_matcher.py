@@ -1,26 +1,17 @@
 # services/job_matcher.py
+import heapq
 import logging
-import json
 from db.db_local import Database
 from db.db_query.matching_query import MatchingQueries
+from local_version.services.job.job_catalog import JobCatalog, popcount, row_to_job
+from local_version.services.user.user_profile import UserProfile
 
-logger = logging.getLogger(__name__)
-
+try:
+    import numpy as np
+except ImportError:  # CatalogColumns가 없으면 rank_columns()는 호출되지 않음
+    np = None
 
-def is_preferred_company(user_companies, job_company):
-    """희망기업 여부 확인"""
-    if not user_companies or not job_company:
-        return False
-
-    try:
-        company_list = (
-            json.loads(user_companies)
-            if isinstance(user_companies, str)
-            else user_companies
-        )
-        return job_company in company_list
-    except (json.JSONDecodeError, TypeError):
-        return False
+logger = logging.getLogger(__name__)
 
 
 def count_nulls(job_dict):
@@ -29,219 +20,606 @@ def count_nulls(job_dict):
     return sum(1 for field in check_fields if job_dict.get(field) is None)
 
 
-def get_job_role_priority(user_job_roles, job_role):
+def get_job_role_priority(profile, job_role):
     """직무 우선순위 계산 (낮을수록 우선순위 높음)"""
     if job_role is None:
         return 4
-
-    for i, role_key in enumerate(["role1", "role2", "role3"], 1):
-        if user_job_roles.get(role_key) == job_role:
-            return i
-    return 5
+    return profile.role_rank.get(job_role, 5)
 
 
 def get_priority(user_values, job_value):
-    """공통 우선순위 계산 함수"""
+    """공통 우선순위 계산 함수 (user_values: UserProfile의 frozenset)"""
     if job_value is None:
         return 2
     if not user_values:
         return 3
-
-    user_list = [v.strip() for v in user_values.split(",")]
-    return 1 if job_value in user_list else 3
+    return 1 if job_value in user_values else 3
 
 
-def apply_basic_filters(user_prefs, job_postings):
-    """1단계 필터링: 신입 공고만 추출"""
-    filtered_jobs = []
+def filter_jobs(profile, job_postings):
+    """1~4단계 필터링(경력 → 고용형태 → 직무 → 학력)을 한 번의 순회로 처리
 
-    for job in job_postings:
-        experience_level = job.get("experience_level")
-        if experience_level in ["신입", None]:
-            filtered_jobs.append(job)
+    중간 리스트를 만들지 않고, 통과한 공고의 인덱스와
+    단계별 통과 공고 수를 함께 반환한다.
+    """
+    filtered_indices = []
+    step_counts = [0, 0, 0, 0]
 
-    return filtered_jobs
+    user_emp_list = profile.employment_types
+    user_roles = profile.role_rank
+    user_edu_list = profile.education
 
+    for idx, job in enumerate(job_postings):
+        # 1단계: 신입 공고만 추출
+        if job.get("experience_level") not in ("신입", None):
+            continue
+        step_counts[0] += 1
 
-def filter_by_employment_type(user_prefs, job_postings):
-    """2단계 필터링: 고용형태"""
-    filtered_jobs = []
-    target_emp_type = user_prefs.get("target_emp_type") or ""
-    user_emp_list = [emp.strip() for emp in target_emp_type.split(",") if emp.strip()]
-
-    for job in job_postings:
+        # 2단계: 고용형태
         employment_type = job.get("employment_type")
-
-        if (
+        if not (
             employment_type is None
             or not user_emp_list
             or employment_type in user_emp_list
         ):
-            filtered_jobs.append(job)
-
-    return filtered_jobs
+            continue
+        step_counts[1] += 1
 
+        # 3단계: 직무
+        job_role = job.get("job_role")
+        if not (job_role is None or not user_roles or job_role in user_roles):
+            continue
+        step_counts[2] += 1
 
-def filter_by_job_role(user_prefs, job_postings):
-    """3단계 필터링: 직무"""
-    filtered_jobs = []
-    user_roles = [
-        user_prefs.get("target_job_role1"),
-        user_prefs.get("target_job_role2"),
-        user_prefs.get("target_job_role3"),
-    ]
-    user_roles = [role for role in user_roles if role]
+        # 4단계: 학력
+        education = job.get("education")
+        if not (education is None or not user_edu_list or education in user_edu_list):
+            continue
+        step_counts[3] += 1
+
+        filtered_indices.append(idx)
+
+    return filtered_indices, step_counts
+
+
+def rank_jobs(profile, job_postings, indices, top_n, null_counts=None):
+    """희망기업 공고를 먼저, 그 안에서는 sort_key 순으로 상위 top_n개 선정
+
+    전체를 정렬하지 않고 크기 top_n의 힙으로 고른다 (O(n log k)).
+    null_counts: 공고별 count_nulls() 값 (JobCatalog.null_counts)
+    [(공고 인덱스, 희망기업 여부), ...]를 반환한다.
+    """
+    preferred_jobs = []
+    other_jobs = []
+
+    for idx in indices:
+        if profile.is_preferred(job_postings[idx]["company_name"]):
+            preferred_jobs.append(idx)
+        else:
+            other_jobs.append(idx)
+
+    # 정렬 키 함수
+    def sort_key(idx):
+        job = job_postings[idx]
+        return (
+            null_counts[idx] if null_counts is not None else count_nulls(job),
+            get_job_role_priority(profile, job.get("job_role")),
+            get_priority(profile.education, job.get("education")),
+            get_priority(profile.employment_types, job.get("employment_type")),
+            job["company_name"],
+        )
 
-    for job in job_postings:
-        job_role = job.get("job_role")
+    # 희망기업 공고부터 채우고, 모자란 만큼만 기타 공고에서 선정
+    # (heapq.nsmallest는 sorted(...)[:n]과 같은 순서를 보장)
+    top_preferred = heapq.nsmallest(top_n, preferred_jobs, key=sort_key)
+    top_other = heapq.nsmallest(top_n - len(top_preferred), other_jobs, key=sort_key)
+
+    ranked = [(idx, True) for idx in top_preferred]
+    ranked += [(idx, False) for idx in top_other]
+    return ranked
+
+
+def _priority_column(columns, column, user_values):
+    """get_priority()의 벡터 버전: NULL=2, 희망조건 일치=1, 그 외=3"""
+    if user_values:
+        matched = np.where(columns.isin(column, user_values), 1, 3)
+    else:
+        matched = np.full(len(column), 3)
+    return np.where(column == columns.NULL_CODE, 2, matched)
+
+
+def filter_index(profile, index):
+    """filter_jobs()와 같은 1~4단계 필터링을 CatalogIndex 비트셋 연산으로 처리
+
+    (통과 공고 비트셋, 단계별 통과 수)를 반환한다.
+    """
+    step_counts = []
+    bits = index.all_bits
+    for attr, user_values in (
+        ("experience_level", ("신입",)),  # 1단계: 신입 공고만 추출
+        ("employment_type", profile.employment_types),
+        ("job_role", profile.role_rank),
+        ("education", profile.education),
+    ):
+        bits &= index.allowed(attr, user_values)
+        step_counts.append(popcount(bits))
+    return bits, step_counts
+
+
+def rank_columns(profile, columns, indices, top_n):
+    """rank_jobs()를 CatalogColumns 배열 연산으로 처리 (결과 동일)
+
+    정렬 키를 하나의 int64로 합친 뒤 argpartition으로 상위 top_n개만 골라
+    그 안에서만 정렬한다. 마지막 자리에 공고 인덱스를 넣어 안정 정렬과 같다.
+    """
+    if not len(indices):
+        return []
 
-        if job_role is None or not user_roles or job_role in user_roles:
-            filtered_jobs.append(job)
+    preferred = columns.isin(columns.company_name[indices], profile.companies)
+    role_priority = columns.lookup_table(profile.role_rank, default=5, null=4)
+
+    # 희망기업 우선(1bit) → NULL 개수(2bit) → 직무(3bit) → 학력(2bit)
+    # → 고용형태(2bit) → 회사명 순서 → 공고 인덱스
+    key = (~preferred).astype(np.int64)
+    key = (key << 2) | columns.null_counts[indices]
+    key = (key << 3) | role_priority[columns.job_role[indices]]
+    key = (key << 2) | _priority_column(
+        columns, columns.education[indices], profile.education
+    )
+    key = (key << 2) | _priority_column(
+        columns, columns.employment_type[indices], profile.employment_types
+    )
+    width = (len(columns.company_order) + 1).bit_length()
+    key = (key << width) | (columns.company_order[indices] + 1)
+    key = (key << width) | indices
+
+    if len(key) > top_n:
+        top = np.argpartition(key, top_n - 1)[:top_n]
+    else:
+        top = np.arange(len(key))
+    order = top[np.argsort(key[top])]
+
+    return [(int(indices[i]), bool(preferred[i])) for i in order]
+
+
+def match_catalog(profile, catalog, top_n):
+    """역색인으로 후보를 고른 뒤 정렬 (numpy 컬럼이 있으면 벡터 정렬)
+
+    ([(공고 인덱스, 희망기업 여부), ...], 단계별 통과 수)를 반환한다.
+    """
+    bits, step_counts = filter_index(profile, catalog.index)
+
+    if catalog.columns is not None:
+        indices = np.flatnonzero(catalog.index.to_mask(bits))
+        return rank_columns(profile, catalog.columns, indices, top_n), step_counts
+
+    indices = catalog.index.to_indices(bits)
+    ranked = rank_jobs(profile, catalog.jobs, indices, top_n, catalog.null_counts)
+    return ranked, step_counts
+
+
+def query_ranked_jobs(profile, top_n):
+    """필터/정렬/LIMIT을 DB에서 처리하여 상위 top_n개 공고만 조회
+
+    MatchingQueries.build_personalized_job_postings()를 사용하며,
+    [(채용공고 딕셔너리, 희망기업 여부), ...]를 반환한다.
+    """
+    query, params = MatchingQueries.build_personalized_job_postings(profile, top_n)
+    with Database.get_cursor() as (cursor, connection):
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+
+    return [(row_to_job(row), profile.is_preferred(row[1])) for row in rows]
+
+
+class MatchResultCache:
+    """같은 희망조건 시그니처의 매칭 결과를 배치 안에서 재사용
+
+    UserProfile.signature가 같은 사용자는 한 번만 매칭하고 결과를 공유한다.
+    """
+
+    def __init__(self):
+        self._results = {}
+        self.lookups = 0
+
+    def match(self, profile, catalog, top_n):
+        """match_catalog()와 같은 결과 (캐시에 없을 때만 실제 매칭)"""
+        self.lookups += 1
+        key = (profile.signature, catalog.version, top_n)
+        result = self._results.get(key)
+        if result is None:
+            result = match_catalog(profile, catalog, top_n)
+            self._results[key] = result
+        return result
+
+    def has(self, profile, catalog, top_n):
+        """profile의 희망조건 결과가 이미 있는지 (조회 수에는 반영하지 않음)"""
+        return (profile.signature, catalog.version, top_n) in self._results
+
+    def store(self, profile, catalog, top_n, result):
+        """다른 곳(병렬 워커 등)에서 계산한 match_catalog() 결과를 등록"""
+        self._results[(profile.signature, catalog.version, top_n)] = result
+
+    @property
+    def distinct(self):
+        return len(self._results)
+
+    @property
+    def dedup_ratio(self):
+        """매칭을 건너뛴 비율 (0~1)"""
+        if not self.lookups:
+            return 0.0
+        return 1 - self.distinct / self.lookups
+
+
+def iter_subscriber_preferences(page_size=1000, after_user_id=0):
+    """구독자 (user_id, email, name, UserProfile)을 user_id 순서로 한 페이지씩 조회하며 생성
+
+    UserService.iter_active_subscribers()와 같은 user_id keyset 페이지로 희망조건을
+    함께 읽으므로 구독자 수와 상관없이 한 번에 한 페이지의 희망조건만 메모리에 둔다.
+    페이지 조회에 실패하면 오류를 기록하고 그때까지 읽은 사용자에서 멈춘다.
+    """
+    last_user_id = after_user_id
+    while True:
+        try:
+            with Database.get_cursor() as (cursor, connection):
+                cursor.execute(
+                    MatchingQueries.GET_SUBSCRIBER_PREFERENCES_PAGE,
+                    (last_user_id, page_size),
+                )
+                rows = cursor.fetchall()
+        except Exception as e:
+            logger.error(
+                f"구독자 희망조건 조회 오류 (user_id {last_user_id} 이후): {e}"
+            )
+            return
+        if not rows:
+            return
+
+        for row in rows:
+            # 희망기업 행이 여러 개면 첫 행만 사용 (개별 조회와 동일)
+            if row[0] != last_user_id:
+                last_user_id = row[0]
+                yield row[0], row[1], row[9], UserProfile.from_row(row)
+
+        if len(rows) < page_size:
+            return
+
+
+def load_subscriber_preferences(page_size=1000):
+    """구독자 전체의 희망조건을 {user_id: UserProfile} 딕셔너리로 조회
+
+    저장된 추천 결과 전체와 비교하는 refresh_recommendations()용이다
+    (발송과 전체 매칭은 iter_subscriber_preferences()로 한 페이지씩 읽는다).
+    """
+    preferences = {
+        user_id: profile
+        for user_id, _, _, profile in iter_subscriber_preferences(page_size)
+    }
+    logger.info(f"구독자 희망조건 일괄 조회 완료: {len(preferences)}명")
+    return preferences
+
+
+def _insert_recommendations(cursor, catalog, ranked_by_user, chunk_size):
+    """(user_id, 희망조건 해시, [(공고 인덱스, 희망기업 여부), ...]) 목록을 저장
+
+    추천 행과 희망조건 해시를 chunk_size 행 단위로 기록하므로 ranked_by_user가
+    제너레이터면 사용자 전체를 메모리에 올리지 않는다.
+    (저장한 추천 행 수, 사용자 수)를 반환한다.
+    """
+    saved = users = 0
+    rows = []
+    hashes = []
+    for user_id, fingerprint, ranked in ranked_by_user:
+        users += 1
+        hashes.append((user_id, fingerprint))
+        rows.extend(
+            (
+                user_id,
+                rank,
+                catalog.jobs[idx]["id"],
+                int(is_preferred),
+                catalog.version,
+            )
+            for rank, (idx, is_preferred) in enumerate(ranked, 1)
+        )
 
-    return filtered_jobs
+        if len(rows) >= chunk_size or len(hashes) >= chunk_size:
+            saved += _write_recommendation_chunk(cursor, rows, hashes)
+            rows = []
+            hashes = []
+
+    if hashes:
+        saved += _write_recommendation_chunk(cursor, rows, hashes)
+    return saved, users
+
+
+def _write_recommendation_chunk(cursor, rows, hashes):
+    """추천 행과 희망조건 해시 한 묶음 기록 (기록한 추천 행 수 반환)"""
+    if rows:
+        cursor.executemany(MatchingQueries.INSERT_USER_RECOMMENDATION, rows)
+    cursor.executemany(MatchingQueries.UPSERT_USER_PREFERENCE_HASH, hashes)
+    return len(rows)
+
+
+def materialize_recommendations(
+    catalog, preferences, top_n=10, match_cache=None, chunk_size=1000
+):
+    """구독자 전체의 상위 top_n 추천을 user_recommendations 테이블에 저장
+
+    발송 전에 한 번 실행하는 매칭 단계로, 이전 결과 삭제와 새 결과 삽입을
+    한 트랜잭션에서 처리한다 (executemany를 chunk_size 행 단위로 실행).
+    다음 refresh_recommendations()를 위해 공고별 행 해시와 희망조건 해시도 저장한다.
+    preferences: (user_id, UserProfile) 이터러블 (딕셔너리의 items() 또는
+    iter_subscriber_preferences()에서 만든 제너레이터, 한 번만 순회)
+    저장한 추천 행 수를 반환한다.
+    """
+    if match_cache is None:
+        match_cache = MatchResultCache()
+
+    ranked_by_user = (
+        (user_id, profile.fingerprint, match_cache.match(profile, catalog, top_n)[0])
+        for user_id, profile in preferences
+    )
+
+    with Database.get_cursor() as (cursor, connection):
+        cursor.execute(MatchingQueries.DELETE_USER_RECOMMENDATIONS)
+        cursor.execute(MatchingQueries.DELETE_USER_PREFERENCE_HASHES)
+        saved, users = _insert_recommendations(
+            cursor, catalog, ranked_by_user, chunk_size
+        )
+        cursor.execute(MatchingQueries.DELETE_RECOMMENDATION_CATALOG_STATE)
+        cursor.executemany(
+            MatchingQueries.UPSERT_RECOMMENDATION_CATALOG_STATE,
+            [
+                (job["id"], row_hash)
+                for job, row_hash in zip(catalog.jobs, catalog.row_hashes)
+            ],
+        )
+        cursor.execute(
+            MatchingQueries.UPSERT_RECOMMENDATION_WATERMARK, (catalog.watermark, top_n)
+        )
+        connection.commit()
+
+    logger.info(
+        f"추천 결과 저장 완료: {users}명, {saved}건 (version={catalog.version})"
+    )
+    return saved
+
+
+def refresh_recommendations(
+    catalog, preferences, top_n=10, match_cache=None, chunk_size=1000
+):
+    """user_recommendations를 바뀐 부분만 증분 갱신
+
+    지난 갱신 때 저장한 공고별 행 해시와 현재 스냅샷을 비교해, 새로 등록되었거나
+    (created_at이 과거로 들어온 공고 포함) 마감 연장으로 다시 열렸거나 내용이
+    수정된 공고(changed)와 마감·삭제된 공고(closed)를 찾는다.
+
+    - 희망조건 해시가 바뀌었거나 새로 구독한 사용자: 전체 재매칭
+    - 그 외: 저장된 top_n에서 closed/changed 공고를 빼고, changed 공고 중
+      필터를 통과한 것만 합쳐 다시 정렬
+    - 저장된 top_n이 꽉 차 있었는데 closed/changed 공고가 있었으면 그 자리를
+      기존 공고가 채울 수 있으므로 전체 재매칭
+    - 구독을 해지한 사용자: 저장된 결과 삭제
+    갱신 기록이 없거나 top_n이 바뀌었으면 materialize_recommendations()로 대체한다.
+    preferences: load_subscriber_preferences() 결과 (해지한 사용자를 찾기 위해
+    구독자 전체가 필요하다)
+    저장한 추천 행 수를 반환한다.
+    """
+    if match_cache is None:
+        match_cache = MatchResultCache()
+
+    with Database.get_cursor() as (cursor, connection):
+        cursor.execute(MatchingQueries.GET_RECOMMENDATION_WATERMARK)
+        state = cursor.fetchone()
+        cursor.execute(MatchingQueries.GET_RECOMMENDATION_CATALOG_STATE)
+        stored_postings = dict(cursor.fetchall())
+        cursor.execute(MatchingQueries.GET_USER_PREFERENCE_HASHES)
+        stored_hashes = dict(cursor.fetchall())
+        cursor.execute(MatchingQueries.GET_ALL_USER_RECOMMENDATIONS)
+        stored = {}
+        for user_id, job_posting_id in cursor.fetchall():
+            stored.setdefault(user_id, []).append(job_posting_id)
+
+    if state is None or state[1] != top_n or (catalog.jobs and not stored_postings):
+        logger.info("증분 갱신 기준이 없어 전체 매칭으로 대체합니다")
+        return materialize_recommendations(
+            catalog, preferences.items(), top_n, match_cache, chunk_size
+        )
 
+    positions = {job["id"]: idx for idx, job in enumerate(catalog.jobs)}
+    changed_indices = [
+        idx
+        for idx, (job, row_hash) in enumerate(zip(catalog.jobs, catalog.row_hashes))
+        if stored_postings.get(job["id"]) != row_hash
+    ]
+    changed_postings = [catalog.jobs[idx] for idx in changed_indices]
+    changed_ids = {job["id"] for job in changed_postings}
+    closed_ids = stored_postings.keys() - positions.keys()
+
+    # 희망조건 시그니처별 changed 공고 필터링 결과 (같은 조건끼리 공유)
+    changed_matches = {}
+    updates = {}
+    rematched = merged = 0
+
+    for user_id, profile in preferences.items():
+        fingerprint = profile.fingerprint
+        job_ids = stored.get(user_id, [])
+        kept = [
+            positions[job_id]
+            for job_id in job_ids
+            if job_id in positions and job_id not in changed_ids
+        ]
+        displaced = len(kept) < len(job_ids)
+
+        if stored_hashes.get(user_id) != fingerprint or (
+            displaced and len(job_ids) >= top_n
+        ):
+            ranked, _ = match_cache.match(profile, catalog, top_n)
+            rematched += 1
+        elif changed_indices or displaced:
+            fresh = changed_matches.get(profile.signature)
+            if fresh is None:
+                passed, _ = filter_jobs(profile, changed_postings)
+                fresh = [changed_indices[i] for i in passed]
+                changed_matches[profile.signature] = fresh
+
+            candidates = sorted(set(kept).union(fresh))
+            ranked = rank_jobs(
+                profile, catalog.jobs, candidates, top_n, catalog.null_counts
+            )
+            merged += 1
+        else:
+            continue
 
-def filter_by_education(user_prefs, job_postings):
-    """4단계 필터링: 학력"""
-    filtered_jobs = []
-    target_edu = user_prefs.get("target_edu") or ""
-    user_edu_list = [edu.strip() for edu in target_edu.split(",") if edu.strip()]
+        if (
+            stored_hashes.get(user_id) == fingerprint
+            and [catalog.jobs[idx]["id"] for idx, _ in ranked] == job_ids
+        ):
+            continue
+        updates[user_id] = (fingerprint, ranked)
 
-    for job in job_postings:
-        education = job.get("education")
+    removed = [
+        (user_id,)
+        for user_id in stored_hashes.keys() | stored.keys()
+        if user_id not in preferences
+    ]
 
-        if education is None or not user_edu_list or education in user_edu_list:
-            filtered_jobs.append(job)
+    with Database.get_cursor() as (cursor, connection):
+        cursor.executemany(
+            MatchingQueries.DELETE_USER_RECOMMENDATIONS_BY_USER,
+            removed + [(user_id,) for user_id in updates],
+        )
+        cursor.executemany(MatchingQueries.DELETE_USER_PREFERENCE_HASH, removed)
+        saved, _ = _insert_recommendations(
+            cursor,
+            catalog,
+            (
+                (user_id, fingerprint, ranked)
+                for user_id, (fingerprint, ranked) in updates.items()
+            ),
+            chunk_size,
+        )
+        cursor.executemany(
+            MatchingQueries.DELETE_RECOMMENDATION_CATALOG_STATE_BY_ID,
+            [(job_id,) for job_id in closed_ids],
+        )
+        cursor.executemany(
+            MatchingQueries.UPSERT_RECOMMENDATION_CATALOG_STATE,
+            [
+                (catalog.jobs[idx]["id"], catalog.row_hashes[idx])
+                for idx in changed_indices
+            ],
+        )
+        cursor.execute(
+            MatchingQueries.UPSERT_RECOMMENDATION_WATERMARK, (catalog.watermark, top_n)
+        )
+        connection.commit()
+
+    logger.info(
+        f"추천 결과 증분 갱신 완료: 신규·수정 공고 {len(changed_indices)}개, "
+        f"마감 공고 {len(closed_ids)}개, 재매칭 {rematched}명, 병합 {merged}명, "
+        f"변경 {len(updates)}명, 해지 {len(removed)}명, {saved}건 저장"
+    )
+    return saved
+
+
+def load_recommendations(user_id):
+    """materialize_recommendations()로 저장된 추천 결과 조회
+
+    마감된 공고는 제외하며, get_personalized_jobs()와 같은 형식으로 반환한다.
+    """
+    with Database.get_cursor() as (cursor, connection):
+        cursor.execute(MatchingQueries.GET_USER_RECOMMENDATIONS, (user_id,))
+        rows = cursor.fetchall()
+
+    return [
+        {
+            "job": row_to_job(row[1:]),
+            "scores": {"company_bonus": 1 if row[0] else 0},
+        }
+        for row in rows
+    ]
 
-    return filtered_jobs
 
+def get_personalized_jobs(
+    user_email, top_n=10, catalog=None, profile=None, match_cache=None, pushdown=False
+):
+    """채용공고 추천
 
-def get_personalized_jobs(user_email, top_n=10):
-    """채용공고 추천"""
+    catalog: 배치 단위로 공유하는 JobCatalog 스냅샷
+    profile: iter_subscriber_preferences()로 미리 만든 UserProfile
+    match_cache: 같은 희망조건끼리 결과를 공유할 MatchResultCache
+    pushdown: catalog가 없을 때 전체 공고 대신 DB에서 상위 top_n개만 조회
+    """
     logger.info(f"채용공고 추천 시작: {user_email}")
 
     try:
-        with Database.get_cursor() as (cursor, connection):
-            # 사용자 정보 조회
-            cursor.execute(MatchingQueries.GET_USER_PREFERENCES, (user_email,))
-            user_data = cursor.fetchone()
+        # 배치에서 미리 읽은 선호도가 없을 때만 개별 조회
+        if profile is None:
+            with Database.get_cursor() as (cursor, connection):
+                cursor.execute(MatchingQueries.GET_USER_PREFERENCES, (user_email,))
+                user_data = cursor.fetchone()
 
             if not user_data:
                 logger.warning(f"사용자 정보를 찾을 수 없음: {user_email}")
                 return []
 
             # 사용자 선호도
-            user_prefs = {
-                "target_edu": user_data[2],
-                "target_emp_type": user_data[4],
-                "target_job_role1": user_data[5],
-                "target_job_role2": user_data[6],
-                "target_job_role3": user_data[7],
-                "target_companies_json": user_data[8],
-            }
-
-            # 활성 채용공고 조회
-            cursor.execute(MatchingQueries.GET_ACTIVE_JOB_POSTINGS)
-            job_postings = cursor.fetchall()
-
-            if not job_postings:
-                logger.warning("활성 채용공고가 없습니다")
-                return []
-
-                # 채용공고를 딕셔너리로 변환
-            job_dicts = [
-                {
-                    "id": job[0],
-                    "company_name": job[1],
-                    "job_title": job[2],
-                    "position_name": job[3],
-                    "experience_level": job[4],
-                    "education": job[5],
-                    "employment_type": job[6],
-                    "application_deadline_date": job[7],
-                    "created_at": job[8],
-                    "job_role": job[3],  # position_name을 job_role로 사용
-                }
-                for job in job_postings
-            ]
-
-            # 단계별 필터링
-            logger.info("=== 필터링 시작 ===")
-
-            # 1단계: 경력 필터링
-            step1_jobs = apply_basic_filters(user_prefs, job_dicts)
-            logger.info(f"1단계(경력) 후: {len(step1_jobs)}개 공고")
-
-            # 2단계: 고용형태 필터링
-            step2_jobs = filter_by_employment_type(user_prefs, step1_jobs)
-            logger.info(f"2단계(고용형태) 후: {len(step2_jobs)}개 공고")
+            profile = UserProfile.from_row(user_data)
 
-            # 3단계: 직무 필터링
-            step3_jobs = filter_by_job_role(user_prefs, step2_jobs)
-            logger.info(f"3단계(직무) 후: {len(step3_jobs)}개 공고")
-
-            # 4단계: 학력 필터링
-            final_jobs = filter_by_education(user_prefs, step3_jobs)
-            logger.info(f"4단계(학력) 후: {len(final_jobs)}개 공고")
-
-            if not final_jobs:
+        # 한 명만 매칭할 때는 필터링/정렬을 DB에 맡기고 상위 top_n개만 조회
+        if catalog is None and pushdown:
+            ranked_jobs = query_ranked_jobs(profile, top_n)
+            if not ranked_jobs:
                 logger.warning("필터링 후 추천할 공고가 없습니다")
                 return []
 
-            # 희망기업 분리
-            preferred_jobs = []
-            other_jobs = []
-
-            for job in final_jobs:
-                if is_preferred_company(
-                    user_prefs["target_companies_json"], job["company_name"]
-                ):
-                    preferred_jobs.append(job)
-                else:
-                    other_jobs.append(job)
-
-            # 정렬 키 함수
-            job_roles = {
-                "role1": user_prefs["target_job_role1"],
-                "role2": user_prefs["target_job_role2"],
-                "role3": user_prefs["target_job_role3"],
-            }
-
-            def sort_key(job):
-                return (
-                    count_nulls(job),
-                    get_job_role_priority(job_roles, job.get("job_role")),
-                    get_priority(user_prefs["target_edu"], job.get("education")),
-                    get_priority(
-                        user_prefs["target_emp_type"], job.get("employment_type")
-                    ),
-                    job["company_name"],
-                )
-
-            # 정렬 및 결합
-            preferred_jobs.sort(key=sort_key)
-            other_jobs.sort(key=sort_key)
-            top_jobs = (preferred_jobs + other_jobs)[:top_n]
-
-            logger.info(f"추천 완료: {len(top_jobs)}개 공고 선정")
-
-            # 결과 반환
+            logger.info(f"추천 완료(DB 필터링): {len(ranked_jobs)}개 공고 선정")
             return [
                 {
                     "job": job,
-                    "scores": {
-                        "company_bonus": (
-                            1
-                            if is_preferred_company(
-                                user_prefs["target_companies_json"], job["company_name"]
-                            )
-                            else 0
-                        )
-                    },
+                    "scores": {"company_bonus": 1 if is_preferred else 0},
                 }
-                for job in top_jobs
+                for job, is_preferred in ranked_jobs
             ]
 
+        # 활성 채용공고 스냅샷 (배치에서 공유하지 않으면 직접 조회)
+        if catalog is None:
+            catalog = JobCatalog.load()
+
+        if not catalog:
+            logger.warning("활성 채용공고가 없습니다")
+            return []
+
+        # 단계별 필터링
+        logger.info("=== 필터링 시작 ===")
+
+        if match_cache is not None:
+            ranked, step_counts = match_cache.match(profile, catalog, top_n)
+        else:
+            ranked, step_counts = match_catalog(profile, catalog, top_n)
+        logger.info(f"1단계(경력) 후: {step_counts[0]}개 공고")
+        logger.info(f"2단계(고용형태) 후: {step_counts[1]}개 공고")
+        logger.info(f"3단계(직무) 후: {step_counts[2]}개 공고")
+        logger.info(f"4단계(학력) 후: {step_counts[3]}개 공고")
+
+        if not ranked:
+            logger.warning("필터링 후 추천할 공고가 없습니다")
+            return []
+
+        logger.info(f"추천 완료: {len(ranked)}개 공고 선정")
+
+        # 결과 반환
+        return [
+            {
+                "job": catalog.jobs[idx],
+                "scores": {"company_bonus": 1 if is_preferred else 0},
+            }
+            for idx, is_preferred in ranked
+        ]
+
     except Exception as e:
         logger.error(f"매칭 서비스 오류: {user_email} - {e}")
         return []
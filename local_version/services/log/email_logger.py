@@ -1,10 +1,28 @@
 import logging
+import threading
+from typing import List, Optional, Tuple
 from db.db_local import Database
 from db.db_query.email_query import EmailQueries
+from local_version.services.log.log_writer import BufferedLogWriter
 
 logger = logging.getLogger(__name__)
 
 
+def _log_row(
+    user_id: int, email: str, name: str, status: str, error_msg: str, job_count: int
+) -> Tuple:
+    """INSERT_EMAIL_LOG 파라미터 한 행"""
+    return (
+        user_id,
+        email,
+        (f"{name}님을 위한 맞춤 채용공고" if status == "SUCCESS" else "발송 실패"),
+        "PERSONALIZED",
+        status,
+        error_msg if status == "FAILED" else None,
+        job_count,
+    )
+
+
 class EmailLogger:
     """이메일 발송 로그 관리"""
 
@@ -17,19 +35,7 @@ class EmailLogger:
             with Database.get_cursor() as (cursor, connection):
                 cursor.execute(
                     EmailQueries.INSERT_EMAIL_LOG,
-                    (
-                        user_id,
-                        email,
-                        (
-                            f"{name}님을 위한 맞춤 채용공고"
-                            if status == "SUCCESS"
-                            else "발송 실패"
-                        ),
-                        "PERSONALIZED",
-                        status,
-                        error_msg if status == "FAILED" else None,
-                        job_count,
-                    ),
+                    _log_row(user_id, email, name, status, error_msg, job_count),
                 )
                 connection.commit()
 
@@ -43,3 +49,59 @@ class EmailLogger:
         except Exception as log_error:
             logger.error(f"로그 기록 실패: {email} - {log_error}")
             return False
+
+    @staticmethod
+    def buffered(
+        batch_size: int = 200, flush_interval: float = 5.0
+    ) -> "BufferedEmailLogger":
+        """executemany로 일괄 기록하는 로거 생성 (배치 한 번에 하나씩)"""
+        return BufferedEmailLogger(batch_size, flush_interval)
+
+
+class BufferedEmailLogger:
+    """발송 로그 행을 모아 BufferedLogWriter로 일괄 기록
+
+    log_result()는 행을 버퍼에 넣기만 하므로 성공 여부를 반환하지 않는다.
+    실제로 기록(commit)된 SUCCESS 행만 succeeded로 세므로, close() 후
+    succeeded가 로그까지 남긴 발송 성공 수다.
+    """
+
+    def __init__(self, batch_size: int = 200, flush_interval: float = 5.0):
+        self.writer = BufferedLogWriter(
+            Database.get_cursor,
+            EmailQueries.INSERT_EMAIL_LOG,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            on_flush=self._flushed,
+        )
+        self._lock = threading.Lock()
+        self.succeeded = 0
+
+    def _flushed(self, rows: List[Tuple]):
+        """기록을 마친 행 중 발송 성공 수 집계"""
+        with self._lock:
+            self.succeeded += sum(1 for row in rows if row[4] == "SUCCESS")
+
+    def log_result(
+        self,
+        user_id: int,
+        email: str,
+        name: str,
+        status: str,
+        error_msg: Optional[str],
+        job_count: int,
+    ) -> None:
+        """이메일 발송 결과를 버퍼에 추가 (batch_size건이 차면 기록)"""
+        if status == "SUCCESS":
+            logger.info(f"발송 성공: {email}")
+        else:
+            logger.error(f"발송 실패: {email} - {error_msg}")
+        self.writer.write(_log_row(user_id, email, name, status, error_msg, job_count))
+
+    def flush(self) -> int:
+        """버퍼의 행을 바로 기록하고 기록한 행 수 반환 (실패하면 0)"""
+        return self.writer.flush()
+
+    def close(self):
+        """버퍼에 남은 로그 기록"""
+        self.writer.close()
@@ -0,0 +1,115 @@
+# services/user/user_profile.py
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def split_csv(values):
+    """쉼표로 구분된 희망조건 문자열을 frozenset으로 변환"""
+    if not values:
+        return frozenset()
+    return frozenset(v.strip() for v in values.split(",") if v.strip())
+
+
+def parse_target_companies(target_companies_json):
+    """희망기업 JSON을 frozenset으로 변환 (파싱 실패 시 빈 집합)"""
+    if not target_companies_json:
+        return frozenset()
+
+    try:
+        companies = (
+            json.loads(target_companies_json)
+            if isinstance(target_companies_json, str)
+            else target_companies_json
+        )
+        if isinstance(companies, str):
+            return frozenset([companies])
+        return frozenset(companies)
+    except (json.JSONDecodeError, TypeError):
+        logger.warning(f"희망기업 파싱 실패: {target_companies_json}")
+        return frozenset()
+
+
+class UserProfile:
+    """사용자별로 한 번만 만드는 매칭용 희망조건
+
+    희망기업/학력/고용형태는 frozenset, 희망 직무는 순위 맵으로 미리 변환해
+    공고마다 JSON 파싱이나 문자열 분리를 반복하지 않는다.
+    """
+
+    __slots__ = ("companies", "education", "employment_types", "job_roles", "role_rank")
+
+    def __init__(self, companies, education, employment_types, job_roles):
+        self.companies = frozenset(companies)
+        self.education = frozenset(education)
+        self.employment_types = frozenset(employment_types)
+        self.job_roles = tuple(job_roles)
+
+        # 직무 -> 순위 (1순위가 가장 높음, 같은 직무가 중복되면 앞 순위 유지)
+        role_rank = {}
+        for rank, role in enumerate(self.job_roles, 1):
+            if role:
+                role_rank.setdefault(role, rank)
+        self.role_rank = role_rank
+
+    @classmethod
+    def from_prefs(cls, user_prefs):
+        """user_prefs 딕셔너리(target_* 필드)에서 프로필 생성"""
+        return cls(
+            companies=parse_target_companies(user_prefs.get("target_companies_json")),
+            education=split_csv(user_prefs.get("target_edu")),
+            employment_types=split_csv(user_prefs.get("target_emp_type")),
+            job_roles=(
+                user_prefs.get("target_job_role1"),
+                user_prefs.get("target_job_role2"),
+                user_prefs.get("target_job_role3"),
+            ),
+        )
+
+    @classmethod
+    def from_row(cls, user_data):
+        """희망조건 조회 결과 행(GET_USER_PREFERENCES 컬럼 순서)에서 프로필 생성"""
+        return cls.from_prefs(
+            {
+                "target_edu": user_data[2],
+                "target_emp_type": user_data[4],
+                "target_job_role1": user_data[5],
+                "target_job_role2": user_data[6],
+                "target_job_role3": user_data[7],
+                "target_companies_json": user_data[8],
+            }
+        )
+
+    @property
+    def signature(self):
+        """매칭 결과를 결정하는 희망조건만 모은 정규화된 키
+
+        직무는 빈 칸과 중복을 정리한 role_rank로 비교하므로
+        같은 결과를 내는 프로필은 같은 시그니처를 가진다.
+        """
+        return (
+            self.companies,
+            self.education,
+            self.employment_types,
+            frozenset(self.role_rank.items()),
+        )
+
+    @property
+    def fingerprint(self):
+        """signature를 실행 간에도 같은 값이 나오도록 직렬화한 해시 (변경 감지용)"""
+        payload = json.dumps(
+            [
+                sorted(self.companies),
+                sorted(self.education),
+                sorted(self.employment_types),
+                sorted(self.role_rank.items()),
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+    def is_preferred(self, company_name):
+        """희망기업 여부 확인"""
+        return bool(company_name) and company_name in self.companies
@@ -1,5 +1,5 @@
 import logging
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
 from db.db_local import Database
 from db.db_query.email_query import EmailQueries
 
@@ -20,3 +20,43 @@ class UserService:
         except Exception as e:
             logger.error(f"구독자 조회 오류: {e}")
             return []
+
+    @staticmethod
+    def count_active_subscribers() -> int:
+        """활성 구독자 수 (조회에 실패하면 0)"""
+        try:
+            with Database.get_cursor() as (cursor, connection):
+                cursor.execute(EmailQueries.COUNT_ACTIVE_SUBSCRIBERS)
+                return cursor.fetchone()[0]
+        except Exception as e:
+            logger.error(f"구독자 수 조회 오류: {e}")
+            return 0
+
+    @staticmethod
+    def iter_active_subscribers(page_size: int = 1000) -> Iterator[Tuple]:
+        """활성 구독자를 user_id 순서로 한 페이지씩 조회하며 생성
+
+        user_id keyset 페이지네이션으로 읽으므로 전체 목록을 메모리에 올리지 않고,
+        첫 페이지가 도착하면 바로 발송을 시작할 수 있다.
+        페이지 조회에 실패하면 오류를 기록하고 그때까지 읽은 사용자에서 멈춘다.
+        """
+        last_user_id = 0
+        while True:
+            try:
+                with Database.get_cursor() as (cursor, connection):
+                    cursor.execute(
+                        EmailQueries.GET_ACTIVE_SUBSCRIBERS_PAGE,
+                        (last_user_id, page_size),
+                    )
+                    rows = cursor.fetchall()
+            except Exception as e:
+                logger.error(f"구독자 조회 오류 (user_id {last_user_id} 이후): {e}")
+                return
+            if not rows:
+                return
+
+            yield from rows
+
+            last_user_id = rows[-1][0]
+            if len(rows) < page_size:
+                return
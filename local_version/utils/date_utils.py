@@ -5,8 +5,8 @@ from datetime import datetime, date
 logger = logging.getLogger(__name__)
 
 
-def calculate_deadline_info(deadline_date):
-    """마감일 정보 계산"""
+def calculate_deadline_info(deadline_date, today=None):
+    """마감일 정보 계산 (today를 주지 않으면 오늘 기준)"""
     if not deadline_date:
         return "마감일 미정"
 
@@ -16,8 +16,7 @@ def calculate_deadline_info(deadline_date):
         else:
             deadline = deadline_date
 
-        today = date.today()
-        days_left = (deadline - today).days
+        days_left = (deadline - (today or date.today())).days
         deadline_str = deadline.strftime("~%y년 %m월 %d일")
 
         if days_left < 0:
@@ -32,9 +31,33 @@ def calculate_deadline_info(deadline_date):
         return "마감일 확인 필요"
 
 
-def get_week_info():
+def get_week_info(now=None):
     """현재 주차 정보 반환"""
-    now = datetime.now()
+    now = now or datetime.now()
     month = now.month
     week = (now.day - 1) // 7 + 1
     return f"{month}월 {week}주차"
+
+
+class RenderContext:
+    """배치 한 번 동안 고정하는 날짜 관련 렌더링 값
+
+    배치를 시작할 때 오늘 날짜, 주차, 표시용 날짜를 한 번 정해 두므로
+    이메일마다 다시 계산하지 않고, 자정을 넘기는 배치도 모든 사용자에게
+    같은 날짜로 렌더링한다. 마감일 문구는 마감일별로 한 번만 계산한다.
+    """
+
+    def __init__(self, now=None):
+        now = now or datetime.now()
+        self.today = now.date()
+        self.current_date = now.strftime("%Y.%m.%d")
+        self.week_info = get_week_info(now)
+        self._deadlines = {}
+
+    def deadline_info(self, deadline_date):
+        """calculate_deadline_info()와 같은 결과 (마감일별로 캐시)"""
+        info = self._deadlines.get(deadline_date)
+        if info is None:
+            info = calculate_deadline_info(deadline_date, self.today)
+            self._deadlines[deadline_date] = info
+        return info
@@ -8,7 +8,6 @@ from services.sheets.sheets_service import (
 from dotenv import load_dotenv
 import os
 import tempfile
-import time
 import csv
 from datetime import datetime
 
@@ -94,6 +93,8 @@ def main():
     WORKSHEET_NAME = os.getenv("WORKSHEET_NAME", "설문지 응답 시트1")
     DATA_FOLDER = "data-1004"
     TEMPLATE_PATH = "template/test_email.html"
+    # 반복되는 인라인 스타일을 클래스로 묶기 (클래스를 지원하지 않는 클라이언트가 있어 기본 끔)
+    FOLD_STYLES = os.getenv("FOLD_STYLES", "false").lower() == "true"
 
     if not SPREADSHEET_ID:
         print("❌ .env 파일에 SPREADSHEET_ID를 설정해주세요.")
@@ -138,7 +139,9 @@ def main():
     print("🔄 채용공고 매칭 시스템 초기화 중...")
     try:
         job_matcher = JobMatcher(DATA_FOLDER)
-        template_generator = EmailTemplateGenerator(TEMPLATE_PATH)
+        template_generator = EmailTemplateGenerator(
+            TEMPLATE_PATH, fold_styles=FOLD_STYLES
+        )
         print("✅ 매칭 시스템 초기화 완료\n")
     except Exception as e:
         print(f"❌ 매칭 시스템 초기화 실패: {e}")
@@ -227,11 +230,6 @@ def main():
                     fail_count += 1
                     print(f"   ❌ 이메일 발송 실패: {error}")
 
-            # API 제한을 피하기 위한 잠시 대기
-            if i % 10 == 0:  # 10명마다 잠시 대기
-                print(f"   ⏸️  잠시 대기 중... (API 제한 방지)")
-                time.sleep(2)
-
         except Exception as e:
             print(f"   ❌ 처리 실패: {e}")
             results[user_email] = ("FAIL", str(e))
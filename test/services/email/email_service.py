@@ -1,4 +1,9 @@
 from .gmail_service import GmailAPIService
+from .rate_limiter import AdaptiveRateLimiter
+
+# 호출 간에 공유하는 Gmail 발송 속도 제한기
+# (Gmail API 사용자당 초당 250 할당량 단위, messages.send 1건 = 100 단위)
+gmail_rate_limiter = AdaptiveRateLimiter(rate=1.0, max_rate=2.5, min_rate=0.2)
 
 
 def load_html_template(html_file_path):
@@ -21,7 +26,7 @@ def send_emails_with_gmail_api(
 
     # Gmail API 서비스 초기화
     try:
-        gmail_service = GmailAPIService()
+        gmail_service = GmailAPIService(rate_limiter=gmail_rate_limiter)
     except Exception as e:
         raise ValueError(f"Gmail API 인증 실패: {e}")
 
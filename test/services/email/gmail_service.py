@@ -2,12 +2,11 @@ from googleapiclient.discovery import build
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 import base64
 import os
 import pickle
 import json
+from .mime_builder import MessageBuilder
 
 # Gmail API 스코프 (Sheets와 분리된 토큰 사용)
 GMAIL_SCOPES = ["https://www.googleapis.com/auth/gmail.send"]
@@ -15,10 +14,17 @@ GMAIL_SCOPES = ["https://www.googleapis.com/auth/gmail.send"]
 
 class GmailAPIService:
     def __init__(
-        self, credentials_file="credentials.json", token_file="gmail_token.pickle"
+        self,
+        credentials_file="credentials.json",
+        token_file="gmail_token.pickle",
+        rate_limiter=None,
     ):
         self.credentials_file = credentials_file
         self.token_file = token_file
+        # 발송 속도 제한 (AdaptiveRateLimiter, 할당량 초과 응답에 속도를 줄여 재시도)
+        self.rate_limiter = rate_limiter
+        # raw 메시지 조립기 (Gmail이 From을 채우므로 보내는 사람 없이)
+        self.message_builder = MessageBuilder()
 
         # credentials.json 파일 검증
         self._validate_credentials_file()
@@ -112,24 +118,12 @@ class GmailAPIService:
     def create_message(
         self, to, subject, message_text=None, html_content=None, attachment_path=None
     ):
-        """이메일 메시지 생성"""
-        message = MIMEMultipart("alternative")
-        message["to"] = to
-        message["subject"] = subject
-
-        # 텍스트 본문 추가
-        if message_text:
-            text_part = MIMEText(message_text, "plain", "utf-8")
-            message.attach(text_part)
-
-        # HTML 본문 추가
-        if html_content:
-            html_part = MIMEText(html_content, "html", "utf-8")
-            message.attach(html_part)
-
-        # 메시지를 base64로 인코딩
-        raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode("utf-8")
-        return {"raw": raw_message}
+        """이메일 메시지 생성 (Gmail API의 raw 필드)"""
+        # 헤더/MIME 경계는 미리 인코딩해 두고 본문만 바이트로 바로 조립
+        raw_message = self.message_builder.build(
+            to, subject, message_text, html_content
+        )
+        return {"raw": base64.urlsafe_b64encode(raw_message).decode("utf-8")}
 
     def send_message(
         self, to, subject, message_text=None, html_content=None, attachment_path=None
@@ -140,12 +134,11 @@ class GmailAPIService:
                 to, subject, message_text, html_content, attachment_path
             )
 
-            result = (
-                self.service.users()
-                .messages()
-                .send(userId="me", body=message)
-                .execute()
-            )
+            request = self.service.users().messages().send(userId="me", body=message)
+            if self.rate_limiter is None:
+                result = request.execute()
+            else:
+                result = self.rate_limiter.run("gmail", to, request.execute)
 
             print(
                 f"✅ {to}에게 이메일이 성공적으로 발송되었습니다! (Message ID: {result['id']})"
@@ -0,0 +1,75 @@
+# services/email/mime_builder.py
+import base64
+import random
+import sys
+from email.header import Header
+
+_CRLF = b"\r\n"
+
+
+def _boundary():
+    """email 패키지와 같은 형식의 경계 문자열 (발송기 하나에 한 번만 생성)"""
+    token = random.randrange(sys.maxsize)
+    return f"==============={token:019d}=="
+
+
+def encode_header(value):
+    """헤더 값 → 바이트 (ASCII가 아니거나 길면 RFC 2047 인코딩 후 접어서)"""
+    if value.isascii() and value.isprintable() and len(value) < 70:
+        return value.encode("ascii")
+    return Header(value, "utf-8").encode(linesep="\r\n").encode("ascii")
+
+
+def encode_body(text):
+    """본문 → base64 (76자마다 CRLF, MIMEText(..., "utf-8")와 같은 인코딩)"""
+    return base64.encodebytes(text.encode("utf-8")).replace(b"\n", _CRLF)
+
+
+class MessageBuilder:
+    """multipart/alternative 메시지를 SMTP DATA용 바이트로 바로 조립
+
+    모든 수신자에게 같은 From/MIME-Version/Content-Type 헤더, 경계, 파트
+    헤더는 생성할 때 한 번 인코딩해 두고, 수신자마다 To/Subject와 본문만
+    인코딩해 이어 붙인다. MIMEMultipart 트리를 만들고 Generator로 직렬화하는
+    것보다 훨씬 적게 복사하며, 결과는 email 패키지로 파싱한 내용이 같다.
+    첨부파일이 있는 메시지는 지원하지 않는다.
+    """
+
+    def __init__(self, sender=None):
+        self.boundary = _boundary()
+        marker = f"--{self.boundary}\r\n"
+        headers = [
+            f'Content-Type: multipart/alternative; boundary="{self.boundary}"',
+            "MIME-Version: 1.0",
+        ]
+        if sender:
+            headers.append("From: " + encode_header(sender).decode("ascii"))
+        self._prefix = ("\r\n".join(headers) + "\r\n").encode("ascii")
+        self._parts = {
+            subtype: (
+                marker + f'Content-Type: text/{subtype}; charset="utf-8"\r\n'
+                "MIME-Version: 1.0\r\n"
+                "Content-Transfer-Encoding: base64\r\n\r\n"
+            ).encode("ascii")
+            for subtype in ("plain", "html")
+        }
+        self._end = f"--{self.boundary}--\r\n".encode("ascii")
+
+    def build(self, to, subject, message_text=None, html_content=None):
+        """수신자 한 명의 메시지 바이트"""
+        chunks = [
+            self._prefix,
+            b"To: ",
+            encode_header(to),
+            b"\r\nSubject: ",
+            encode_header(subject),
+            b"\r\n\r\n",
+        ]
+        if message_text:
+            chunks.append(self._parts["plain"])
+            chunks.append(encode_body(message_text))
+        if html_content:
+            chunks.append(self._parts["html"])
+            chunks.append(encode_body(html_content))
+        chunks.append(self._end)
+        return b"".join(chunks)
@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import smtplib
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# 발송 속도를 줄여야 하는 SMTP 응답 코드 (일시적 거부/과부하)
+THROTTLE_CODES = (421, 450, 451, 452)
+
+# Gmail API/SMTP 할당량 초과 메시지 (HttpError 429/403, 550 5.4.5 등)
+THROTTLE_MARKERS = (
+    "ratelimitexceeded",
+    "userratelimitexceeded",
+    "quotaexceeded",
+    "dailylimitexceeded",
+    "sending quota",
+    "5.4.5",
+    "try again later",
+)
+
+
+def parse_rates(text):
+    """'gmail.com:5,naver.com:2' → {"gmail.com": 5.0, "naver.com": 2.0}"""
+    rates = {}
+    for item in (text or "").split(","):
+        name, _, rate = item.strip().partition(":")
+        if name and rate:
+            rates[name.strip().lower()] = float(rate)
+    return rates
+
+
+def is_throttle_error(error):
+    """발송 실패가 속도 제한(스로틀링)에 의한 것인지 판별"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+    else:
+        codes = [getattr(error, "smtp_code", None)]
+    if any(code in THROTTLE_CODES for code in codes):
+        return True
+
+    # googleapiclient HttpError: resp.status가 429면 할당량 초과
+    if getattr(getattr(error, "resp", None), "status", None) == 429:
+        return True
+
+    text = str(error).lower()
+    return any(marker in text for marker in THROTTLE_MARKERS)
+
+
+class TokenBucket:
+    """AIMD로 초당 발송량을 조절하는 토큰 버킷
+
+    성공하면 rate를 increase만큼 늘리고 (max_rate까지),
+    스로틀링 응답을 받으면 rate를 decrease배로 줄이고 (min_rate까지) 버킷을 비운다.
+    버킷에는 현재 속도로 1초 동안 보낼 만큼만 토큰이 쌓인다.
+    """
+
+    __slots__ = ("rate", "min_rate", "max_rate", "tokens", "updated", "backoff_until")
+
+    def __init__(self, rate, min_rate, max_rate):
+        self.rate = min(max(rate, min_rate), max_rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.backoff_until = 0.0
+
+    def reserve(self, now):
+        """토큰 한 개를 예약하고 보내기 전에 기다릴 시간(초) 반환"""
+        burst = max(self.rate, 1.0)
+        self.tokens = min(burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def increase(self, step):
+        self.rate = min(self.max_rate, self.rate + step)
+
+    def decrease(self, factor, now):
+        """동시에 도착한 거부 응답에 여러 번 줄이지 않도록 한 주기에 한 번만 감소"""
+        self.tokens = min(self.tokens, 0)
+        if now < self.backoff_until:
+            return False
+        self.rate = max(self.min_rate, self.rate * factor)
+        self.backoff_until = now + 1 / self.rate
+        return True
+
+
+class AdaptiveRateLimiter:
+    """공급자(SMTP 서버, Gmail API)별·수신 도메인별 발송 속도 제한기
+
+    발송 한 건은 공급자 버킷과 수신 도메인 버킷의 토큰을 모두 사용한다.
+    rate/max_rate/min_rate: 공급자별 초기·최대·최소 초당 발송 수
+    provider_rates: 공급자별 최대 초당 발송 수 (지정하지 않으면 max_rate)
+    domain_rates: 수신 도메인별 최대 초당 발송 수 (지정하지 않으면 domain_rate)
+    max_retries: 스로틀링으로 거부된 메시지를 속도를 줄여 다시 보내는 횟수
+    스레드와 asyncio 코드에서 함께 사용할 수 있다.
+    """
+
+    def __init__(
+        self,
+        rate=5.0,
+        max_rate=20.0,
+        min_rate=0.5,
+        domain_rate=None,
+        provider_rates=None,
+        domain_rates=None,
+        increase=0.5,
+        decrease=0.5,
+        max_retries=2,
+    ):
+        self.rate = rate
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.domain_rate = domain_rate or max_rate
+        self.provider_rates = provider_rates or {}
+        self.domain_rates = domain_rates or {}
+        self.step = increase
+        self.factor = decrease
+        self.max_retries = max_retries
+
+        self._providers = {}
+        self._domains = {}
+        self._lock = threading.Lock()
+        self.throttled = 0
+
+    def _provider_bucket(self, provider):
+        bucket = self._providers.get(provider)
+        if bucket is None:
+            max_rate = self.provider_rates.get(provider, self.max_rate)
+            bucket = self._providers[provider] = TokenBucket(
+                min(self.rate, max_rate), self.min_rate, max_rate
+            )
+        return bucket
+
+    def _domain_bucket(self, recipient):
+        domain = recipient.rpartition("@")[2].lower()
+        bucket = self._domains.get(domain)
+        if bucket is None:
+            rate = self.domain_rates.get(domain, self.domain_rate)
+            bucket = self._domains[domain] = TokenBucket(
+                rate, min(self.min_rate, rate), rate
+            )
+        return bucket
+
+    def reserve(self, provider, recipient):
+        """발송 한 건의 토큰을 예약하고 기다릴 시간(초) 반환"""
+        with self._lock:
+            now = time.monotonic()
+            return max(
+                self._provider_bucket(provider).reserve(now),
+                self._domain_bucket(recipient).reserve(now),
+            )
+
+    def acquire(self, provider, recipient):
+        time.sleep(self.reserve(provider, recipient))
+
+    async def acquire_async(self, provider, recipient):
+        await asyncio.sleep(self.reserve(provider, recipient))
+
+    def record(self, provider, recipient, error=None):
+        """발송 결과 반영 (스로틀링 오류면 속도를 줄이고 True 반환)"""
+        with self._lock:
+            buckets = (self._provider_bucket(provider), self._domain_bucket(recipient))
+            if error is None:
+                for bucket in buckets:
+                    bucket.increase(self.step)
+                return False
+
+            if not is_throttle_error(error):
+                return False
+
+            self.throttled += 1
+            now = time.monotonic()
+            if any([bucket.decrease(self.factor, now) for bucket in buckets]):
+                logger.warning(
+                    f"발송 속도 제한 응답 ({provider}, {recipient}): {error} → "
+                    f"초당 {buckets[0].rate:.2f}건 / 도메인 {buckets[1].rate:.2f}건"
+                )
+            return True
+
+    def run(self, provider, recipient, send):
+        """속도 제한을 지키며 send()를 호출 (스로틀링 오류는 줄인 속도로 재시도)"""
+        for attempt in range(self.max_retries + 1):
+            self.acquire(provider, recipient)
+            try:
+                result = send()
+            except Exception as error:
+                if not self.record(provider, recipient, error):
+                    raise
+                if attempt == self.max_retries:
+                    raise
+            else:
+                self.record(provider, recipient)
+                return result
+
+    async def run_async(self, provider, recipient, send):
+        """run()의 asyncio 버전 (send는 코루틴을 반환하는 함수)"""
+        for attempt in range(self.max_retries + 1):
+            await self.acquire_async(provider, recipient)
+            try:
+                result = await send()
+            except Exception as error:
+                if not self.record(provider, recipient, error):
+                    raise
+                if attempt == self.max_retries:
+                    raise
+            else:
+                self.record(provider, recipient)
+                return result
+
+    def current_rate(self, provider):
+        """공급자의 현재 초당 발송 수"""
+        with self._lock:
+            return self._provider_bucket(provider).rate
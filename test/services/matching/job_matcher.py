@@ -1,3 +1,4 @@
+import heapq
 import json
 import os
 from typing import List, Dict, Any
@@ -277,7 +278,7 @@ class JobMatcher:
         for job in final_jobs:
             company_name = job.get("company_name", "") or job.get("company_name_from_file", "")
             is_preferred = self.is_preferred_company(target_companies, company_name)
-            
+
             if is_preferred:
                 preferred_jobs.append(job)
             else:
@@ -286,15 +287,15 @@ class JobMatcher:
         print(f"희망기업 공고: {len(preferred_jobs)}개, 기타 공고: {len(other_jobs)}개")
 
         # 정렬
-        def sort_key(job):
-            user_education = user_data.get(
-                "찾고 계신 공고의 학력 조건을 선택해주세요. (졸업예정자도 선택 가능, 복수선택)",
-                "",
-            )
-            user_edu_list = [
-                edu.strip() for edu in user_education.split(",") if edu.strip()
-            ]
+        user_education = user_data.get(
+            "찾고 계신 공고의 학력 조건을 선택해주세요. (졸업예정자도 선택 가능, 복수선택)",
+            "",
+        )
+        user_edu_list = [
+            edu.strip() for edu in user_education.split(",") if edu.strip()
+        ]
 
+        def sort_key(job):
             return (
                 self.count_nulls(job),
                 self.get_job_role_priority(target_jobs, job),
@@ -305,23 +306,23 @@ class JobMatcher:
                 job.get("company_name", ""),
             )
 
-        preferred_jobs.sort(key=sort_key)
-        other_jobs.sort(key=sort_key)
-        top_jobs = (preferred_jobs + other_jobs)[:top_n]
+        # 상위 top_n개만 힙으로 선정 (sorted(...)[:top_n]과 같은 순서)
+        top_preferred = heapq.nsmallest(top_n, preferred_jobs, key=sort_key)
+        top_other = heapq.nsmallest(
+            top_n - len(top_preferred), other_jobs, key=sort_key
+        )
+        top_jobs = [(job, True) for job in top_preferred]
+        top_jobs += [(job, False) for job in top_other]
 
         print(f"추천 완료: {len(top_jobs)}개 공고 선정")
 
         return [
             {
                 "job": job,
-                "is_preferred_company": self.is_preferred_company(
-                    target_companies,
-                    job.get("company_name", "")
-                    or job.get("company_name_from_file", ""),
-                ),
+                "is_preferred_company": is_preferred,
                 "score": 100,
             }
-            for job in top_jobs
+            for job, is_preferred in top_jobs
         ]
 
     def _parse_employment_types(self, employment_str: str) -> List[str]:
@@ -0,0 +1,56 @@
+from typing import Dict, Optional
+from datetime import date, datetime
+
+
+def calculate_deadline(
+    deadline_date: str, today: Optional[date] = None
+) -> Dict[str, str]:
+    """마감일 정보 계산 (today를 주지 않으면 오늘 기준)"""
+    try:
+        if deadline_date == "9999-12-31" or not deadline_date:
+            return {"date": "상시채용", "d_day": ""}
+
+        # 날짜 형식 처리
+        if len(deadline_date) == 10:  # YYYY-MM-DD
+            deadline = datetime.strptime(deadline_date, "%Y-%m-%d")
+        else:
+            return {"date": deadline_date, "d_day": ""}
+
+        diff = (deadline.date() - (today or date.today())).days
+
+        if diff < 0:
+            return {"date": f'~{deadline.strftime("%y.%m.%d")}', "d_day": "(마감)"}
+        elif diff == 0:
+            return {"date": f'~{deadline.strftime("%y.%m.%d")}', "d_day": "(D-Day)"}
+        else:
+            return {
+                "date": f'~{deadline.strftime("%y.%m.%d")}',
+                "d_day": f"(D-{diff})",
+            }
+    except Exception as e:
+        print(f"날짜 파싱 오류: {e}")
+        return {"date": deadline_date, "d_day": ""}
+
+
+class RenderContext:
+    """배치 한 번 동안 고정하는 날짜 관련 렌더링 값
+
+    오늘 날짜, 주차, 표시용 날짜를 한 번 정해 두므로 이메일마다 다시 계산하지
+    않고, 자정을 넘기는 배치도 모든 사용자에게 같은 날짜로 렌더링한다.
+    마감일 정보는 마감일별로 한 번만 계산한다.
+    """
+
+    def __init__(self, now: Optional[datetime] = None):
+        now = now or datetime.now()
+        self.today = now.date()
+        self.current_date = now.strftime("%Y년 %m월 %d일")
+        self.week_info = f"{now.month}월 {(now.day - 1) // 7 + 1}주차"
+        self._deadlines: Dict[str, Dict[str, str]] = {}
+
+    def deadline(self, deadline_date: str) -> Dict[str, str]:
+        """calculate_deadline()과 같은 결과 (마감일별로 캐시)"""
+        info = self._deadlines.get(deadline_date)
+        if info is None:
+            info = calculate_deadline(deadline_date, self.today)
+            self._deadlines[deadline_date] = info
+        return info
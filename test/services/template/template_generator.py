@@ -1,12 +1,86 @@
 from typing import List, Dict
 import json
+import os
 from datetime import datetime
+from .fragment_cache import FragmentCache
+from .render_context import RenderContext
+from .template_minifier import StyleClasses, minify_html, size_report
+
+# 채용공고 카드 마크업 버전 (_generate_job_cards()의 HTML을 바꾸면 올림)
+JOB_CARD_VERSION = 2
+
+# 채용공고 카드에 렌더링되는 공고 필드 (카드 캐시 키, 카드에 필드를 추가하면 함께 추가)
+JOB_CARD_FIELDS = (
+    "company_name",
+    "position_name",
+    "processed_position_name",
+    "employment_type",
+    "application_deadline_date",
+    "application_link",
+)
+
+# 최적화 후에도 남겨 두는 채용공고 섹션 교체 구간 표시
+SECTION_MARKERS = ("<!-- 하나카드 -->", "<!-- 피드백 섹션 -->")
 
 
 class EmailTemplateGenerator:
-    def __init__(self, template_path: str):
+    def __init__(self, template_path: str, fold_styles: bool = False):
+        """fold_styles: 반복되는 인라인 style을 <style> 클래스로 바꿀지 여부
+
+        클래스 스타일을 지원하지 않는 메일 클라이언트가 있어 기본값은 끈다
+        (주석·공백 최적화는 항상 적용).
+        """
         self.template_path = template_path
+        self.fold_styles = fold_styles
         self.company_logos = self._load_company_logos()
+        # 회사명별 로고 URL, 사용자 사이에서 공유하는 채용공고 카드 HTML
+        self._logo_cache = {}
+        self.card_cache = FragmentCache()
+        # 날짜·주차·마감일 정보는 배치(생성기) 동안 고정
+        self.render_context = RenderContext()
+        # 최적화한 템플릿과 인라인 스타일 클래스 (템플릿 수정 시각별로 한 번 생성,
+        # 클래스는 fold_styles일 때만)
+        self._template = None
+        self._template_mtime = None
+        self.style_classes = None
+
+    def begin_render_batch(self, now: datetime = None) -> RenderContext:
+        """새 배치 렌더링 시작: 오늘 날짜·주차·마감일 정보를 다시 고정"""
+        self.render_context = RenderContext(now)
+        return self.render_context
+
+    def _load_template(self) -> str:
+        """최적화한 템플릿 (파일이 바뀌었을 때만 다시 읽고 최적화)
+
+        주석·공백을 줄이고, fold_styles면 반복되는 인라인 style을 짧은 클래스로
+        바꾼다. 카드 HTML도 같은 클래스 매핑을 쓰도록 style_classes를 함께 만든다.
+        """
+        mtime = os.stat(self.template_path).st_mtime_ns
+        if self._template is not None and self._template_mtime == mtime:
+            return self._template
+
+        with open(self.template_path, "r", encoding="utf-8") as f:
+            source = f.read()
+
+        html = minify_html(source, SECTION_MARKERS)
+        if self.fold_styles:
+            self.style_classes = StyleClasses(html)
+            html = self.style_classes.inline_into(html)
+        self._template = html
+        self._template_mtime = mtime
+        # 스타일 매핑이 바뀌었을 수 있으므로 캐시된 카드는 버림
+        self.card_cache.clear()
+        print(f"📦 {size_report(self.template_path, source, self._template)}")
+        return self._template
+
+    def _compact(self, html: str) -> str:
+        """동적으로 만든 HTML 조각을 템플릿과 같은 방식으로 최적화"""
+        html = minify_html(html)
+        if not self.fold_styles:
+            return html
+        if self.style_classes is None:
+            self._load_template()
+        return self.style_classes.apply(html)
 
     def _load_company_logos(self) -> Dict[str, str]:
         """회사 로고 URL 매핑"""
@@ -41,6 +115,14 @@ class EmailTemplateGenerator:
         }
 
     def _get_company_logo(self, company_name: str) -> str:
+        """회사명으로 로고 URL 찾기 (같은 회사명은 한 번만 찾음)"""
+        logo_url = self._logo_cache.get(company_name)
+        if logo_url is None:
+            logo_url = self._find_company_logo(company_name)
+            self._logo_cache[company_name] = logo_url
+        return logo_url
+
+    def _find_company_logo(self, company_name: str) -> str:
         """회사명으로 로고 URL 찾기 (부분 매칭)"""
         # 1. 정확한 매칭 먼저 시도 (삼성전자 == 삼성전자)
         if company_name in self.company_logos:
@@ -58,8 +140,7 @@ class EmailTemplateGenerator:
         self, user_data: Dict, matched_jobs: List[Dict]
     ) -> str:
         """개인화된 이메일 HTML 생성"""
-        with open(self.template_path, "r", encoding="utf-8") as f:
-            template = f.read()
+        template = self._load_template()
 
         # 사용자 이름 삽입
         user_name = user_data.get("성함 ", "테스터").strip()
@@ -67,15 +148,10 @@ class EmailTemplateGenerator:
         template = template.replace("테스터님", f"{user_name}님")
 
         # 날짜 삽입
-        current_date = datetime.now().strftime("%Y년 %m월 %d일")
-        template = template.replace("2025.09.18", current_date)
+        template = template.replace("2025.09.18", self.render_context.current_date)
 
         # 월주차 삽입
-        current_week = (datetime.now().day - 1) // 7 + 1
-        current_month = datetime.now().month
-        template = template.replace(
-            "9월 3주차", f"{current_month}월 {current_week}주차"
-        )
+        template = template.replace("9월 3주차", self.render_context.week_info)
 
         # 채용공고 섹션 생성
         job_cards_html = self._generate_job_cards(matched_jobs)
@@ -93,13 +169,26 @@ class EmailTemplateGenerator:
         return template
 
     def _generate_job_cards(self, matched_jobs: List[Dict]) -> str:
-        """채용공고 카드들 HTML 생성"""
-        cards_html = ""
+        """채용공고 카드들 HTML 생성 (같은 공고·희망기업 여부·날짜면 캐시 재사용)"""
+        cards = []
 
         for job_info in matched_jobs:
             job = job_info["job"]
             is_preferred = job_info["is_preferred_company"]
 
+            # 공고 id가 없으므로 카드에 들어가는 필드 전체로 공고를 구분
+            # (같은 지원 링크·공고명 아래 모집부문만 다른 공고가 있음)
+            key = (
+                tuple(job.get(field) for field in JOB_CARD_FIELDS),
+                is_preferred,
+                self.render_context.today,
+                JOB_CARD_VERSION,
+            )
+            card_html = self.card_cache.get(key)
+            if card_html is not None:
+                cards.append(card_html)
+                continue
+
             # 마감일 계산
             deadline_info = self._calculate_deadline(
                 job.get("application_deadline_date", "")
@@ -190,25 +279,25 @@ class EmailTemplateGenerator:
             </table>
             """
 
-            cards_html += card_html
+            card_html = self._compact(card_html)
+            self.card_cache.put(key, card_html)
+            cards.append(card_html)
 
-        return cards_html
+        return "".join(cards)
 
     def generate_no_jobs_email(self, user_data: Dict) -> str:
         """매칭된 채용공고가 없을 때 이메일 HTML 생성"""
-        with open(self.template_path, "r", encoding="utf-8") as f:
-            template = f.read()
+        template = self._load_template()
 
         # 날짜 삽입
-        current_date = datetime.now().strftime("%Y년 %m월 %d일")
-        template = template.replace("2025.09.18", current_date)
+        template = template.replace("2025.09.18", self.render_context.current_date)
 
         # 사용자 이름 삽입
         user_name = user_data.get("성함 ", "테스터").strip()
         template = template.replace("테스터님", f"{user_name}님")
 
         # 빈 결과 메시지 HTML 생성
-        no_jobs_html = self._generate_no_jobs_message(user_data)
+        no_jobs_html = self._compact(self._generate_no_jobs_message(user_data))
 
         # 기존 채용공고 섹션을 빈 결과 메시지로 교체
         start_marker = "<!-- 하나카드 -->"
@@ -328,29 +417,5 @@ class EmailTemplateGenerator:
         return "".join(tags)
 
     def _calculate_deadline(self, deadline_date: str) -> Dict[str, str]:
-        """마감일 정보 계산"""
-        try:
-            if deadline_date == "9999-12-31" or not deadline_date:
-                return {"date": "상시채용", "d_day": ""}
-
-            # 날짜 형식 처리
-            if len(deadline_date) == 10:  # YYYY-MM-DD
-                deadline = datetime.strptime(deadline_date, "%Y-%m-%d")
-            else:
-                return {"date": deadline_date, "d_day": ""}
-
-            today = datetime.now()
-            diff = (deadline - today).days + 1
-
-            if diff < 0:
-                return {"date": f'~{deadline.strftime("%y.%m.%d")}', "d_day": "(마감)"}
-            elif diff == 0:
-                return {"date": f'~{deadline.strftime("%y.%m.%d")}', "d_day": "(D-Day)"}
-            else:
-                return {
-                    "date": f'~{deadline.strftime("%y.%m.%d")}',
-                    "d_day": f"(D-{diff})",
-                }
-        except Exception as e:
-            print(f"날짜 파싱 오류: {e}")
-            return {"date": deadline_date, "d_day": ""}
+        """마감일 정보 계산 (배치의 오늘 날짜 기준, 마감일별로 캐시)"""
+        return self.render_context.deadline(deadline_date)
@@ -0,0 +1,175 @@
+# services/template/template_minifier.py
+import re
+from collections import Counter
+
+# 주석, 원문을 유지할 블록(style/pre/textarea/script), 태그, 텍스트
+_TOKEN = re.compile(
+    r"<!--.*?-->|<(style|pre|textarea|script)\b[^>]*>.*?</\1\s*>|<[^>]*>|[^<]+|<",
+    re.S | re.I,
+)
+_TAG_NAME = re.compile(r"</?([a-zA-Z][\w-]*)")
+_LINE_BREAK_SPACE = re.compile(r"\s*\n\s*")
+
+# 앞뒤 공백이 렌더링에 영향을 주지 않는 블록 수준 태그
+_BLOCK_TAGS = frozenset(
+    "html head body meta title link style table thead tbody tfoot tr td th "
+    "div p br hr h1 h2 h3 h4 h5 h6 ul ol li center".split()
+)
+
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE = re.compile(r"\s+")
+_CSS_PUNCTUATION = re.compile(r"\s*([{};,>])\s*")
+_CSS_COLON = re.compile(r":\s+")
+
+_STYLE_ATTR = re.compile(r'\sstyle="([^"]*)"', re.I)
+_CLASS_ATTR = re.compile(r'\sclass="([^"]*)"', re.I)
+_OPEN_TAG = re.compile(r"<[a-zA-Z][^>]*>")
+_STYLE_OPEN = re.compile(r"<style\b[^>]*>", re.I)
+
+
+def minify_css(css):
+    """CSS 주석과 불필요한 공백 제거"""
+    css = _CSS_COMMENT.sub("", css)
+    css = _CSS_SPACE.sub(" ", css)
+    css = _CSS_PUNCTUATION.sub(r"\1", css)
+    css = _CSS_COLON.sub(":", css)
+    return css.replace(";}", "}").strip()
+
+
+def minify_declarations(style):
+    """인라인 style 값 정리 ("color: #000; font-size: 14px;" → "color:#000;font-size:14px")"""
+    return minify_css(style).strip(";")
+
+
+def _is_block(token):
+    """공백을 없애도 되는 경계 (문서 끝, 주석, DOCTYPE, 블록 수준 태그)"""
+    if token is None or token.startswith("<!"):
+        return True
+    match = _TAG_NAME.match(token)
+    return match is not None and match.group(1).lower() in _BLOCK_TAGS
+
+
+def _minify_tag(tag):
+    tag = _LINE_BREAK_SPACE.sub(" ", tag)
+    return _STYLE_ATTR.sub(
+        lambda match: f' style="{minify_declarations(match.group(1))}"', tag
+    )
+
+
+def minify_html(html, keep_comments=()):
+    """HTML 주석·들여쓰기·줄바꿈과 <style>의 CSS 주석·공백 제거
+
+    줄바꿈이 들어간 공백만 줄이므로 한 줄 안의 공백은 그대로이고, 블록
+    수준 태그 사이의 공백은 없애며 인라인 요소 사이는 공백 하나로 남긴다.
+    조건부 주석(<!--[if mso]>)과 keep_comments에 있는 주석(교체 구간 표시
+    등)은 남기고, <pre>/<textarea>/<script> 내용은 바꾸지 않는다.
+    """
+    tokens = []
+    for match in _TOKEN.finditer(html):
+        token = match.group(0)
+        if token.startswith("<!--"):
+            if not (token.startswith("<!--[if") or token in keep_comments):
+                continue
+        elif match.group(1) and match.group(1).lower() == "style":
+            opening = _STYLE_OPEN.match(token).group(0)
+            css = token[len(opening) : token.rindex("</")]
+            token = f"{opening}{minify_css(css)}</style>"
+        elif token.startswith("<") and match.group(1) is None:
+            token = _minify_tag(token)
+        elif not token.startswith("<") and tokens and not tokens[-1].startswith("<"):
+            # 주석을 지워 이어진 텍스트는 하나로 합쳐 공백을 함께 처리
+            tokens[-1] += token
+            continue
+        tokens.append(token)
+
+    out = []
+    for i, token in enumerate(tokens):
+        if token.startswith("<"):
+            out.append(token)
+            continue
+
+        previous = tokens[i - 1] if i > 0 else None
+        following = tokens[i + 1] if i + 1 < len(tokens) else None
+        pieces = _LINE_BREAK_SPACE.split(token)
+        if len(pieces) == 1:
+            out.append(token)
+            continue
+
+        text = " ".join(pieces)
+        if not pieces[0] and _is_block(previous):
+            text = text[1:]
+        if not pieces[-1] and _is_block(following):
+            text = text[:-1]
+        out.append(text)
+    return "".join(out)
+
+
+class StyleClasses:
+    """여러 번 반복되는 인라인 style 속성을 짧은 클래스로 바꾸는 매핑
+
+    템플릿에서 같은 style 값이 반복되고 클래스로 바꾸는 편이 규칙을 추가해도
+    더 짧을 때만 클래스를 만든다. 생성한 규칙은 첫 <style> 블록 맨 앞에 넣으므로,
+    인라인 스타일을 덮어쓰려고 !important를 붙인 기존 규칙(모바일 미디어 쿼리
+    등)은 그대로 우선한다. <style>을 지원하지 않는 클라이언트가 대상이면 쓰지
+    않는다.
+    """
+
+    def __init__(self, html, min_count=2, prefix="s"):
+        counts = Counter(
+            minify_declarations(match.group(1)) for match in _STYLE_ATTR.finditer(html)
+        )
+        self.classes = {}
+        for style, count in counts.most_common():
+            name = f"{prefix}{len(self.classes)}"
+            # 속성 하나당 줄어드는 길이 × 횟수 > 추가되는 CSS 규칙 길이
+            saved = len(f' style="{style}"') - len(f' class="{name}"')
+            rule = len(style) + len(name) + 3
+            if style and count >= min_count and saved * count > rule:
+                self.classes[style] = name
+
+    def css(self):
+        return "".join(f".{name}{{{style}}}" for style, name in self.classes.items())
+
+    def _replace(self, match):
+        tag = match.group(0)
+        style = _STYLE_ATTR.search(tag)
+        if style is None:
+            return tag
+        name = self.classes.get(minify_declarations(style.group(1)))
+        if name is None:
+            return tag
+
+        tag = tag[: style.start()] + tag[style.end() :]
+        existing = _CLASS_ATTR.search(tag)
+        if existing is not None:
+            end = existing.end() - 1
+            return f"{tag[:end]} {name}{tag[end:]}"
+        end = _TAG_NAME.match(tag).end()
+        return f'{tag[:end]} class="{name}"{tag[end:]}'
+
+    def apply(self, html):
+        """HTML의 인라인 style 중 매핑에 있는 것을 클래스로 교체"""
+        if not self.classes:
+            return html
+        return _OPEN_TAG.sub(self._replace, html)
+
+    def inline_into(self, html):
+        """apply() 후 첫 <style> 블록 맨 앞에 클래스 규칙 추가 (없으면 <head>에 생성)"""
+        html = self.apply(html)
+        if not self.classes:
+            return html
+        opening = _STYLE_OPEN.search(html)
+        if opening is not None:
+            return html[: opening.end()] + self.css() + html[opening.end() :]
+        head_end = html.lower().find("</head>")
+        if head_end == -1:
+            return html
+        return f"{html[:head_end]}<style>{self.css()}</style>{html[head_end:]}"
+
+
+def size_report(name, before, after):
+    """최적화 전후 크기 문자열 (바이트, UTF-8 기준)"""
+    before_bytes = len(before.encode("utf-8"))
+    after_bytes = len(after.encode("utf-8"))
+    saved = 100 * (before_bytes - after_bytes) / before_bytes if before_bytes else 0
+    return f"{name}: {before_bytes:,} → {after_bytes:,} bytes ({saved:.1f}% 감소)"
@@ -0,0 +1,53 @@
+# tests/test_job_cards.py
+# test 디렉터리에서 실행: python -m pytest tests (또는 python -m unittest discover tests)
+import unittest
+
+from services.template.template_generator import EmailTemplateGenerator
+
+
+def posting(position_name, processed_position_name, employment_type, deadline):
+    """지원 링크·회사명·공고명이 같고 모집부문만 다른 공고"""
+    return {
+        "company_name": "LG유플러스",
+        "job_title": "2025 하반기 신입채용",
+        "position_name": position_name,
+        "processed_position_name": processed_position_name,
+        "employment_type": employment_type,
+        "application_deadline_date": deadline,
+        "application_link": "https://careers.example.com/lguplus/2025",
+    }
+
+
+class JobCardCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.generator = EmailTemplateGenerator("template/test_email.html")
+
+    def _cards(self, jobs):
+        return self.generator._generate_job_cards(
+            [{"job": job, "is_preferred_company": False} for job in jobs]
+        )
+
+    def test_postings_sharing_link_and_title_get_their_own_cards(self):
+        backend = posting("CTO Back-end", "백엔드 개발자", "신입", "2099-10-01")
+        data = posting("CDO Data Engineer", "데이터 엔지니어", "경력", "2099-10-15")
+
+        html = self._cards([backend, data])
+        self.assertIn("CTO Back-end", html)
+        self.assertIn("CDO Data Engineer", html)
+        self.assertIn("데이터 엔지니어", html)
+        self.assertIn("~99.10.15", html)
+
+        # 캐시에서 꺼낸 카드도 공고별로 구분
+        again = self._cards([data, backend])
+        self.assertLess(again.index("CDO Data Engineer"), again.index("CTO Back-end"))
+        self.assertEqual(self.generator.card_cache.hits, 2)
+
+    def test_same_posting_reuses_cached_card(self):
+        job = posting("CTO Back-end", "백엔드 개발자", "신입", "2099-10-01")
+        first = self._cards([job])
+        self.assertEqual(self._cards([dict(job)]), first)
+        self.assertEqual(self.generator.card_cache.hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()